@@ -0,0 +1,164 @@
+"""
+Benchmark the fast JSON export engine and row formats against dumpdata
+
+Run from the django-caretaker directory with:
+
+    python -m benchmarks.benchmark_json_export --users 20000 --sessions 50000
+"""
+import argparse
+import datetime
+import json
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+
+def configure() -> None:
+    """
+    Configure Django with an in-memory SQLite database
+
+    :return: None
+    """
+    settings.configure(
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3',
+                               'NAME': ':memory:'}},
+        INSTALLED_APPS=['django.contrib.auth',
+                        'django.contrib.contenttypes',
+                        'django.contrib.sessions'],
+        USE_TZ=True)
+
+    django.setup()
+
+
+def make_dataset(users: int, sessions: int) -> None:
+    """
+    Populate the database with users, group memberships and sessions
+
+    :param users: the number of users to create
+    :param sessions: the number of sessions to create
+    :return: None
+    """
+    from django.contrib.auth.models import Group, User
+    from django.contrib.sessions.models import Session
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    call_command('migrate', verbosity=0)
+
+    groups = Group.objects.bulk_create(Group(name='group_{}'.format(index))
+                                       for index in range(10))
+
+    User.objects.bulk_create(
+        User(username='user_{}'.format(index), email='user@example.org',
+             first_name='First', last_name='Last', password='x' * 88)
+        for index in range(users))
+
+    User.groups.through.objects.bulk_create(
+        User.groups.through(user_id=user_id,
+                            group_id=groups[user_id % 10].id)
+        for user_id in User.objects.values_list('id', flat=True))
+
+    expiry = timezone.now() + datetime.timedelta(days=14)
+
+    Session.objects.bulk_create(
+        Session(session_key='session_{}'.format(index),
+                session_data='x' * 256, expire_date=expiry)
+        for index in range(sessions))
+
+
+def parse(path: Path) -> int:
+    """
+    Parse an export back into objects, as an import would
+
+    :param path: a fixture or a zip of shards
+    :return: the number of objects
+    """
+    from caretaker.frontend.frontends.fast_serializer import read_rows
+    from caretaker.frontend.frontends.json_import import open_member
+    from caretaker.utils.manifest import SHARD_INDEX_MEMBER
+
+    if not zipfile.is_zipfile(path):
+        with path.open('rb') as in_file:
+            return len(json.load(in_file))
+
+    count = 0
+
+    with zipfile.ZipFile(path) as zf:
+        index = json.loads(zf.read(SHARD_INDEX_MEMBER))
+
+        for shard in index['shards']:
+            with open_member(zf, shard['name'],
+                             index['compression']) as in_file:
+                count += sum(1 for _ in read_rows(in_file, index['format']))
+
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--sessions', type=int, default=50000)
+    arguments = parser.parse_args()
+
+    configure()
+    make_dataset(arguments.users, arguments.sessions)
+
+    from django.core.management import call_command
+
+    from caretaker.frontend.frontends.fast_serializer import msgpack, orjson
+    from caretaker.frontend.frontends.json_export import export_json_fast, \
+        export_json_shards, zstandard
+
+    print('{} users, {} sessions, encoder: {}'.format(
+        arguments.users, arguments.sessions,
+        'orjson' if orjson else 'json'))
+    print('{:>14} {:>10} {:>10} {:>8} {:>10}'.format(
+        'engine', 'seconds', 'MiB', 'speedup', 'parse'))
+
+    with tempfile.TemporaryDirectory() as temporary_directory_name:
+        engines = [
+            ('dumpdata', lambda path: call_command(
+                'dumpdata', output=str(path), verbosity=0)),
+            ('fast', lambda path: export_json_fast(output_file=path)),
+            ('jsonl', lambda path: export_json_shards(
+                output_file=path, workers=1, engine='fast',
+                export_format='jsonl')),
+        ]
+
+        if msgpack:
+            engines.append(('msgpack', lambda path: export_json_shards(
+                output_file=path, workers=1, engine='fast',
+                export_format='msgpack')))
+
+        if msgpack and zstandard:
+            engines.append(('msgpack+zstd', lambda path: export_json_shards(
+                output_file=path, workers=1, engine='fast',
+                export_format='msgpack', compression='zstd')))
+
+        baseline = None
+
+        for name, export in engines:
+            output_file = Path(temporary_directory_name) / '{}.json'.format(
+                name)
+
+            start = time.perf_counter()
+            export(output_file)
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline if baseline else elapsed
+
+            start = time.perf_counter()
+            parse(output_file)
+            parse_elapsed = time.perf_counter() - start
+
+            print('{:>14} {:>10.2f} {:>10.1f} {:>7.2f}x {:>10.2f}'.format(
+                name, elapsed, output_file.stat().st_size / 1024 / 1024,
+                baseline / elapsed, parse_elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark the streaming bulk JSON import against loaddata
+
+Run from the django-caretaker directory with:
+
+    python -m benchmarks.benchmark_json_import --users 20000 --sessions 50000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.benchmark_json_export import configure, make_dataset
+
+
+def clear() -> None:
+    """
+    Delete every row that make_dataset created
+
+    :return: None
+    """
+    from django.contrib.auth.models import Group, User
+    from django.contrib.sessions.models import Session
+
+    Session.objects.all().delete()
+    User.objects.all().delete()
+    Group.objects.all().delete()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--sessions', type=int, default=50000)
+    arguments = parser.parse_args()
+
+    configure()
+    make_dataset(arguments.users, arguments.sessions)
+
+    from django.core.management import call_command
+    from django.db import transaction
+
+    from caretaker.frontend.frontends.json_import import import_json_stream
+
+    print('{} users, {} sessions'.format(arguments.users, arguments.sessions))
+    print('{:>10} {:>10} {:>12} {:>8}'.format('engine', 'seconds', 'rows/s',
+                                              'speedup'))
+
+    with tempfile.TemporaryDirectory() as temporary_directory_name:
+        fixture = Path(temporary_directory_name) / 'data.json'
+        call_command('dumpdata', output=str(fixture), verbosity=0)
+
+        engines = [
+            ('loaddata', lambda: call_command('loaddata', str(fixture),
+                                              verbosity=0)),
+            ('bulk', lambda: import_json_stream(input_file=fixture)),
+        ]
+
+        baseline = None
+
+        for name, load in engines:
+            clear()
+
+            start = time.perf_counter()
+
+            with transaction.atomic():
+                load()
+
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline if baseline else elapsed
+            rows = arguments.users * 2 + arguments.sessions + 10
+
+            print('{:>10} {:>10.2f} {:>12.0f} {:>7.2f}x'.format(
+                name, elapsed, rows / elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
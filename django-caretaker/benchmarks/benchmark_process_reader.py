@@ -0,0 +1,123 @@
+"""
+Benchmark BufferedProcessReader on a large synthetic process output
+
+Run from the django-caretaker directory with:
+
+    python -m benchmarks.benchmark_process_reader --size 4096
+"""
+import argparse
+import os
+import select
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from caretaker.frontend.frontends.utils import BufferedProcessReader
+
+
+def producer(size: int) -> subprocess.Popen:
+    """
+    Start a process that writes size bytes to its stdout
+
+    :param size: the number of bytes to write
+    :return: the process
+    """
+    return subprocess.Popen(['head', '-c', str(size), '/dev/zero'],
+                            stdout=subprocess.PIPE, bufsize=8192)
+
+
+def legacy(process: subprocess.Popen, output_filename: str) -> None:
+    """
+    The previous reader: 1 KiB reads behind select and a flush per read
+
+    :param process: the process to read
+    :param output_filename: the file to write to
+    :return: None
+    """
+    with open(output_filename, 'wb') as out_file:
+        reached_end = False
+
+        while process.returncode is None or not reached_end:
+            process.poll()
+            reached_end = False
+
+            select.select([process.stdout], [], [], 1.0)
+
+            data = process.stdout.read(1024)
+
+            if not data:
+                reached_end = True
+            else:
+                out_file.write(data)
+                out_file.flush()
+
+
+def chunked(process: subprocess.Popen, output_filename: str) -> None:
+    """
+    The current reader with splicing turned off
+
+    :param process: the process to read
+    :param output_filename: the file to write to
+    :return: None
+    """
+    splice = getattr(os, 'splice', None)
+
+    try:
+        if splice:
+            del os.splice
+
+        BufferedProcessReader(process).handle_process(output_filename)
+    finally:
+        if splice:
+            os.splice = splice
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=4096,
+                        help='the size of the stream in MiB')
+    parser.add_argument('--output', type=str, default='',
+                        help='the file to write to (a temporary file if '
+                             'not given, or /dev/null)')
+    arguments = parser.parse_args()
+
+    size = arguments.size * 1024 * 1024
+
+    readers = [
+        ('legacy', legacy),
+        ('chunked', chunked),
+        ('spliced', lambda process, output_filename: BufferedProcessReader(
+            process).handle_process(output_filename)),
+    ]
+
+    print('{:.0f} MiB stream'.format(size / 1024 / 1024))
+    print('{:>10} {:>10} {:>10} {:>8}'.format('reader', 'seconds', 'MiB/s',
+                                              'speedup'))
+
+    with tempfile.TemporaryDirectory() as temporary_directory_name:
+        output_filename = arguments.output if arguments.output else str(
+            Path(temporary_directory_name) / 'output.bin')
+
+        baseline = None
+
+        for name, reader in readers:
+            process = producer(size)
+
+            start = time.perf_counter()
+            reader(process, output_filename)
+            process.wait()
+            elapsed = time.perf_counter() - start
+
+            if output_filename != os.devnull:
+                assert Path(output_filename).stat().st_size == size
+
+            baseline = baseline if baseline else elapsed
+
+            print('{:>10} {:>10.2f} {:>10.0f} {:>7.2f}x'.format(
+                name, elapsed, size / 1024 / 1024 / elapsed,
+                baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
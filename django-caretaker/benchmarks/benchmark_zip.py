@@ -0,0 +1,79 @@
+"""
+Benchmark create_zip_file across worker counts
+
+Run from the django-caretaker directory with:
+
+    python -m benchmarks.benchmark_zip --files 2000 --size 262144
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from caretaker.utils.zip import create_zip_file
+
+
+def make_dataset(directory: Path, files: int, size: int) -> int:
+    """
+    Write a synthetic media tree of semi-compressible files
+
+    :param directory: the directory to populate
+    :param files: the number of files to write
+    :param size: the size of each file in bytes
+    :return: the total number of bytes written
+    """
+    generator = random.Random(0)
+    words = [generator.randbytes(8) for _ in range(512)]
+
+    for index in range(files):
+        sub_directory = directory / 'dir_{}'.format(index % 32)
+        sub_directory.mkdir(parents=True, exist_ok=True)
+
+        content = b''.join(generator.choice(words)
+                           for _ in range(size // 8))
+
+        (sub_directory / 'file_{}.bin'.format(index)).write_bytes(content)
+
+    return files * size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=256 * 1024)
+    parser.add_argument('--workers', type=int, nargs='*',
+                        default=sorted({1, 2, 4, os.cpu_count()}))
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory_name:
+        source = Path(temporary_directory_name) / 'media'
+        total = make_dataset(source, arguments.files, arguments.size)
+
+        print('{} files, {:.1f} MiB'.format(arguments.files,
+                                            total / 1024 / 1024))
+        print('{:>8} {:>10} {:>10} {:>8}'.format('workers', 'seconds',
+                                                 'MiB/s', 'speedup'))
+
+        baseline = None
+
+        for workers in arguments.workers:
+            output_file = Path(temporary_directory_name) / 'media.zip'
+
+            start = time.perf_counter()
+            create_zip_file(input_paths=[source], output_file=output_file,
+                            workers=workers)
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline if baseline else elapsed
+
+            print('{:>8} {:>10.2f} {:>10.1f} {:>7.2f}x'.format(
+                workers, elapsed, total / 1024 / 1024 / elapsed,
+                baseline / elapsed))
+
+            output_file.unlink()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,22 @@
 import abc
 import importlib
+import io
+import json
 import logging
+import os
 import sys
+import tarfile
+import tempfile
+import zipfile
 from enum import Enum
 from pathlib import Path
 from types import ModuleType
 
+from botocore.exceptions import ClientError
 from django.conf import settings
 
+from caretaker.utils.manifest import blob_key
+
 
 class StoreOutcome(Enum):
     FAILED = 0
@@ -15,6 +24,127 @@ class StoreOutcome(Enum):
     IDENTICAL = 2
 
 
+class ObjectWriter(io.RawIOBase):
+    """
+    A write-only, non-seekable stream that becomes a remote object
+
+    Everything written to the stream is stored under the remote key when the
+    stream is closed. If the stream is used as a context manager and the block
+    raises, the object is discarded instead. After closing, outcome holds the
+    StoreOutcome of the upload.
+    """
+
+    def __init__(self, backend: 'AbstractBackend', bucket_name: str,
+                 remote_key: str, raise_on_error: bool = False):
+        super().__init__()
+
+        self.backend = backend
+        self.bucket_name = bucket_name
+        self.remote_key = remote_key
+        self.raise_on_error = raise_on_error
+        self.outcome = None
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        """
+        Write bytes to the remote object
+
+        :param data: a bytes-like object
+        :return: the number of bytes written
+        """
+        if self.closed:
+            raise ValueError('write to closed ObjectWriter')
+
+        data = memoryview(data).cast('B')
+        self._write(data)
+        self.size += len(data)
+
+        return len(data)
+
+    def close(self) -> None:
+        """
+        Finish writing and store the remote object
+
+        :return: None
+        """
+        if not self.closed:
+            try:
+                self.outcome = self._commit()
+            finally:
+                super().close()
+
+    def abort(self, outcome: StoreOutcome | None = None) -> None:
+        """
+        Discard everything that was written
+
+        :param outcome: the outcome to record (StoreOutcome.FAILED if None), e.g. IDENTICAL when the previous version already holds the same bytes
+        :return: None
+        """
+        if not self.closed:
+            try:
+                self._abort()
+            finally:
+                self.outcome = outcome if outcome else StoreOutcome.FAILED
+                super().close()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
+
+    @abc.abstractmethod
+    def _write(self, data: memoryview) -> None:
+        pass
+
+    @abc.abstractmethod
+    def _commit(self) -> StoreOutcome:
+        pass
+
+    @abc.abstractmethod
+    def _abort(self) -> None:
+        pass
+
+
+class SpooledObjectWriter(ObjectWriter):
+    """
+    An ObjectWriter for backends that can only store a complete local file
+
+    The stream is written to a temporary file, which is handed to the
+    backend's store_object when the stream is closed.
+    """
+
+    def __init__(self, backend: 'AbstractBackend', bucket_name: str,
+                 remote_key: str, raise_on_error: bool = False):
+        super().__init__(backend=backend, bucket_name=bucket_name,
+                         remote_key=remote_key, raise_on_error=raise_on_error)
+
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = Path(self._directory.name) / Path(remote_key).name
+        self._file = self._path.open('wb')
+
+    def _write(self, data: memoryview) -> None:
+        self._file.write(data)
+
+    def _commit(self) -> StoreOutcome:
+        try:
+            self._file.close()
+
+            return self.backend.store_object(
+                local_file=self._path, bucket_name=self.bucket_name,
+                remote_key=self.remote_key, check_identical=False,
+                raise_on_error=self.raise_on_error)
+        finally:
+            self._directory.cleanup()
+
+    def _abort(self) -> None:
+        self._file.close()
+        self._directory.cleanup()
+
+
 class AbstractBackend(metaclass=abc.ABCMeta):
     client = None
 
@@ -107,6 +237,248 @@ class AbstractBackend(metaclass=abc.ABCMeta):
         """
         pass
 
+    def open_writer(self, bucket_name: str, remote_key: str,
+                    raise_on_error: bool = False) -> ObjectWriter:
+        """
+        Open a stream that is stored as a new version of an object on close
+
+        Backends that can upload while data is still being produced should
+        override this. The default spools the stream to a temporary file and
+        passes it to store_object.
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: an ObjectWriter
+        """
+        return SpooledObjectWriter(backend=self, bucket_name=bucket_name,
+                                   remote_key=remote_key,
+                                   raise_on_error=raise_on_error)
+
+    def object_size(self, bucket_name: str, remote_key: str,
+                    version_id: str,
+                    raise_on_error: bool = False) -> int | None:
+        """
+        The size of a version of an object
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param version_id: the version ID to check
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the size in bytes or None if the version was not found
+        """
+        for version in self.versions(bucket_name=bucket_name,
+                                     remote_key=remote_key,
+                                     raise_on_error=raise_on_error):
+            if version['version_id'] == version_id:
+                return version['size']
+
+        return None
+
+    def get_object_range(self, bucket_name: str, remote_key: str,
+                         version_id: str, start: int, length: int,
+                         raise_on_error: bool = False) -> bytes | None:
+        """
+        Retrieve a byte range of an object from the remote store
+
+        Backends that can read part of an object should override this. The
+        default fetches the whole object and slices it.
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param version_id: the version ID to fetch
+        :param start: the offset of the first byte to fetch
+        :param length: the number of bytes to fetch
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the bytes of the range (shorter at the end of the object)
+        """
+        response_object = self.get_object(bucket_name=bucket_name,
+                                          remote_key=remote_key,
+                                          version_id=version_id,
+                                          raise_on_error=raise_on_error)
+
+        if response_object is None:
+            return None
+
+        response_object.seek(start)
+
+        return response_object.read(length)
+
+    def list_archive(self, bucket_name: str, remote_key: str,
+                     version_id: str = '',
+                     raise_on_error: bool = False) -> list[dict] | None:
+        """
+        List the files in a version of a remote archive without downloading it
+
+        Zip archives are listed from their central directory alone, using
+        ranged reads. A tar.zst archive has no index, so it is streamed
+        through once. Versions never change, so the listing is cached on disk
+        under CARETAKER_ARCHIVE_INDEX_CACHE by version ID.
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the archive
+        :param version_id: the version ID to list (the latest if empty)
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of dictionaries containing 'path', 'size', 'compressed_size' and 'mtime', or None on error
+        """
+        # imported here as these modules refer back to this one
+        from caretaker.backend.remote_file import RemoteFile, RemoteFileError
+        from caretaker.utils.file import ZSTD_MAGIC
+        from caretaker.utils.tar import list_tar_members
+        from caretaker.utils.zip import list_zip_members
+
+        try:
+            if not version_id:
+                versions = self.versions(bucket_name=bucket_name,
+                                         remote_key=remote_key,
+                                         raise_on_error=raise_on_error)
+
+                if not versions:
+                    raise RemoteFileError('No versions of {} were '
+                                          'found'.format(remote_key))
+
+                version_id = versions[0]['version_id']
+
+            cache_directory = getattr(
+                settings, 'CARETAKER_ARCHIVE_INDEX_CACHE',
+                Path(tempfile.gettempdir()) / 'caretaker-index')
+            cache_file = Path(cache_directory) / bucket_name / \
+                '{}.{}.json'.format(remote_key, version_id) \
+                if cache_directory else None
+
+            if cache_file and cache_file.exists():
+                with cache_file.open('r') as in_file:
+                    return json.load(in_file)
+
+            remote_file = RemoteFile(
+                backend=self, bucket_name=bucket_name, remote_key=remote_key,
+                version_id=version_id,
+                block_size=getattr(settings, 'CARETAKER_RANGE_BLOCK_SIZE',
+                                   1024 * 1024))
+
+            try:
+                members = list_zip_members(remote_file)
+            except zipfile.BadZipFile:
+                remote_file.seek(0)
+
+                if remote_file.read(len(ZSTD_MAGIC)) != ZSTD_MAGIC:
+                    raise RemoteFileError('{} is not an archive'.format(
+                        remote_key))
+
+                remote_file.seek(0)
+                members = list_tar_members(remote_file)
+
+            self.logger.info('Listed {} files in {} using {} requests for {} '
+                             'of {} bytes'.format(len(members), remote_key,
+                                                  remote_file.requests,
+                                                  remote_file.bytes_fetched,
+                                                  remote_file.size))
+
+            if cache_file:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+                # written aside and moved, so a reader never sees half a file
+                with tempfile.NamedTemporaryFile(
+                        'w', dir=cache_file.parent, suffix='.part',
+                        delete=False) as out_file:
+                    json.dump(members, out_file)
+
+                os.replace(out_file.name, cache_file)
+
+            return members
+        except (ClientError, OSError, tarfile.TarError) as e:
+            self.logger.error('Unable to list the contents of {}: {}'.format(
+                remote_key, e))
+
+            if raise_on_error:
+                raise e
+
+            return None
+
+    def has_blob(self, bucket_name: str, digest: str,
+                 raise_on_error: bool = False) -> bool:
+        """
+        Check whether a content-addressed blob is stored
+
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: True if the blob is stored
+        """
+        return bool(self.versions(bucket_name=bucket_name,
+                                  remote_key=blob_key(digest),
+                                  raise_on_error=raise_on_error))
+
+    def store_blob(self, local_file: Path, bucket_name: str, digest: str,
+                   raise_on_error: bool = False) -> StoreOutcome:
+        """
+        Store a file as a content-addressed blob
+
+        :param local_file: the local file to store
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the file
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a response enum StoreOutcome
+        """
+        return self.store_object(local_file=local_file,
+                                 bucket_name=bucket_name,
+                                 remote_key=blob_key(digest),
+                                 check_identical=False,
+                                 raise_on_error=raise_on_error)
+
+    def fetch_blob(self, local_file: Path, bucket_name: str, digest: str,
+                   raise_on_error: bool = False) -> bool:
+        """
+        Retrieve a content-addressed blob and save it to a file
+
+        :param local_file: the location to store the local file
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a true/false boolean of success
+        """
+        versions = self.versions(bucket_name=bucket_name,
+                                 remote_key=blob_key(digest),
+                                 raise_on_error=raise_on_error)
+
+        if not versions:
+            return False
+
+        latest = max(versions, key=lambda item: item['last_modified'])
+
+        return self.download_object(local_file=local_file,
+                                    bucket_name=bucket_name,
+                                    remote_key=blob_key(digest),
+                                    version_id=latest['version_id'],
+                                    raise_on_error=raise_on_error)
+
+    def list_blobs(self, bucket_name: str,
+                   raise_on_error: bool = False) -> list[dict]:
+        """
+        List every content-addressed blob in a bucket
+
+        :param bucket_name: the remote bucket name
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :raises NotImplementedError: if the backend cannot list blobs
+        :return: a list of dictionaries containing 'digest', 'last_modified', and 'size'
+        """
+        raise NotImplementedError(
+            '{} does not support listing blobs'.format(self.backend_name))
+
+    def delete_blob(self, bucket_name: str, digest: str,
+                    raise_on_error: bool = False) -> bool:
+        """
+        Delete a content-addressed blob, including every stored version of it
+
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :raises NotImplementedError: if the backend cannot delete blobs
+        :return: a true/false boolean of success
+        """
+        raise NotImplementedError(
+            '{} does not support deleting blobs'.format(self.backend_name))
+
 
 class BackendFactory:
     @staticmethod
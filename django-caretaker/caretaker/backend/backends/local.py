@@ -6,6 +6,7 @@ import logging
 import os.path
 import re
 import shutil
+import tempfile
 import time
 import uuid
 from pathlib import Path
@@ -14,14 +15,68 @@ from types import ModuleType
 from django.conf import settings
 from datetime import datetime
 
-from caretaker.backend.abstract_backend import AbstractBackend, StoreOutcome
+from caretaker.backend.abstract_backend import AbstractBackend, \
+    StoreOutcome, ObjectWriter
 from caretaker.utils import log, file
+from caretaker.utils.manifest import blob_key, BLOB_PREFIX
 
 
 def get_backend():
     return LocalBackend()
 
 
+class LocalObjectWriter(ObjectWriter):
+    """
+    An ObjectWriter that writes straight into the local store
+
+    The stream goes to a hidden file at the top of the store, outside every
+    bucket directory, and is renamed into place when it is closed so that a
+    partial write is never listed as a version.
+    """
+
+    def __init__(self, backend: 'LocalBackend', bucket_name: str,
+                 remote_key: str, raise_on_error: bool = False):
+        super().__init__(backend=backend, bucket_name=bucket_name,
+                         remote_key=remote_key, raise_on_error=raise_on_error)
+
+        Path(backend.directory_store).mkdir(parents=True, exist_ok=True)
+
+        self._file = tempfile.NamedTemporaryFile(
+            dir=backend.directory_store, prefix='.caretaker-',
+            suffix='.part', delete=False)
+
+    def _write(self, data: memoryview) -> None:
+        self._file.write(data)
+
+    def _commit(self) -> StoreOutcome:
+        try:
+            self._file.close()
+
+            new_path = self.backend._create_file_path(self.bucket_name,
+                                                      self.remote_key)
+            new_path.parent.mkdir(parents=True, exist_ok=True)
+
+            os.replace(self._file.name, new_path)
+
+            self.backend.logger.info('Backup stream stored as {}'.format(
+                new_path))
+        except OSError as ce:
+            self.backend.logger.error('There was a problem storing the '
+                                      'backup stream: {}.'.format(ce))
+            self._abort()
+
+            if self.raise_on_error:
+                raise ce
+
+            return StoreOutcome.FAILED
+
+        return StoreOutcome.STORED
+
+    def _abort(self) -> None:
+        self._file.close()
+        Path(self._file.name).unlink(missing_ok=True)
+
+
 class LocalBackend(AbstractBackend):
     @property
     def terraform_files(self) -> list[str]:
@@ -104,9 +159,13 @@ class LocalBackend(AbstractBackend):
 
             versions = []
 
+            # anchor the key so that other keys that start with this one
+            # (e.g. media.zip.manifest.json) are not listed
+            final_regex = '{}-{}'.format(
+                self.file_pattern_regex,
+                '{}$'.format(re.escape(remote_key)) if remote_key else '')
+
             for file_name in directory_list:
-                final_regex = '{}-{}'.format(self.file_pattern_regex,
-                                             remote_key)
                 match = re.search(final_regex, str(file_name))
 
                 if match:
@@ -174,6 +233,20 @@ class LocalBackend(AbstractBackend):
 
         return StoreOutcome.STORED
 
+    def open_writer(self, bucket_name: str, remote_key: str,
+                    raise_on_error: bool = False) -> ObjectWriter:
+        """
+        Open a stream that is written directly into the local store
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: an ObjectWriter
+        """
+        return LocalObjectWriter(backend=self, bucket_name=bucket_name,
+                                 remote_key=remote_key,
+                                 raise_on_error=raise_on_error)
+
     def _create_file_path(self, bucket_name, remote_key) -> Path:
         """
         Create a file path for the backup
@@ -298,3 +371,192 @@ class LocalBackend(AbstractBackend):
                 raise ce
 
             return False
+
+    def object_size(self, bucket_name: str, remote_key: str,
+                    version_id: str,
+                    raise_on_error: bool = False) -> int | None:
+        """
+        The size of a version of an object
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param version_id: the version ID to check
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the size in bytes or None if the version was not found
+        """
+        try:
+            return os.path.getsize(glob.glob(str(self._get_file_path(
+                bucket_name, remote_key, version_id)))[0])
+        except (OSError, IndexError) as ce:
+            self.logger.error('Unable to find version {} of {}'.format(
+                version_id, remote_key))
+
+            if raise_on_error:
+                raise ce
+
+            return None
+
+    def get_object_range(self, bucket_name: str, remote_key: str,
+                         version_id: str, start: int, length: int,
+                         raise_on_error: bool = False) -> bytes | None:
+        """
+        Retrieve a byte range of an object by seeking in the stored file
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param version_id: the version ID to fetch
+        :param start: the offset of the first byte to fetch
+        :param length: the number of bytes to fetch
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the bytes of the range (shorter at the end of the object)
+        """
+        try:
+            new_path = glob.glob(str(self._get_file_path(bucket_name,
+                                                         remote_key,
+                                                         version_id)))[0]
+
+            with open(new_path, 'rb') as in_file:
+                in_file.seek(start)
+                return in_file.read(length)
+        except (OSError, IndexError) as ce:
+            self.logger.error('Unable to retrieve bytes {} to {} of version '
+                              '{} of {}'.format(start, start + length - 1,
+                                                version_id, remote_key))
+
+            if raise_on_error:
+                raise ce
+
+            return None
+
+    def _blob_path(self, bucket_name: str, digest: str) -> Path:
+        """
+        The path of a content-addressed blob in the store
+
+        :param bucket_name: the bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :return: a pathlib.Path to the blob
+        """
+        return Path(self.directory_store) / bucket_name / blob_key(digest)
+
+    def has_blob(self, bucket_name: str, digest: str,
+                 raise_on_error: bool = False) -> bool:
+        """
+        Check whether a content-addressed blob is stored
+
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: True if the blob is stored
+        """
+        return self._blob_path(bucket_name, digest).is_file()
+
+    def store_blob(self, local_file: Path, bucket_name: str, digest: str,
+                   raise_on_error: bool = False) -> StoreOutcome:
+        """
+        Store a file as a content-addressed blob
+
+        :param local_file: the local file to store
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the file
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a response enum StoreOutcome
+        """
+        new_path = self._blob_path(bucket_name, digest)
+
+        try:
+            new_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # copy then rename so that a partial blob is never visible
+            with tempfile.NamedTemporaryFile(dir=new_path.parent,
+                                             prefix='.caretaker-',
+                                             suffix='.part',
+                                             delete=False) as out_file:
+                with open(local_file, 'rb') as in_file:
+                    shutil.copyfileobj(in_file, out_file)
+
+            os.replace(out_file.name, new_path)
+        except OSError as ce:
+            self.logger.error('There was a problem storing blob {}: '
+                              '{}.'.format(digest, ce))
+            if raise_on_error:
+                raise ce
+            return StoreOutcome.FAILED
+
+        return StoreOutcome.STORED
+
+    def fetch_blob(self, local_file: Path, bucket_name: str, digest: str,
+                   raise_on_error: bool = False) -> bool:
+        """
+        Retrieve a content-addressed blob and save it to a file
+
+        :param local_file: the location to store the local file
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a true/false boolean of success
+        """
+        try:
+            shutil.copy(self._blob_path(bucket_name, digest), local_file)
+
+            return True
+        except OSError as ce:
+            self.logger.error('Unable to retrieve blob {} to {}'.format(
+                digest, local_file))
+
+            if raise_on_error:
+                raise ce
+
+            return False
+
+    def list_blobs(self, bucket_name: str,
+                   raise_on_error: bool = False) -> list[dict]:
+        """
+        List every content-addressed blob in a bucket
+
+        :param bucket_name: the remote bucket name
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of dictionaries containing 'digest', 'last_modified', and 'size'
+        """
+        blobs = []
+
+        try:
+            for blob in (Path(self.directory_store) / bucket_name /
+                         BLOB_PREFIX).glob('*/*'):
+                if blob.name.startswith('.caretaker-'):
+                    continue
+
+                stat = blob.stat()
+
+                blobs.append({
+                    'digest': blob.name,
+                    'last_modified': datetime.fromtimestamp(stat.st_mtime),
+                    'size': stat.st_size
+                })
+        except OSError as oe:
+            if raise_on_error:
+                raise oe
+
+        return blobs
+
+    def delete_blob(self, bucket_name: str, digest: str,
+                    raise_on_error: bool = False) -> bool:
+        """
+        Delete a content-addressed blob
+
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a true/false boolean of success
+        """
+        try:
+            self._blob_path(bucket_name, digest).unlink(missing_ok=True)
+
+            return True
+        except OSError as oe:
+            self.logger.error('Unable to delete blob {} ({})'.format(
+                digest, oe))
+
+            if raise_on_error:
+                raise oe
+
+            return False
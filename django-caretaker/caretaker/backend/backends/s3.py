@@ -1,8 +1,10 @@
+import collections
 import filecmp
 import importlib
 import io
 import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, Future
 from pathlib import Path
 from types import ModuleType
 
@@ -12,13 +14,171 @@ from boto3.exceptions import S3UploadFailedError
 from django.conf import settings
 
 from caretaker.utils import log
-from caretaker.backend.abstract_backend import AbstractBackend, StoreOutcome
+from caretaker.backend.abstract_backend import AbstractBackend, \
+    StoreOutcome, ObjectWriter
+from caretaker.utils.manifest import blob_key, BLOB_PREFIX
+
+# S3 rejects multipart uploads whose parts (bar the last) are smaller than this
+MINIMUM_PART_SIZE = 5 * 1024 * 1024
 
 
 def get_backend():
     return S3Backend()
 
 
+class S3MultipartWriter(ObjectWriter):
+    """
+    An ObjectWriter that streams to S3 as a multipart upload
+
+    Parts are uploaded on a small thread pool while the caller keeps writing,
+    so at most (concurrency + 1) parts are held in memory at once. Objects
+    smaller than a single part are sent with one PutObject call instead.
+    """
+
+    def __init__(self, backend: 'S3Backend', bucket_name: str,
+                 remote_key: str, raise_on_error: bool = False,
+                 part_size: int = 16 * 1024 * 1024, concurrency: int = 4):
+        super().__init__(backend=backend, bucket_name=bucket_name,
+                         remote_key=remote_key, raise_on_error=raise_on_error)
+
+        self.part_size = max(part_size, MINIMUM_PART_SIZE)
+        self.concurrency = max(concurrency, 1)
+
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._executor = None
+        self._in_flight: collections.deque[Future] = collections.deque()
+        self._parts = []
+        self._part_number = 0
+        self._error = None
+
+    def _write(self, data: memoryview) -> None:
+        # after a failed part the rest of the stream is discarded and the
+        # failure is reported when the writer is closed
+        if self._error:
+            return
+
+        self._buffer += data
+
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+
+            self._submit_part(part)
+
+    def _submit_part(self, body: bytes) -> None:
+        """
+        Queue a part for upload, waiting if too many are already in flight
+
+        :param body: the bytes of the part
+        :return: None
+        """
+        if self._upload_id is None:
+            response = self.backend.client.create_multipart_upload(
+                Bucket=self.bucket_name, Key=self.remote_key)
+
+            self._upload_id = response['UploadId']
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+        while len(self._in_flight) >= self.concurrency and not self._error:
+            self._collect_part()
+
+        if self._error:
+            return
+
+        self._part_number += 1
+        self._in_flight.append(self._executor.submit(
+            self._upload_part, self._part_number, body))
+
+    def _upload_part(self, part_number: int, body: bytes) -> dict:
+        """
+        Upload a single part
+
+        :param part_number: the 1-based number of the part
+        :param body: the bytes of the part
+        :return: a dictionary of the part's 'ETag' and 'PartNumber'
+        """
+        response = self.backend.client.upload_part(
+            Bucket=self.bucket_name, Key=self.remote_key,
+            UploadId=self._upload_id, PartNumber=part_number, Body=body)
+
+        return {'ETag': response['ETag'], 'PartNumber': part_number}
+
+    def _collect_part(self) -> None:
+        """
+        Wait for the oldest part in flight to finish uploading
+
+        :return: None
+        """
+        try:
+            self._parts.append(self._in_flight.popleft().result())
+        except botocore.exceptions.ClientError as ce:
+            self._error = ce
+
+    def _commit(self) -> StoreOutcome:
+        try:
+            if self._upload_id is None:
+                self.backend.client.put_object(Bucket=self.bucket_name,
+                                               Key=self.remote_key,
+                                               Body=bytes(self._buffer))
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+
+                while self._in_flight:
+                    self._collect_part()
+
+                if self._error:
+                    raise self._error
+
+                self.backend.client.complete_multipart_upload(
+                    Bucket=self.bucket_name, Key=self.remote_key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={'Parts': self._parts})
+
+            self.logger.info('Backup stream of {} bytes stored as '
+                             '{}'.format(self.size, self.remote_key))
+        except botocore.exceptions.ClientError as ce:
+            self.logger.error('There was a problem storing the backup '
+                              'stream.')
+            self._abort()
+
+            if self.raise_on_error:
+                raise ce
+
+            return StoreOutcome.FAILED
+        finally:
+            self._buffer = bytearray()
+
+            if self._executor:
+                self._executor.shutdown(wait=True)
+
+        return StoreOutcome.STORED
+
+    def _abort(self) -> None:
+        if self._executor:
+            for future in self._in_flight:
+                future.cancel()
+
+            self._executor.shutdown(wait=True)
+            self._in_flight.clear()
+
+        if self._upload_id is not None:
+            try:
+                self.backend.client.abort_multipart_upload(
+                    Bucket=self.bucket_name, Key=self.remote_key,
+                    UploadId=self._upload_id)
+            except botocore.exceptions.ClientError:
+                self.logger.warning('Unable to abort the multipart upload of '
+                                    '{}'.format(self.remote_key))
+
+            self._upload_id = None
+
+    @property
+    def logger(self) -> logging.Logger:
+        return self.backend.logger
+
+
 class S3Backend(AbstractBackend):
     @property
     def terraform_files(self) -> list[str]:
@@ -68,11 +228,14 @@ class S3Backend(AbstractBackend):
                                                         Prefix=remote_key)
 
             if versions and 'Versions' in versions:
+                # the listing is by prefix, so drop other keys that happen to
+                # start with this one (e.g. media.zip.manifest.json)
                 final_versions = [
                     {'version_id': item['VersionId'],
                      'last_modified': item['LastModified'],
                      'size': item['Size']
                      } for item in versions['Versions']
+                    if not remote_key or item['Key'] == remote_key
                 ]
                 return final_versions
             else:
@@ -142,6 +305,27 @@ class S3Backend(AbstractBackend):
 
         return StoreOutcome.STORED
 
+    def open_writer(self, bucket_name: str, remote_key: str,
+                    raise_on_error: bool = False) -> ObjectWriter:
+        """
+        Open a stream that is uploaded to S3 as it is written
+
+        The part size and the number of parts uploaded at once are set by
+        CARETAKER_S3_PART_SIZE and CARETAKER_S3_UPLOAD_CONCURRENCY.
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: an ObjectWriter
+        """
+        return S3MultipartWriter(
+            backend=self, bucket_name=bucket_name, remote_key=remote_key,
+            raise_on_error=raise_on_error,
+            part_size=getattr(settings, 'CARETAKER_S3_PART_SIZE',
+                              16 * 1024 * 1024),
+            concurrency=getattr(settings, 'CARETAKER_S3_UPLOAD_CONCURRENCY',
+                                4))
+
     def get_object(self, bucket_name: str, remote_key: str,
                    version_id: str,
                    raise_on_error: bool = False) -> io.BytesIO | None:
@@ -219,3 +403,200 @@ class S3Backend(AbstractBackend):
                 raise ce
 
             return False
+
+    def object_size(self, bucket_name: str, remote_key: str,
+                    version_id: str,
+                    raise_on_error: bool = False) -> int | None:
+        """
+        The size of a version of an object
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param version_id: the version ID to check
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the size in bytes or None if the version was not found
+        """
+        try:
+            response = self.client.head_object(Bucket=bucket_name,
+                                               Key=remote_key,
+                                               VersionId=version_id)
+
+            return response['ContentLength']
+        except botocore.exceptions.ClientError as ce:
+            self.logger.error('Unable to find version {} of {}'.format(
+                version_id, remote_key))
+
+            if raise_on_error:
+                raise ce
+
+            return None
+
+    def get_object_range(self, bucket_name: str, remote_key: str,
+                         version_id: str, start: int, length: int,
+                         raise_on_error: bool = False) -> bytes | None:
+        """
+        Retrieve a byte range of an object with a ranged GET
+
+        :param bucket_name: the remote bucket name
+        :param remote_key: the remote key (filename) of the object
+        :param version_id: the version ID to fetch
+        :param start: the offset of the first byte to fetch
+        :param length: the number of bytes to fetch
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the bytes of the range (shorter at the end of the object)
+        """
+        try:
+            response = self.client.get_object(
+                Bucket=bucket_name, Key=remote_key, VersionId=version_id,
+                Range='bytes={}-{}'.format(start, start + length - 1))
+
+            return response['Body'].read()
+        except botocore.exceptions.ClientError as ce:
+            self.logger.error('Unable to fetch bytes {} to {} of version {} '
+                              'of {}'.format(start, start + length - 1,
+                                             version_id, remote_key))
+
+            if raise_on_error:
+                raise ce
+
+            return None
+
+    def has_blob(self, bucket_name: str, digest: str,
+                 raise_on_error: bool = False) -> bool:
+        """
+        Check whether a content-addressed blob is stored
+
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: True if the blob is stored
+        """
+        try:
+            self.client.head_object(Bucket=bucket_name, Key=blob_key(digest))
+
+            return True
+        except botocore.exceptions.ClientError as ce:
+            if ce.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                return False
+
+            self.logger.error('Unable to check for blob {} ({})'.format(
+                digest, ce))
+
+            if raise_on_error:
+                raise ce
+
+            return False
+
+    def store_blob(self, local_file: Path, bucket_name: str, digest: str,
+                   raise_on_error: bool = False) -> StoreOutcome:
+        """
+        Store a file as a content-addressed blob
+
+        :param local_file: the local file to store
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the file
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a response enum StoreOutcome
+        """
+        try:
+            self.client.upload_file(Filename=str(local_file),
+                                    Bucket=bucket_name, Key=blob_key(digest))
+        except (botocore.exceptions.ClientError, S3UploadFailedError) as ce:
+            self.logger.error('There was a problem storing blob {} from '
+                              '{}.'.format(digest, local_file))
+            if raise_on_error:
+                raise ce
+            return StoreOutcome.FAILED
+
+        return StoreOutcome.STORED
+
+    def fetch_blob(self, local_file: Path, bucket_name: str, digest: str,
+                   raise_on_error: bool = False) -> bool:
+        """
+        Retrieve a content-addressed blob and save it to a file
+
+        :param local_file: the location to store the local file
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a true/false boolean of success
+        """
+        try:
+            self.client.download_file(Filename=str(local_file),
+                                      Bucket=bucket_name,
+                                      Key=blob_key(digest))
+
+            return True
+        except botocore.exceptions.ClientError as ce:
+            self.logger.error('Unable to download blob {} to {}'.format(
+                digest, local_file))
+
+            if raise_on_error:
+                raise ce
+
+            return False
+
+    def list_blobs(self, bucket_name: str,
+                   raise_on_error: bool = False) -> list[dict]:
+        """
+        List every content-addressed blob in a bucket
+
+        :param bucket_name: the remote bucket name
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of dictionaries containing 'digest', 'last_modified', and 'size'
+        """
+        blobs = []
+
+        try:
+            paginator = self.client.get_paginator('list_objects_v2')
+
+            for page in paginator.paginate(Bucket=bucket_name,
+                                           Prefix='{}/'.format(BLOB_PREFIX)):
+                for item in page.get('Contents', []):
+                    blobs.append({'digest': item['Key'].rsplit('/', 1)[-1],
+                                  'last_modified': item['LastModified'],
+                                  'size': item['Size']})
+        except botocore.exceptions.ClientError as ce:
+            self.logger.error('Unable to list blobs in {} ({})'.format(
+                bucket_name, ce))
+
+            if raise_on_error:
+                raise ce
+
+        return blobs
+
+    def delete_blob(self, bucket_name: str, digest: str,
+                    raise_on_error: bool = False) -> bool:
+        """
+        Delete a content-addressed blob, including every stored version of it
+
+        In a versioned bucket a plain delete only adds a delete marker, so
+        every version and marker of the key is removed to free the space.
+
+        :param bucket_name: the remote bucket name
+        :param digest: the SHA-256 hex digest of the blob
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a true/false boolean of success
+        """
+        key = blob_key(digest)
+
+        try:
+            paginator = self.client.get_paginator('list_object_versions')
+
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=key):
+                for item in page.get('Versions', []) + \
+                        page.get('DeleteMarkers', []):
+                    if item['Key'] == key:
+                        self.client.delete_object(
+                            Bucket=bucket_name, Key=key,
+                            VersionId=item['VersionId'])
+
+            return True
+        except botocore.exceptions.ClientError as ce:
+            self.logger.error('Unable to delete blob {} ({})'.format(
+                digest, ce))
+
+            if raise_on_error:
+                raise ce
+
+            return False
@@ -0,0 +1,131 @@
+import io
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from caretaker.backend.abstract_backend import AbstractBackend
+
+
+class RemoteFileError(OSError):
+    pass
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    A read-only, seekable view of a version of a remote object
+
+    Reads are served with byte-range requests to the backend, so a ZipFile
+    opened on a RemoteFile only transfers its central directory and the
+    members that are extracted. Each request reads ahead by at least
+    block_size bytes so that small sequential reads do not each cost a round
+    trip.
+    """
+
+    def __init__(self, backend: 'AbstractBackend', bucket_name: str,
+                 remote_key: str, version_id: str,
+                 block_size: int = 1024 * 1024):
+        super().__init__()
+
+        self.backend = backend
+        self.bucket_name = bucket_name
+        self.remote_key = remote_key
+        self.version_id = version_id
+        self.block_size = block_size
+
+        self.size = backend.object_size(bucket_name=bucket_name,
+                                        remote_key=remote_key,
+                                        version_id=version_id,
+                                        raise_on_error=True)
+
+        if self.size is None:
+            raise RemoteFileError('Unable to find version {} of {}'.format(
+                version_id, remote_key))
+
+        self.bytes_fetched = 0
+        self.requests = 0
+
+        self._position = 0
+        self._buffer = b''
+        self._buffer_start = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self.size + offset
+        else:
+            raise ValueError('invalid whence ({})'.format(whence))
+
+        if self._position < 0:
+            raise ValueError('negative seek position {}'.format(
+                self._position))
+
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        """
+        Read into a pre-allocated buffer from the current position
+
+        :param buffer: a writable bytes-like object
+        :return: the number of bytes read (0 at the end of the object)
+        """
+        wanted = min(len(buffer), self.size - self._position)
+
+        if wanted <= 0:
+            return 0
+
+        offset = self._position - self._buffer_start
+
+        if offset < 0 or offset + wanted > len(self._buffer):
+            self._fill(wanted)
+            offset = self._position - self._buffer_start
+
+        buffer[:wanted] = self._buffer[offset:offset + wanted]
+        self._position += wanted
+
+        return wanted
+
+    def _fill(self, wanted: int) -> None:
+        """
+        Fetch a range that covers the current position
+
+        A read in the last block of the object fetches the whole block. The
+        zip end records live there, and for smaller archives the central
+        directory does too, so opening a zip costs a single request.
+
+        :param wanted: the number of bytes that the caller needs
+        :raises RemoteFileError: if the range could not be fetched
+        :return: None
+        """
+        start = self._position
+
+        if start + wanted > self.size - self.block_size:
+            start = max(0, min(start, self.size - self.block_size))
+
+        length = min(max(self._position - start + wanted, self.block_size),
+                     self.size - start)
+
+        data = self.backend.get_object_range(
+            bucket_name=self.bucket_name, remote_key=self.remote_key,
+            version_id=self.version_id, start=start, length=length,
+            raise_on_error=True)
+
+        if data is None or len(data) < self._position - start + wanted:
+            raise RemoteFileError('Short read of {} at offset {}'.format(
+                self.remote_key, self._position))
+
+        self._buffer = data
+        self._buffer_start = start
+
+        self.bytes_fetched += len(data)
+        self.requests += 1
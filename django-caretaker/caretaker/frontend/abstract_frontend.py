@@ -33,14 +33,16 @@ class AbstractFrontend(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def export_sql(database: str = '', alternative_binary: str = '',
                    alternative_args: list | None = None,
-                   output_file: str = '-') -> TextIO | BinaryIO:
+                   output_file: str | BinaryIO = '-',
+                   tables: list[str] | None = None) -> TextIO | BinaryIO:
         """
         Export SQL from the database using the specific provider
 
         :param database: the database to export
         :param alternative_binary: a different binary file to run
         :param alternative_args: a different set of cmdline args to pass
-        :param output_file: an output file to write to rather than stdout
+        :param output_file: an output file to write to rather than stdout, or a writable file-like object
+        :param tables: the tables of Django's models to export, leaving out the rest (None exports everything)
         :return: a string of the database output
         """
         pass
@@ -59,7 +61,9 @@ class AbstractFrontend(metaclass=abc.ABCMeta):
                     alternative_args: list | None = None,
                     input_file: str = '-',
                     raise_on_error: bool = False,
-                    dry_run: bool = False) -> bool:
+                    dry_run: bool = False,
+                    delta_files: list | None = None,
+                    skip_unchanged: bool = False) -> bool:
         """
         Import a file into the database
 
@@ -69,20 +73,30 @@ class AbstractFrontend(metaclass=abc.ABCMeta):
         :param input_file: an input file to import
         :param raise_on_error: whether to raise exceptions or log them
         :param dry_run: if True, will not commit to the database
+        :param delta_files: incremental archives or JSON exports to replay, in order, on top of an archive or sharded JSON input file
+        :param skip_unchanged: whether to leave media files whose size, mtime and CRC already match the archive (also enabled by CARETAKER_RESTORE_SKIP_UNCHANGED)
         :return: a string of the database output
         """
         pass
 
     @staticmethod
     @abc.abstractmethod
-    def export_json(data_file, logger, output_directory) -> io.StringIO:
+    def export_json(data_file, logger, output_directory,
+                    incremental: bool = False,
+                    previous_manifest: dict | None = None,
+                    include: list[str] | None = None,
+                    exclude: list[str] | None = None) -> Path:
         """
         Dump JSON using the dumpdata command
 
         :param data_file: the data file to deposit to
         :param logger: the logger object
         :param output_directory: the output directory
-        :return:
+        :param incremental: whether to export only the rows that changed since previous_manifest
+        :param previous_manifest: the data manifest of the previous export (a full export is taken if None)
+        :param include: if not empty, export only the apps, models and tables that these name
+        :param exclude: apps, models and tables to leave out
+        :return: a pathlib.Path object pointing to the data file
         """
 
     @staticmethod
@@ -94,8 +108,18 @@ class AbstractFrontend(metaclass=abc.ABCMeta):
                       sql_mode: bool = False,
                       database: str = DEFAULT_DB_ALIAS,
                       alternative_binary: str = '',
-                      alternative_arguments: str = '') -> (Path | None,
-                                                           Path | None):
+                      alternative_arguments: str = '',
+                      incremental: bool = False,
+                      previous_manifest: dict | None = None,
+                      archive_writer: BinaryIO | None = None,
+                      archive: bool = True,
+                      incremental_data: bool = False,
+                      previous_data_manifest: dict | None = None,
+                      include: list[str] | None = None,
+                      exclude: list[str] | None = None,
+                      tiers: list[str] | None = None,
+                      data_writer: BinaryIO | None = None) \
+            -> (Path | BinaryIO | None, Path | BinaryIO | None):
         """
         Creates a set of local backup files
 
@@ -108,6 +132,16 @@ class AbstractFrontend(metaclass=abc.ABCMeta):
         :param database: the database to export (will use default if unspecified)
         :param alternative_arguments: alternative arguments to pass in SQL mode
         :param alternative_binary: alternative export binary to use in SQL mode
+        :param incremental: whether to write a manifest and archive only the files that changed since previous_manifest
+        :param previous_manifest: the manifest of the previous archive in incremental mode
+        :param archive_writer: a writable stream to send the archive to instead of writing it to the output directory
+        :param archive: whether to archive the media at all (not needed when it is pushed as content-addressed blobs)
+        :param incremental_data: whether to write a data manifest and export only the rows that changed since previous_data_manifest
+        :param previous_data_manifest: the data manifest of the previous JSON export in incremental mode
+        :param include: apps, models or tables to export, leaving out the rest
+        :param exclude: apps, models or tables to leave out
+        :param tiers: the retention tiers to back up in this run
+        :param data_writer: a writable stream to send the data file to instead of writing it to the output directory
         :return: a 2-tuple of pathlib.Path objects to the data file and archive file
         """
         pass
@@ -141,6 +175,23 @@ class AbstractFrontend(metaclass=abc.ABCMeta):
         """
         pass
 
+    @staticmethod
+    @abc.abstractmethod
+    def list_archive(remote_key: str, backend: AbstractBackend,
+                     bucket_name: str, backup_version: str = '',
+                     raise_on_error: bool = False) -> list[dict] | None:
+        """
+        Lists the files in a version of a remote archive without downloading it
+
+        :param remote_key: the remote key (filename) of the archive
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param backup_version: the version to list (the latest if empty)
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of dictionaries that contain the keys "path", "size", "compressed_size" and "mtime", or None on error
+        """
+        pass
+
     @staticmethod
     @abc.abstractmethod
     def pull_backup(backup_version: str, out_file: str, remote_key: str,
@@ -210,8 +261,16 @@ class AbstractFrontend(metaclass=abc.ABCMeta):
                    sql_mode: bool = False,
                    database: str = DEFAULT_DB_ALIAS,
                    alternative_binary: str = '',
-                   alternative_arguments: str = '') -> (Path | None,
-                                                        Path | None):
+                   alternative_arguments: str = '',
+                   incremental: bool = False,
+                   stream_archive: bool = False,
+                   content_addressed: bool = False,
+                   incremental_data: bool = False,
+                   include: list[str] | None = None,
+                   exclude: list[str] | None = None,
+                   tiers: list[str] | None = None,
+                   stream_data: bool = False) -> (Path | BinaryIO | None,
+                                                  Path | None):
         """
         Creates a backup set and pushes it to the remote store
 
@@ -225,10 +284,92 @@ class AbstractFrontend(metaclass=abc.ABCMeta):
         :param database: the database to export (will use default if unspecified)
         :param alternative_arguments: alternative arguments to pass in SQL mode
         :param alternative_binary: alternative export binary to use in SQL mode
+        :param incremental: whether to archive only the files that changed since the last pushed manifest
+        :param stream_archive: whether to upload the archive while it is being written instead of staging it on disk
+        :param content_addressed: whether to push media as deduplicated blobs and a content manifest instead of an archive
+        :param incremental_data: whether to export only the rows that changed since the last pushed data manifest
+        :param include: apps, models or tables to export, leaving out the rest
+        :param exclude: apps, models or tables to leave out
+        :param tiers: the retention tiers to back up in this run
+        :param stream_data: whether to upload the data file while it is being dumped instead of staging it on disk
         :return: 2-tuple of pathlib.Path objects to the data file & archive file
         """
         pass
 
+    @staticmethod
+    @abc.abstractmethod
+    def push_content(path_list: list | None, backend: AbstractBackend,
+                     bucket_name: str, archive_file: str = 'media.zip',
+                     raise_on_error: bool = False) -> dict | None:
+        """
+        Push media as content-addressed blobs and a manifest of paths to digests
+
+        :param path_list: the list of paths to back up
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from (e.g. media.zip gives media.content.json)
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the manifest dictionary or None if a blob could not be stored
+        """
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def restore_content(backend: AbstractBackend, bucket_name: str,
+                        archive_file: str = 'media.zip',
+                        backup_version: str = '', dry_run: bool = False,
+                        raise_on_error: bool = False) -> bool:
+        """
+        Rebuild media from a content manifest and its blobs
+
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from
+        :param backup_version: the version of the manifest to restore (the latest if empty)
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a true/false boolean of success
+        """
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def collect_garbage(backend: AbstractBackend, bucket_name: str,
+                        archive_file: str = 'media.zip',
+                        dry_run: bool = False,
+                        raise_on_error: bool = False) -> list[str]:
+        """
+        Delete content-addressed blobs that no stored manifest references
+
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of the digests that were (or, in dry run mode, would be) deleted
+        """
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def restore_paths(patterns: list[str], backend: AbstractBackend,
+                      bucket_name: str, remote_key: str = 'media.zip',
+                      backup_version: str = '', dry_run: bool = False,
+                      raise_on_error: bool = False) -> list[str]:
+        """
+        Restore only the members of a remote zip archive that match path globs
+
+        :param patterns: shell-style globs matched against absolute paths (e.g. /var/www/media/users/42/*)
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param remote_key: the remote key (filename) of the archive
+        :param backup_version: the version of the archive to read (the latest if empty)
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of the restored (or, in dry run mode, matching) paths
+        """
+        pass
+
 
 class FrontendNotFoundError (Exception):
     pass
@@ -1,7 +1,9 @@
 import abc
+import os
 import subprocess
 import sys
 from logging import Logger
+from pathlib import Path
 from typing import TextIO
 from typing.io import BinaryIO
 
@@ -13,6 +15,7 @@ from caretaker.frontend.frontends.database_exporters.django import utils
 from caretaker.frontend.frontends.utils import BufferedProcessReader, \
     DatabasePatcher
 from caretaker.utils import log
+from caretaker.utils.tar import pack_directory
 
 
 class AbstractDatabaseExporter(metaclass=abc.ABCMeta):
@@ -100,18 +103,31 @@ class AbstractDatabaseExporter(metaclass=abc.ABCMeta):
         :return: 2-tuple of array of arguments and dict of environment variables
         """
         return utils.delegate_settings_to_cmd_args(
-            alternative_args=str(
-                frontend_utils.ternary_switch(self.provided_args,
-                                              alternative_args)),
+            alternative_args=frontend_utils.ternary_switch(self.provided_args,
+                                                           alternative_args),
             binary_name=self._binary_final(alternative_binary),
             settings_dict=connection.settings_dict,
             database_client=self.client_type(connection)
         )
 
+    def selection_args(self, connection: BaseDatabaseWrapper,
+                       tables: list[str], excluded: list[str]) -> list[str]:
+        """
+        The arguments that export only some of the tables of a database
+
+        :param connection: the connection object
+        :param tables: the tables to export
+        :param excluded: the tables to leave out
+        :return: a list of arguments to use instead of provided_args
+        """
+        return [self.provided_args] if self.provided_args else []
+
     def export_sql(self, connection: BaseDatabaseWrapper,
                    alternative_binary: str = '',
                    alternative_args: list | None = None,
-                   output_file: str = '-') -> TextIO | BinaryIO:
+                   output_file: str = '-', compression: str = 'none',
+                   level: int | None = None,
+                   threads: int = 0) -> TextIO | BinaryIO:
         """
         Export SQL from the database using the specific provider
 
@@ -119,6 +135,9 @@ class AbstractDatabaseExporter(metaclass=abc.ABCMeta):
         :param alternative_binary: the alternative binary to use
         :param alternative_args: a different set of cmdline args to pass
         :param output_file: an output file to write to rather than stdout
+        :param compression: one of SQL_COMPRESSIONS in caretaker.utils.file, applied to the output as it is read
+        :param level: the compression level (None uses the default for the compression)
+        :param threads: the number of zstd compression threads
         :return: a string of the database to output
         """
         args, env = self.args_and_env(
@@ -134,7 +153,9 @@ class AbstractDatabaseExporter(metaclass=abc.ABCMeta):
                                                      bufsize=8192, shell=False)
 
         reader = BufferedProcessReader(process)
-        reader.handle_process(output_filename=output_file)
+        reader.handle_process(output_filename=output_file,
+                              compression=compression, level=level,
+                              threads=threads)
 
         if process.returncode != 0:
             raise subprocess.CalledProcessError(returncode=process.returncode,
@@ -143,6 +164,38 @@ class AbstractDatabaseExporter(metaclass=abc.ABCMeta):
 
         return sys.stdout if output_file == '-' else output_file
 
+    @staticmethod
+    def write_directory_archive(directory: Path, output_file: str,
+                                first_member: str) -> None:
+        """
+        Pack the directory that a dump tool wrote into a single data file
+
+        The file is written beside the output file and renamed into place
+        once it is complete.
+
+        :param directory: the directory to pack
+        :param output_file: an output file to write to, or '-' for stdout
+        :param first_member: the file that identifies the tool, stored first
+        :return: None
+        """
+        if output_file == '-':
+            sys.stdout.flush()
+            pack_directory(directory, sys.stdout.buffer,
+                           first_member=first_member)
+
+            return
+
+        target = Path(output_file)
+        partial = target.with_name(target.name + '.partial')
+
+        with partial.open('wb') as out_file:
+            pack_directory(directory, out_file, first_member=first_member)
+
+            out_file.flush()
+            os.fsync(out_file.fileno())
+
+        os.replace(partial, target)
+
     def patch(self, connection: BaseDatabaseWrapper) -> bool:
         """
         Patches the connection object with a method "export_sql" or removes this method if it's already set to this function's setting
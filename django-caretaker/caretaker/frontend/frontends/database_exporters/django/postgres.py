@@ -1,9 +1,15 @@
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.backends.base.client import BaseDatabaseClient
 from django.db.backends.postgresql.client import DatabaseClient
 
 from caretaker.frontend.frontends.database_exporters. \
     abstract_database_exporter import AbstractDatabaseExporter
+from caretaker.utils.file import POSTGRES_TOC_MEMBER
 
 
 class PostgresDatabaseExporter(AbstractDatabaseExporter):
@@ -50,6 +56,85 @@ class PostgresDatabaseExporter(AbstractDatabaseExporter):
         """
         return 'django.db.backends.postgresql'
 
+    def selection_args(self, connection: BaseDatabaseWrapper,
+                       tables: list[str], excluded: list[str]) -> list[str]:
+        """
+        The arguments that export only some of the tables of a database
+
+        Excluded tables are left out of the dump altogether, so that a
+        restore does not drop and recreate them empty.
+
+        :param connection: the connection object
+        :param tables: the tables to export
+        :param excluded: the tables to leave out
+        :return: a list of arguments to use instead of provided_args
+        """
+        return [self.provided_args] + ['--exclude-table={}'.format(table)
+                                       for table in excluded]
+
+    def export_archive(self, connection: BaseDatabaseWrapper,
+                       output_file: str = '-', dump_format: str = 'directory',
+                       jobs: int = 1,
+                       alternative_args: list | None = None) -> str:
+        """
+        Dump the database in pg_dump's custom or directory format
+
+        Either archive can be restored by pg_restore on several jobs at once.
+        Only the directory format can also be dumped on several jobs, and it
+        is packed into a single uncompressed tar, starting with its toc.dat,
+        so that it can be pushed and pulled like any other data file.
+
+        :param connection: the connection object
+        :param output_file: an output file to write to rather than stdout
+        :param dump_format: 'custom' or 'directory'
+        :param jobs: the number of tables to dump at once in directory format
+        :param alternative_args: the arguments from selection_args, if any
+        :return: the output filename, or '-'
+        """
+        # --clean only applies to plain dumps, so pg_restore is asked instead
+        selection = [arg for arg in (alternative_args if alternative_args
+                                     else [])
+                     if arg != self.provided_args]
+
+        if dump_format == 'custom':
+            self.export_sql(connection=connection,
+                            alternative_args=['-Fc'] + selection,
+                            output_file=output_file)
+
+            return output_file
+
+        # pg_dump writes the directory beside the output file
+        with tempfile.TemporaryDirectory(
+                dir=None if output_file == '-'
+                else Path(output_file).parent) as temporary_directory_name:
+            directory = Path(temporary_directory_name) / 'dump'
+
+            args, env = self.args_and_env(
+                connection=connection,
+                alternative_args=['-Fd', '-j', str(jobs), '-f',
+                                  str(directory)] + selection)
+
+            final_args = [str(arg) for arg in args]
+
+            start = time.perf_counter()
+
+            process = subprocess.run(final_args, env=env)
+
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    returncode=process.returncode, cmd=' '.join(final_args),
+                    output='Output not available')
+
+            self.write_directory_archive(directory=directory,
+                                         output_file=output_file,
+                                         first_member=POSTGRES_TOC_MEMBER)
+
+            self.logger.info('Dumped the database on {} jobs in '
+                             '{:.1f}s'.format(jobs,
+                                              time.perf_counter() - start))
+
+        return output_file
+
     def client_type(self, connection: BaseDatabaseWrapper) \
             -> BaseDatabaseClient:
         """
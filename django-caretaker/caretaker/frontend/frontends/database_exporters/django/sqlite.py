@@ -1,3 +1,12 @@
+import contextlib
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.backends.base.client import BaseDatabaseClient
 from django.db.backends.sqlite3.client import DatabaseClient
@@ -50,6 +59,77 @@ class SQLiteDatabaseExporter(AbstractDatabaseExporter):
         """
         return 'django.db.backends.sqlite3'
 
+    def selection_args(self, connection: BaseDatabaseWrapper,
+                       tables: list[str], excluded: list[str]) -> list[str]:
+        """
+        The arguments that export only some of the tables of a database
+
+        The .dump command can only name the tables to include, so every table
+        that is not excluded is named.
+
+        :param connection: the connection object
+        :param tables: the tables to export
+        :param excluded: the tables to leave out
+        :return: a list of arguments to use instead of provided_args
+        """
+        return [' '.join([self.provided_args] + ["'{}'".format(table)
+                                                 for table in tables])]
+
+    def export_snapshot(self, connection: BaseDatabaseWrapper,
+                        output_file: str = '-',
+                        method: str = 'backup') -> str:
+        """
+        Copy the database to a consistent binary snapshot
+
+        The snapshot is read through a connection of its own, so it holds
+        everything committed when the copy starts and nothing else, and other
+        connections can keep writing while it is taken (in WAL mode, writers
+        are not even paused). 'backup' copies the pages with the online
+        backup API, and 'vacuum' writes a compacted copy with VACUUM INTO.
+        The snapshot is written beside the output file and renamed into
+        place once it is complete.
+
+        :param connection: the connection object
+        :param output_file: an output file to write to rather than stdout
+        :param method: 'backup' or 'vacuum'
+        :return: the output filename, or '-'
+        """
+        with contextlib.ExitStack() as stack:
+            if output_file == '-':
+                target = Path(stack.enter_context(
+                    tempfile.TemporaryDirectory())) / 'snapshot.sqlite3'
+            else:
+                target = Path(output_file)
+
+            partial = target.with_name(target.name + '.partial')
+            partial.unlink(missing_ok=True)
+
+            start = time.perf_counter()
+
+            with contextlib.closing(sqlite3.connect(
+                    str(connection.settings_dict['NAME']))) as source:
+                if method == 'vacuum':
+                    source.execute('VACUUM INTO ?', [str(partial)])
+                else:
+                    with contextlib.closing(
+                            sqlite3.connect(str(partial))) as destination:
+                        source.backup(destination)
+
+            with partial.open('rb') as in_file:
+                os.fsync(in_file.fileno())
+
+            os.replace(partial, target)
+
+            self.logger.info('Wrote a {} byte snapshot with {} in '
+                             '{:.1f}s'.format(target.stat().st_size, method,
+                                              time.perf_counter() - start))
+
+            if output_file == '-':
+                with target.open('rb') as in_file:
+                    shutil.copyfileobj(in_file, sys.stdout.buffer)
+
+        return output_file
+
     def client_type(self, connection: BaseDatabaseWrapper) \
             -> BaseDatabaseClient:
         """
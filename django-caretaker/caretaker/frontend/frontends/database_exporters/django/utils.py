@@ -24,3 +24,34 @@ def delegate_settings_to_cmd_args(alternative_args: list | object,
     # patch the binary name
     args[0] = binary_name
     return args, env
+
+
+def mydumper_args(args: list) -> list:
+    """
+    Convert the mysql arguments that Django builds for mydumper or myloader
+
+    Both tools take the database with --database rather than as a positional
+    argument, and name SSL files without an ssl- prefix. They have no option
+    for the connection character set, which they choose themselves.
+
+    :param args: the arguments from delegate_settings_to_cmd_args
+    :return: a list of arguments
+    """
+    renamed = {'--ssl-ca=': '--ca=', '--ssl-cert=': '--cert=',
+               '--ssl-key=': '--key='}
+
+    converted = [args[0]]
+
+    for arg in args[1:]:
+        arg = str(arg)
+
+        if not arg.startswith('-'):
+            converted.append('--database={}'.format(arg))
+        elif not arg.startswith('--default-character-set='):
+            for prefix, replacement in renamed.items():
+                if arg.startswith(prefix):
+                    arg = replacement + arg[len(prefix):]
+
+            converted.append(arg)
+
+    return converted
@@ -1,8 +1,12 @@
 import abc
+import contextlib
+import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
+from pathlib import Path
 from typing import TextIO
 from typing.io import BinaryIO
 
@@ -13,7 +17,7 @@ from caretaker.frontend.frontends import utils as frontend_utils
 from caretaker.frontend.frontends.database_exporters.django import utils
 from caretaker.frontend.frontends.utils import BufferedProcessReader, \
     DatabasePatcher
-from caretaker.utils import log
+from caretaker.utils import log, file
 
 
 class AbstractDatabaseImporter(metaclass=abc.ABCMeta):
@@ -23,6 +27,9 @@ class AbstractDatabaseImporter(metaclass=abc.ABCMeta):
 
     _args = ''
 
+    # the file that the client reads a decompressed dump from
+    stdin_file = '/dev/stdin'
+
     def __init__(self):
         """
         Instantiate a database importer
@@ -149,6 +156,9 @@ class AbstractDatabaseImporter(metaclass=abc.ABCMeta):
         """
         Export SQL from the database using the specific provider
 
+        A gzip or zstd compressed dump is decompressed into the standard input
+        of the client as it runs, so it is never written out uncompressed.
+
         :param connection: the connection object
         :param alternative_binary: the alternative binary to use
         :param alternative_args: a different set of cmdline args to pass
@@ -157,6 +167,12 @@ class AbstractDatabaseImporter(metaclass=abc.ABCMeta):
         """
         logger = log.get_logger('sql-importer')
 
+        compression = file.compression_type(Path(input_file))
+        compressed_file = input_file
+
+        if compression != 'none':
+            input_file = self.stdin_file
+
         with tempfile.TemporaryDirectory() as temporary_directory_name:
             new_file = self._pre_hook(
                 connection=connection,
@@ -190,10 +206,35 @@ class AbstractDatabaseImporter(metaclass=abc.ABCMeta):
             try:
                 process: subprocess.Popen = subprocess.Popen(
                     final_args, env=env, stdout=subprocess.PIPE,
+                    stdin=subprocess.PIPE if compression != 'none' else None,
                     bufsize=8192, shell=False)
 
-                reader = BufferedProcessReader(process)
-                reader.handle_process(output_filename='-')
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    feeder = executor.submit(
+                        self._feed, stdin=process.stdin,
+                        input_file=compressed_file,
+                        compression=compression) \
+                        if compression != 'none' else None
+
+                    reader = BufferedProcessReader(process)
+                    reader.handle_process(output_filename='-')
+
+                    try:
+                        if feeder:
+                            feeder.result()
+                    except Exception as error:
+                        # a damaged dump fails like the client would
+                        self._rollback_hook(
+                            connection=connection,
+                            input_file=str(connection.settings_dict['NAME']),
+                            sql_file=input_file,
+                            rollback_directory=temporary_directory_name)
+                        raise subprocess.CalledProcessError(
+                            returncode=process.returncode or 1,
+                            cmd=' '.join(final_args),
+                            output='{} could not be decompressed: '
+                                   '{}'.format(compressed_file, error)) \
+                            from error
 
                 if process.returncode != 0:
                     self._rollback_hook(
@@ -214,6 +255,72 @@ class AbstractDatabaseImporter(metaclass=abc.ABCMeta):
                     rollback_directory=temporary_directory_name)
                 raise FileNotFoundError
 
+    @staticmethod
+    def _feed(stdin: BinaryIO, input_file: str, compression: str) -> None:
+        """
+        Decompress a dump into the standard input of a client
+
+        :param stdin: the standard input of the client process
+        :param input_file: the compressed dump
+        :param compression: the compression of the dump
+        :return: None
+        """
+        try:
+            with file.compressed_reader(Path(input_file),
+                                        compression=compression) as reader:
+                shutil.copyfileobj(reader, stdin,
+                                   BufferedProcessReader.buffer_size)
+        except BrokenPipeError:
+            # the client stopped reading, and its return code will say why
+            pass
+        finally:
+            with contextlib.suppress(BrokenPipeError):
+                stdin.close()
+
+    def defer_constraints(self, connection: BaseDatabaseWrapper) -> bool:
+        """
+        Stop checking constraints row by row until restore_constraints
+
+        :param connection: the connection object
+        :return: whether restore_constraints needs to be called afterwards
+        """
+        return connection.disable_constraint_checking()
+
+    def restore_constraints(self, connection: BaseDatabaseWrapper) -> None:
+        """
+        Resume checking the constraints stopped by defer_constraints
+
+        :param connection: the connection object
+        :return: None
+        """
+        connection.enable_constraint_checking()
+
+    def secondary_indexes(self, connection: BaseDatabaseWrapper,
+                          table: str) -> list[tuple[str, str]]:
+        """
+        The indexes of a table that can be dropped during a load and rebuilt
+
+        Primary keys, unique indexes and indexes that back constraints are
+        never included. The default includes nothing.
+
+        :param connection: the connection object
+        :param table: the name of the table
+        :return: a list of 2-tuples of the index name and the SQL that creates it
+        """
+        return []
+
+    def drop_index_sql(self, connection: BaseDatabaseWrapper, table: str,
+                       name: str) -> str:
+        """
+        The SQL to drop one of the indexes listed by secondary_indexes
+
+        :param connection: the connection object
+        :param table: the name of the table
+        :param name: the name of the index
+        :return: a string of SQL
+        """
+        return 'DROP INDEX {}'.format(connection.ops.quote_name(name))
+
     def patch(self, connection: BaseDatabaseWrapper) -> bool:
         """
         Patches the connection object with a method "export_sql" or removes this method if it's already set to this function's setting
@@ -1,9 +1,16 @@
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.backends.base.client import BaseDatabaseClient
 from django.db.backends.mysql.client import DatabaseClient
 
+from caretaker.frontend.frontends.database_exporters.django import utils
 from caretaker.frontend.frontends.database_importers. \
     abstract_database_importer import AbstractDatabaseImporter
+from caretaker.utils.tar import unpack_directory
 
 
 class MysqlDatabaseImporter(AbstractDatabaseImporter):
@@ -45,6 +52,9 @@ class MysqlDatabaseImporter(AbstractDatabaseImporter):
     _binary_name = 'mysql'
     _args = '-e'
 
+    # the binary that restores the archives written by export_archive
+    restore_binary_name = 'myloader'
+
     @property
     def binary_file(self) -> str:
         """
@@ -81,6 +91,148 @@ class MysqlDatabaseImporter(AbstractDatabaseImporter):
         """
         return 'django.db.backends.mysql'
 
+    def defer_constraints(self, connection: BaseDatabaseWrapper) -> bool:
+        """
+        Stop checking foreign keys row by row
+
+        Unique indexes are still checked as each row is written, as MySQL
+        does not check them again when unique_checks is turned back on.
+
+        :param connection: the connection object
+        :return: True, as the checks must be turned back on
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SET foreign_key_checks = 0')
+
+        return True
+
+    def restore_constraints(self, connection: BaseDatabaseWrapper) -> None:
+        """
+        Resume checking foreign keys
+
+        :param connection: the connection object
+        :return: None
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SET foreign_key_checks = 1')
+
+    def secondary_indexes(self, connection: BaseDatabaseWrapper,
+                          table: str) -> list[tuple[str, str]]:
+        """
+        The indexes of a table that can be dropped during a load and rebuilt
+
+        These are the non-unique indexes in information_schema.statistics,
+        leaving out those whose first column is that of a foreign key (which
+        MySQL will not drop while the foreign key needs them) and indexes on
+        expressions. Dropping an index commits the current transaction on
+        MySQL, so a load that drops them is not atomic.
+
+        :param connection: the connection object
+        :param table: the name of the table
+        :return: a list of 2-tuples of the index name and the SQL that creates it
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT index_name, index_type, column_name, sub_part, '
+                'collation FROM information_schema.statistics '
+                'WHERE table_schema = DATABASE() AND table_name = %s '
+                'AND non_unique = 1 ORDER BY index_name, seq_in_index',
+                [table])
+            rows = cursor.fetchall()
+
+            cursor.execute(
+                'SELECT column_name FROM information_schema.key_column_usage '
+                'WHERE table_schema = DATABASE() AND table_name = %s '
+                'AND referenced_table_name IS NOT NULL', [table])
+            foreign_keys = {row[0] for row in cursor.fetchall()}
+
+        indexes = {}
+
+        for name, index_type, column, sub_part, collation in rows:
+            indexes.setdefault(name, []).append(
+                (index_type, column, sub_part, collation))
+
+        quote = connection.ops.quote_name
+        secondary = []
+
+        for name, columns in indexes.items():
+            if columns[0][1] in foreign_keys or \
+                    any(column is None for _, column, _, _ in columns):
+                continue
+
+            kind = columns[0][0] if columns[0][0] in ['FULLTEXT', 'SPATIAL'] \
+                else ''
+
+            secondary.append((name, 'CREATE {}INDEX {} ON {} ({})'.format(
+                kind + ' ' if kind else '', quote(name), quote(table),
+                ', '.join('{}{}{}'.format(
+                    quote(column),
+                    '({})'.format(sub_part) if sub_part else '',
+                    ' DESC' if collation == 'D' else '')
+                    for _, column, sub_part, collation in columns))))
+
+        return secondary
+
+    def drop_index_sql(self, connection: BaseDatabaseWrapper, table: str,
+                       name: str) -> str:
+        """
+        The SQL to drop one of the indexes listed by secondary_indexes
+
+        :param connection: the connection object
+        :param table: the name of the table
+        :param name: the name of the index
+        :return: a string of SQL
+        """
+        return 'DROP INDEX {} ON {}'.format(connection.ops.quote_name(name),
+                                            connection.ops.quote_name(table))
+
+    def restore_archive(self, connection: BaseDatabaseWrapper,
+                        input_file: str, jobs: int = 1,
+                        alternative_binary: str = '') -> None:
+        """
+        Restore an archive written by MysqlDatabaseExporter.export_archive
+
+        The archive is unpacked beside the input file, then myloader drops
+        and recreates each table and loads several at once, each in a
+        connection of its own, so the restore is not one transaction.
+
+        :param connection: the connection object
+        :param input_file: the archive to restore
+        :param jobs: the number of threads to restore with
+        :param alternative_binary: the alternative binary to use
+        :raises subprocess.CalledProcessError: if myloader fails
+        :return: None
+        """
+        with tempfile.TemporaryDirectory(dir=Path(input_file).parent) \
+                as temporary_directory_name:
+            unpack_directory(Path(input_file), Path(temporary_directory_name))
+
+            args, env = utils.delegate_settings_to_cmd_args(
+                alternative_args=['--directory={}'.format(
+                    temporary_directory_name),
+                    '--threads={}'.format(jobs), '--overwrite-tables'],
+                binary_name=alternative_binary if alternative_binary
+                else self.restore_binary_name,
+                settings_dict=connection.settings_dict,
+                database_client=self.client_type(connection))
+
+            final_args = utils.mydumper_args(args)
+
+            self.logger.info('Running: {}'.format(' '.join(final_args)))
+
+            start = time.perf_counter()
+
+            process = subprocess.run(final_args, env=env)
+
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    returncode=process.returncode, cmd=' '.join(final_args),
+                    output='Output not available')
+
+            self.logger.info('Restored the archive on {} threads in '
+                             '{:.1f}s'.format(jobs,
+                                              time.perf_counter() - start))
+
     def client_type(self, connection: BaseDatabaseWrapper) \
             -> BaseDatabaseClient:
         """
@@ -1,9 +1,17 @@
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.backends.base.client import BaseDatabaseClient
 from django.db.backends.postgresql.client import DatabaseClient
 
+from caretaker.frontend.frontends.database_exporters.django import utils
 from caretaker.frontend.frontends.database_importers. \
     abstract_database_importer import AbstractDatabaseImporter
+from caretaker.utils import file
+from caretaker.utils.tar import unpack_directory
 
 
 class PostgresDatabaseImporter(AbstractDatabaseImporter):
@@ -43,6 +51,9 @@ class PostgresDatabaseImporter(AbstractDatabaseImporter):
     _binary_name = 'psql'
     _args = '-f'
 
+    # the binary that restores the archives written by export_archive
+    restore_binary_name = 'pg_restore'
+
     @property
     def binary_file(self) -> str:
         """
@@ -79,6 +90,128 @@ class PostgresDatabaseImporter(AbstractDatabaseImporter):
         """
         return 'django.db.backends.postgresql'
 
+    def defer_constraints(self, connection: BaseDatabaseWrapper) -> bool:
+        """
+        Defer foreign key checks until the end of the transaction
+
+        SET CONSTRAINTS only applies to constraints declared DEFERRABLE. The
+        foreign keys that Django creates are, but a constraint that is not
+        deferrable is still checked row by row.
+
+        :param connection: the connection object
+        :return: False, as the deferral ends with the transaction
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+        return False
+
+    def secondary_indexes(self, connection: BaseDatabaseWrapper,
+                          table: str) -> list[tuple[str, str]]:
+        """
+        The indexes of a table that can be dropped during a load and rebuilt
+
+        :param connection: the connection object
+        :param table: the name of the table
+        :return: a list of 2-tuples of the index name and the SQL that creates it
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT index_class.relname, '
+                'pg_get_indexdef(pg_index.indexrelid) '
+                'FROM pg_index JOIN pg_class index_class '
+                'ON index_class.oid = pg_index.indexrelid '
+                'WHERE pg_index.indrelid = %s::regclass '
+                'AND NOT pg_index.indisunique AND NOT pg_index.indisprimary '
+                'AND NOT EXISTS (SELECT 1 FROM pg_constraint '
+                'WHERE pg_constraint.conindid = pg_index.indexrelid) '
+                'ORDER BY index_class.relname',
+                [connection.ops.quote_name(table)])
+
+            return [(name, sql) for name, sql in cursor.fetchall()]
+
+    def restore_args(self, connection: BaseDatabaseWrapper, input_file: str,
+                     jobs: int = 1,
+                     alternative_binary: str = '') -> (list, dict):
+        """
+        Returns the parameters needed to restore an archive with pg_restore
+
+        pg_restore takes the archive where psql would take the database, so
+        the database is named with -d instead.
+
+        :param connection: the connection object
+        :param input_file: the custom archive file or directory to restore
+        :param jobs: the number of tables to restore at once
+        :param alternative_binary: the alternative binary to use
+        :return: 2-tuple of array of arguments and dict of environment variables
+        """
+        args, env = utils.delegate_settings_to_cmd_args(
+            alternative_args=[],
+            binary_name=alternative_binary if alternative_binary
+            else self.restore_binary_name,
+            settings_dict=connection.settings_dict,
+            database_client=self.client_type(connection))
+
+        database = connection.settings_dict.get('NAME')
+        service = connection.settings_dict.get('OPTIONS', {}).get('service')
+
+        if database or not service:
+            args = args[:-1] + ['-d', args[-1]]
+        else:
+            args = args + ['-d', 'service={}'.format(service)]
+
+        return args + ['--clean', '--if-exists', '-j', str(jobs),
+                       str(input_file)], env
+
+    def restore_archive(self, connection: BaseDatabaseWrapper,
+                        input_file: str, jobs: int = 1,
+                        alternative_binary: str = '') -> None:
+        """
+        Restore an archive written by PostgresDatabaseExporter.export_archive
+
+        A directory archive is unpacked beside the input file first. Each
+        object is dropped and recreated, and tables are loaded and indexed on
+        several jobs at once, each in a connection of its own, so the restore
+        is not one transaction.
+
+        :param connection: the connection object
+        :param input_file: the archive to restore
+        :param jobs: the number of tables to restore at once
+        :param alternative_binary: the alternative binary to use
+        :raises subprocess.CalledProcessError: if pg_restore fails
+        :return: None
+        """
+        archive_format = file.postgres_archive_format(Path(input_file))
+
+        with tempfile.TemporaryDirectory(dir=Path(input_file).parent) \
+                as temporary_directory_name:
+            if archive_format == 'directory':
+                unpack_directory(Path(input_file),
+                                 Path(temporary_directory_name))
+
+                input_file = temporary_directory_name
+
+            args, env = self.restore_args(
+                connection=connection, input_file=input_file, jobs=jobs,
+                alternative_binary=alternative_binary)
+
+            final_args = [str(arg) for arg in args]
+
+            self.logger.info('Running: {}'.format(' '.join(final_args)))
+
+            start = time.perf_counter()
+
+            process = subprocess.run(final_args, env=env)
+
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    returncode=process.returncode, cmd=' '.join(final_args),
+                    output='Output not available')
+
+            self.logger.info('Restored the {} archive on {} jobs in '
+                             '{:.1f}s'.format(archive_format, jobs,
+                                              time.perf_counter() - start))
+
     def client_type(self, connection: BaseDatabaseWrapper) \
             -> BaseDatabaseClient:
         """
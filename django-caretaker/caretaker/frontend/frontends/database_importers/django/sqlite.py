@@ -1,4 +1,6 @@
+import contextlib
 import shutil
+import sqlite3
 from pathlib import Path
 
 from django.db.backends.base.base import BaseDatabaseWrapper
@@ -95,6 +97,66 @@ class SQLiteDatabaseImporter(AbstractDatabaseImporter):
         """
         return 'django.db.backends.sqlite3'
 
+    def secondary_indexes(self, connection: BaseDatabaseWrapper,
+                          table: str) -> list[tuple[str, str]]:
+        """
+        The indexes of a table that can be dropped during a load and rebuilt
+
+        Indexes that SQLite creates for UNIQUE and PRIMARY KEY constraints
+        have no SQL and unique indexes do not match, so neither is included.
+
+        :param connection: the connection object
+        :param table: the name of the table
+        :return: a list of 2-tuples of the index name and the SQL that creates it
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = %s AND sql LIKE 'CREATE INDEX%%' "
+                "ORDER BY name", [table])
+
+            return [(name, sql) for name, sql in cursor.fetchall()]
+
+    def restore_snapshot(self, connection: BaseDatabaseWrapper,
+                         input_file: str) -> None:
+        """
+        Replace the database with a snapshot written by export_snapshot
+
+        The snapshot is checked and then copied into the live database with
+        the online backup API, in a single step that holds SQLite's write
+        lock, so the database is never left half restored and committed
+        pages, including those still in the WAL, are never lost. Connections
+        that other processes hold open see the restored data on their next
+        read. If another connection holds a lock for longer than the busy
+        timeout, the restore is refused and the database is left as it was.
+
+        :param connection: the connection object
+        :param input_file: the snapshot to restore
+        :raises sqlite3.DatabaseError: if the snapshot fails its integrity check
+        :raises sqlite3.OperationalError: if the database is locked by another connection
+        :return: None
+        """
+        target = connection.settings_dict['NAME']
+
+        with contextlib.closing(sqlite3.connect(str(input_file))) as snapshot:
+            result = snapshot.execute('PRAGMA quick_check').fetchone()[0]
+
+            if result != 'ok':
+                raise sqlite3.DatabaseError(
+                    '{} failed its integrity check: {}'.format(input_file,
+                                                                result))
+
+            # the restore must not wait on a transaction of this process
+            connection.close()
+
+            with contextlib.closing(sqlite3.connect(
+                    str(target), timeout=connection.settings_dict.get(
+                        'OPTIONS', {}).get('timeout', 5))) as live:
+                snapshot.backup(live)
+
+        self.logger.info('Restored {} from the snapshot {}'.format(
+            target, input_file))
+
     def client_type(self, connection: BaseDatabaseWrapper) \
             -> BaseDatabaseClient:
         """
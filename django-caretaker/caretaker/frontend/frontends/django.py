@@ -1,8 +1,15 @@
+import collections
+import contextlib
+import fnmatch
 import io
 import logging
+import os
 import re
 import subprocess
 import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 from pathlib import Path
 from typing import TextIO
@@ -18,6 +25,7 @@ from django.db.backends.base.base import BaseDatabaseWrapper
 
 import caretaker.frontend.frontends.utils as frontend_utils
 from caretaker.backend.abstract_backend import AbstractBackend, StoreOutcome
+from caretaker.backend.remote_file import RemoteFile, RemoteFileError
 from caretaker.frontend.abstract_frontend import AbstractFrontend, FrontendError
 from caretaker.frontend.frontends.database_exporters. \
     abstract_database_exporter import DatabaseExporterNotFoundError, \
@@ -25,9 +33,23 @@ from caretaker.frontend.frontends.database_exporters. \
 from caretaker.frontend.frontends.database_importers. \
     abstract_database_importer import AbstractDatabaseImporter, \
     DatabaseImporterNotFoundError
+from caretaker.frontend.frontends.json_export import export_json_shards, \
+    export_json_fast, export_json_incremental, EXPORT_FORMATS, \
+    EXPORT_COMPRESSIONS
+from caretaker.frontend.frontends.json_import import import_json_stream, \
+    import_json_shards, import_workers as resolve_import_workers
+from caretaker.frontend.frontends.selection import model_tables, \
+    select_models, tier_exclusions
 from caretaker.utils import log, file
 from caretaker.utils.file import FileType
-from caretaker.utils.zip import create_zip_file, unzip_file
+from caretaker.utils.manifest import build_manifest, manifest_key, \
+    read_manifest, write_manifest, build_content_manifest, content_key, \
+    hash_file, MANIFEST_MEMBER, digest_key, write_digest, read_digest, \
+    HashingWriter
+from caretaker.utils.tar import create_tar_file, untar_file
+from caretaker.utils.walk import Walker
+from caretaker.utils.zip import create_zip_file, unzip_file, zip_mtime, \
+    DEFAULT_STORED_EXTENSIONS, DEFAULT_ENTROPY_THRESHOLD
 
 
 def get_frontend():
@@ -56,27 +78,117 @@ class DjangoFrontend(AbstractFrontend):
     @staticmethod
     def export_sql(database: str = '', alternative_binary: str = '',
                    alternative_args: list | None = None,
-                   output_file: str = '-') -> TextIO | BinaryIO:
+                   output_file: str | BinaryIO = '-',
+                   tables: list[str] | None = None) -> TextIO | BinaryIO:
         """
         Export SQL from the database using the specific provider
 
         :param database: the database to export
         :param alternative_binary: a different binary file to run
         :param alternative_args: a different set of cmdline args to pass
-        :param output_file: an output file to write to rather than stdout
+        :param output_file: an output file to write to rather than stdout, or a writable file-like object
+        :param tables: the tables of Django's models to export, leaving out the rest (None exports everything)
+        :raises FrontendError: if CARETAKER_SQLITE_EXPORT_MODE is not 'dump', 'backup' or 'vacuum', CARETAKER_POSTGRES_DUMP_FORMAT is not 'plain', 'custom' or 'directory', CARETAKER_MYSQL_DUMP_PROFILE is not 'default', 'consistent' or 'parallel', CARETAKER_SQL_COMPRESSION is not 'none', 'gzip' or 'zstd', or a snapshot, directory dump or mydumper dump would be written to a file-like object
         :return: a string of the database output
         """
-
+        logger = log.get_logger('export-sql')
         database: str = database if database else DEFAULT_DB_ALIAS
 
+        # SQLite databases can be copied as a binary snapshot instead
+        snapshot_mode = getattr(settings, 'CARETAKER_SQLITE_EXPORT_MODE',
+                                'dump')
+
+        if snapshot_mode not in ['dump', 'backup', 'vacuum']:
+            raise FrontendError('Unknown SQLite export mode {}'.format(
+                snapshot_mode))
+
+        # Postgres databases can be dumped as archives for pg_restore instead
+        dump_format = getattr(settings, 'CARETAKER_POSTGRES_DUMP_FORMAT',
+                              'plain')
+
+        if dump_format not in ['plain', 'custom', 'directory']:
+            raise FrontendError('Unknown Postgres dump format {}'.format(
+                dump_format))
+
+        # MySQL databases can be dumped from a snapshot, or by mydumper
+        mysql_profile = getattr(settings, 'CARETAKER_MYSQL_DUMP_PROFILE',
+                                'default')
+
+        if mysql_profile not in ['default', 'consistent', 'parallel']:
+            raise FrontendError('Unknown MySQL dump profile {}'.format(
+                mysql_profile))
+
+        # dumps can be compressed as they are read from the client
+        compression = getattr(settings, 'CARETAKER_SQL_COMPRESSION', 'none')
+
+        if compression not in file.SQL_COMPRESSIONS:
+            raise FrontendError('Unknown SQL compression {}'.format(
+                compression))
+
         connection: BaseDatabaseWrapper | AbstractDatabaseExporter \
             = connections[database]
 
         # load the database patch plugins
         patched, exporter = frontend_utils.DatabasePatcher.patch_exporter(connection)
 
+        if patched and connection.vendor == 'sqlite' and \
+                snapshot_mode != 'dump' and not alternative_binary and \
+                not alternative_args:
+            if tables is None and hasattr(output_file, 'write'):
+                raise FrontendError('A SQLite snapshot cannot be written to '
+                                    'a stream')
+
+            if tables is None:
+                return exporter.export_snapshot(connection=connection,
+                                                output_file=output_file,
+                                                method=snapshot_mode)
+
+            logger.warning('A snapshot cannot leave tables out, so the '
+                           'database is exported with .dump')
+
+        default_args = patched and not alternative_args
+
+        archive = default_args and not alternative_binary and (
+            (connection.vendor == 'postgresql' and dump_format != 'plain') or
+            (connection.vendor == 'mysql' and mysql_profile == 'parallel'))
+
+        if archive and hasattr(output_file, 'write') and (
+                connection.vendor == 'mysql' or dump_format == 'directory'):
+            raise FrontendError('A dump written to a directory cannot be '
+                                'written to a stream')
+
+        if patched and tables is not None and not alternative_args:
+            excluded = set(connection.introspection.django_table_names(
+                only_existing=True)) - set(tables)
+
+            alternative_args = exporter.selection_args(
+                connection=connection,
+                tables=[table for table
+                        in connection.introspection.table_names()
+                        if table not in excluded],
+                excluded=sorted(excluded))
+
+        if default_args and connection.vendor == 'mysql' and \
+                mysql_profile == 'consistent':
+            alternative_args = exporter.consistent_args + (
+                alternative_args if alternative_args else [])
+
         if patched:
             try:
+                if archive and connection.vendor == 'mysql':
+                    return exporter.export_archive(
+                        connection=connection, output_file=output_file,
+                        jobs=getattr(settings, 'CARETAKER_MYSQL_JOBS', 0)
+                        or os.cpu_count(),
+                        alternative_args=alternative_args)
+                elif archive:
+                    return exporter.export_archive(
+                        connection=connection, output_file=output_file,
+                        dump_format=dump_format,
+                        jobs=getattr(settings, 'CARETAKER_POSTGRES_JOBS', 0)
+                        or os.cpu_count(),
+                        alternative_args=alternative_args)
+
                 # it looks paradoxical that we are passing in the connection
                 # here but because of the way the patching works, it needs
                 # itself as a parameter
@@ -84,7 +196,12 @@ class DjangoFrontend(AbstractFrontend):
                     connection=connection,
                     alternative_binary=alternative_binary,
                     alternative_args=alternative_args,
-                    output_file=output_file
+                    output_file=output_file,
+                    compression=compression,
+                    level=getattr(settings, 'CARETAKER_SQL_COMPRESSION_LEVEL',
+                                  None),
+                    threads=getattr(settings,
+                                    'CARETAKER_SQL_COMPRESSION_THREADS', 0)
                 )
             except FileNotFoundError:
                 # Note that we're assuming the FileNotFoundError relates to the
@@ -93,6 +210,10 @@ class DjangoFrontend(AbstractFrontend):
                 # message catches the common case.
                 binary_name = exporter.binary_file \
                     if not alternative_binary else alternative_binary
+
+                if archive and connection.vendor == 'mysql':
+                    binary_name = exporter.archive_binary_name
+
                 raise CommandError(
                     "You appear not to have the %r program installed or on "
                     "your path or we could not write to the output filename."
@@ -153,8 +274,18 @@ class DjangoFrontend(AbstractFrontend):
                       sql_mode: bool = False,
                       database: str = DEFAULT_DB_ALIAS,
                       alternative_binary: str = '',
-                      alternative_arguments: str = '') -> (Path | None,
-                                                           Path | None):
+                      alternative_arguments: str = '',
+                      incremental: bool = False,
+                      previous_manifest: dict | None = None,
+                      archive_writer: BinaryIO | None = None,
+                      archive: bool = True,
+                      incremental_data: bool = False,
+                      previous_data_manifest: dict | None = None,
+                      include: list[str] | None = None,
+                      exclude: list[str] | None = None,
+                      tiers: list[str] | None = None,
+                      data_writer: BinaryIO | None = None) \
+            -> (Path | BinaryIO | None, Path | BinaryIO | None):
         """
         Creates a set of local backup files
 
@@ -167,9 +298,22 @@ class DjangoFrontend(AbstractFrontend):
         :param database: the database to export (will use default if unspecified)
         :param alternative_arguments: alternative arguments to pass in SQL mode
         :param alternative_binary: alternative export binary to use in SQL mode
-        :return: a 2-tuple of pathlib.Path objects to the data file and archive file
+        :param incremental: whether to write a manifest and archive only the files that changed since previous_manifest
+        :param previous_manifest: the manifest of the previous archive in incremental mode
+        :param archive_writer: a writable stream to send the archive to instead of writing it to the output directory
+        :param archive: whether to archive the media at all (not needed when it is pushed as content-addressed blobs)
+        :param incremental_data: whether to write a data manifest and export only the rows that changed since previous_data_manifest
+        :param previous_data_manifest: the data manifest of the previous JSON export in incremental mode
+        :param include: apps, models or tables to export, leaving out the rest (added to CARETAKER_BACKUP_INCLUDE)
+        :param exclude: apps, models or tables to leave out (added to CARETAKER_BACKUP_EXCLUDE)
+        :param tiers: the retention tiers in CARETAKER_BACKUP_TIERS to back up in this run
+        :param data_writer: a writable stream to send the data file to instead of writing it to the output directory
+        :raises FrontendError: if a tier is not defined in CARETAKER_BACKUP_TIERS, or the data file is sharded, incremental or a snapshot and data_writer is given
+        :return: a 2-tuple of pathlib.Path objects to the data file (or the data_writer) and archive file (or the archive_writer)
         """
         database = database if database else DEFAULT_DB_ALIAS
+        include, exclude = DjangoFrontend._backup_selection(
+            include=include, exclude=exclude, tiers=tiers)
 
         with transaction.atomic(using=database):
             logger = log.get_logger('django')
@@ -192,54 +336,187 @@ class DjangoFrontend(AbstractFrontend):
             if not sql_mode:
                 # setup redirect so that we can pipe the output of dump data to
                 # our output file
-                DjangoFrontend.export_json(data_file, logger, output_directory)
+                DjangoFrontend.export_json(
+                    data_file, logger, output_directory,
+                    incremental=incremental_data,
+                    previous_manifest=previous_data_manifest,
+                    include=include, exclude=exclude,
+                    data_writer=data_writer)
             else:
                 DjangoFrontend.export_sql(
                     database='', alternative_binary='', alternative_args=[],
-                    output_file=str(output_directory / data_file)
+                    output_file=data_writer if data_writer
+                    else str(output_directory / data_file),
+                    tables=model_tables(select_models(
+                        database=database, include=include,
+                        exclude=exclude)) if include or exclude else None
                 )
 
-            # now create a zip of the media directory and any others specified
-            path_list = [] if not path_list else path_list
-            path_list = list(set(path_list))
+            data_output = data_writer if data_writer \
+                else output_directory / data_file
 
-            if hasattr(settings, 'MEDIA_ROOT') and \
-                    settings.MEDIA_ROOT and settings.MEDIA_ROOT \
-                    not in path_list:
-                logger.info('Appending MEDIA_ROOT')
-                path_list.append(settings.MEDIA_ROOT)
+            if not archive:
+                DjangoFrontend._post_execute_hook(logger=logger)
 
-            if hasattr(settings, 'CARETAKER_ADDITIONAL_BACKUP_PATHS') \
-                    and settings.CARETAKER_ADDITIONAL_BACKUP_PATHS \
-                    and settings.CARETAKER_ADDITIONAL_BACKUP_PATHS \
-                    not in path_list:
-                logger.info('Appending CARETAKER_ADDITIONAL_BACKUP_PATHS')
-                path_list.extend(settings.CARETAKER_ADDITIONAL_BACKUP_PATHS)
+                return data_output, None
 
-            path_list_final = []
+            # now create a zip of the media directory and any others specified
+            path_list_final = DjangoFrontend._archive_paths(
+                path_list=path_list, logger=logger)
 
-            for path in path_list:
-                path = file.normalize_path(path)
+            manifest = None
 
-                path_list_final.append(file.normalize_path(path))
+            if incremental:
+                manifest = build_manifest(
+                    input_paths=list(path_list_final),
+                    previous=previous_manifest,
+                    max_chain=getattr(settings,
+                                      'CARETAKER_INCREMENTAL_MAX_CHAIN', 7),
+                    walker=DjangoFrontend._walker())
 
-                if not path.exists():
-                    logger.error('Could not find {}'.format(path))
-                    raise FileNotFoundError()
+                write_manifest(manifest=manifest,
+                               output_file=output_directory /
+                               manifest_key(archive_file))
 
-            logger.info('Paths to be zipped: '.format(path_list_final))
+                logger.info('Archiving {} changed and {} deleted files in a '
+                            '{} archive'.format(len(manifest['changed']),
+                                                len(manifest['deleted']),
+                                                manifest['type']))
 
-            zip_file = create_zip_file(
+            zip_file = DjangoFrontend._create_archive(
                 input_paths=list(path_list_final),
-                output_file=Path(output_directory / archive_file)
-            )
+                output_file=archive_writer if archive_writer
+                else Path(output_directory / archive_file),
+                manifest=manifest)
 
             logger.info('Wrote {} ({})'.format(archive_file, zip_file))
 
             # run the post-execute hook
             DjangoFrontend._post_execute_hook(logger=logger)
 
-            return output_directory / data_file, zip_file
+            return data_output, zip_file
+
+    @staticmethod
+    def _backup_selection(include: list[str] | None,
+                          exclude: list[str] | None,
+                          tiers: list[str] | None) -> (list, list):
+        """
+        Combine the models selected for a backup with those in the settings
+
+        :param include: apps, models or tables to export
+        :param exclude: apps, models or tables to leave out
+        :param tiers: the retention tiers to back up in this run
+        :raises FrontendError: if a tier is not defined in CARETAKER_BACKUP_TIERS
+        :return: a 2-tuple of the lists of entries to include and to exclude
+        """
+        include = list(getattr(settings, 'CARETAKER_BACKUP_INCLUDE', [])) + \
+            list(include if include else [])
+        exclude = list(getattr(settings, 'CARETAKER_BACKUP_EXCLUDE', [])) + \
+            list(exclude if exclude else [])
+
+        try:
+            exclude += tier_exclusions(
+                tiers=getattr(settings, 'CARETAKER_BACKUP_TIERS', {}),
+                selected=tiers)
+        except KeyError as error:
+            raise FrontendError('Unknown backup tier {}'.format(error))
+
+        return include, exclude
+
+    @staticmethod
+    def _create_archive(input_paths: list, output_file: Path | BinaryIO,
+                        manifest: dict | None = None) -> Path | BinaryIO:
+        """
+        Archive media in the format set by CARETAKER_ARCHIVE_FORMAT
+
+        :param input_paths: a list of input directories
+        :param output_file: the output file to write, or a writable file-like object
+        :param manifest: a manifest to embed in the archive
+        :raises FrontendError: if the archive format is not recognised
+        :return: a pathlib.Path object pointing to the archive, or the file-like object that was written to
+        """
+        archive_format = getattr(settings, 'CARETAKER_ARCHIVE_FORMAT', 'zip')
+
+        if archive_format == 'zip':
+            return create_zip_file(
+                input_paths=input_paths, output_file=output_file,
+                workers=getattr(settings, 'CARETAKER_ARCHIVE_WORKERS', 1),
+                manifest=manifest,
+                stored_extensions=getattr(
+                    settings, 'CARETAKER_ARCHIVE_STORED_EXTENSIONS',
+                    DEFAULT_STORED_EXTENSIONS),
+                entropy_threshold=getattr(
+                    settings, 'CARETAKER_ARCHIVE_ENTROPY_THRESHOLD',
+                    DEFAULT_ENTROPY_THRESHOLD),
+                walker=DjangoFrontend._walker())
+        elif archive_format == 'tar.zst':
+            return create_tar_file(
+                input_paths=input_paths, output_file=output_file,
+                manifest=manifest,
+                level=getattr(settings, 'CARETAKER_ZSTD_LEVEL', 3),
+                threads=getattr(settings, 'CARETAKER_ZSTD_THREADS', 0),
+                walker=DjangoFrontend._walker())
+
+        raise FrontendError('Unknown archive format {}'.format(
+            archive_format))
+
+    @staticmethod
+    def _walker() -> Walker:
+        """
+        Build the walker that selects media files from the archive settings
+
+        :return: a Walker
+        """
+        return Walker(
+            exclude=getattr(settings, 'CARETAKER_ARCHIVE_EXCLUDE', []),
+            exclude_regex=getattr(settings, 'CARETAKER_ARCHIVE_EXCLUDE_REGEX',
+                                  []),
+            include=getattr(settings, 'CARETAKER_ARCHIVE_INCLUDE', []),
+            max_file_size=getattr(settings, 'CARETAKER_ARCHIVE_MAX_FILE_SIZE',
+                                  None),
+            workers=getattr(settings, 'CARETAKER_WALK_WORKERS', 1))
+
+    @staticmethod
+    def _archive_paths(path_list: list | None,
+                       logger: logging.Logger) -> list[Path]:
+        """
+        Gather the paths to archive: those passed plus MEDIA_ROOT and CARETAKER_ADDITIONAL_BACKUP_PATHS
+
+        :param path_list: the list of paths to bundle in the zip
+        :param logger: logger instance
+        :raises FileNotFoundError: if a path does not exist
+        :return: a list of normalized pathlib.Path objects
+        """
+        path_list = [] if not path_list else path_list
+        path_list = list(set(path_list))
+
+        if hasattr(settings, 'MEDIA_ROOT') and \
+                settings.MEDIA_ROOT and settings.MEDIA_ROOT \
+                not in path_list:
+            logger.info('Appending MEDIA_ROOT')
+            path_list.append(settings.MEDIA_ROOT)
+
+        if hasattr(settings, 'CARETAKER_ADDITIONAL_BACKUP_PATHS') \
+                and settings.CARETAKER_ADDITIONAL_BACKUP_PATHS \
+                and settings.CARETAKER_ADDITIONAL_BACKUP_PATHS \
+                not in path_list:
+            logger.info('Appending CARETAKER_ADDITIONAL_BACKUP_PATHS')
+            path_list.extend(settings.CARETAKER_ADDITIONAL_BACKUP_PATHS)
+
+        path_list_final = []
+
+        for path in path_list:
+            path = file.normalize_path(path)
+
+            path_list_final.append(file.normalize_path(path))
+
+            if not path.exists():
+                logger.error('Could not find {}'.format(path))
+                raise FileNotFoundError()
+
+        logger.info('Paths to be zipped: '.format(path_list_final))
+
+        return path_list_final
 
     @staticmethod
     def _post_execute_hook(logger: logging.Logger):
@@ -307,24 +584,122 @@ class DjangoFrontend(AbstractFrontend):
                     output='Output not available')
 
     @staticmethod
-    def export_json(data_file, logger, output_directory) -> StringIO:
+    def export_json(data_file, logger, output_directory,
+                    incremental: bool = False,
+                    previous_manifest: dict | None = None,
+                    include: list[str] | None = None,
+                    exclude: list[str] | None = None,
+                    data_writer: BinaryIO | None = None) -> Path | BinaryIO:
         """
         Dump JSON using the dumpdata command
 
+        The dump is streamed to the data file as each queryset is iterated,
+        so memory use does not grow with the size of the database. If
+        CARETAKER_EXPORT_WORKERS is not 1, models are instead exported in
+        shards on a pool of processes and the data file is a zip of shards.
+        Setting CARETAKER_EXPORT_ENGINE to 'fast' reads rows without building
+        model instances. CARETAKER_EXPORT_FORMAT can instead be 'jsonl' or
+        'msgpack', which write shards of compact rows under a schema header,
+        and CARETAKER_EXPORT_COMPRESSION can be 'zstd' or 'none' rather than
+        'deflate'; either makes the data file a zip of shards. In incremental
+        mode, the data file is always a zip of shards that holds only the
+        rows changed since previous_manifest, and a data manifest for the
+        next export is written beside it. Apps, models and tables named in
+        include and exclude select which models are exported. A plain JSON
+        export can be written to data_writer instead of the data file.
+
         :param data_file: the data file to deposit to
         :param logger: the logger object
         :param output_directory: the output directory
-        :return:
+        :param incremental: whether to export only the rows that changed since previous_manifest
+        :param previous_manifest: the data manifest of the previous export (a full export is taken if None)
+        :param include: if not empty, export only the apps, models and tables that these name
+        :param exclude: apps, models and tables to leave out
+        :param data_writer: a writable stream to send the export to instead of the data file
+        :raises FrontendError: if the export engine, format or compression is not recognised, or data_writer is given for an incremental or sharded export
+        :return: a pathlib.Path object pointing to the data file, or the data_writer
         """
-        buffer = StringIO()
-        call_command('dumpdata', stdout=buffer)
-        buffer.seek(0)
+        output_file = Path(output_directory) / data_file
+        workers = getattr(settings, 'CARETAKER_EXPORT_WORKERS', 1)
+        engine = getattr(settings, 'CARETAKER_EXPORT_ENGINE', 'dumpdata')
+        export_format = getattr(settings, 'CARETAKER_EXPORT_FORMAT', 'json')
+        compression = getattr(settings, 'CARETAKER_EXPORT_COMPRESSION',
+                              'deflate')
+
+        if engine not in ['dumpdata', 'fast']:
+            raise FrontendError('Unknown export engine {}'.format(engine))
+
+        if export_format not in EXPORT_FORMATS:
+            raise FrontendError('Unknown export format {}'.format(
+                export_format))
+
+        if compression not in EXPORT_COMPRESSIONS:
+            raise FrontendError('Unknown export compression {}'.format(
+                compression))
+
+        sharded = workers != 1 or export_format != 'json' or \
+            compression != 'deflate'
+
+        if data_writer and (incremental or sharded):
+            raise FrontendError('An incremental or sharded JSON export cannot '
+                                'be written to a stream')
+
+        if incremental:
+            manifest = export_json_incremental(
+                output_file=output_file, previous=previous_manifest,
+                workers=workers,
+                shard_size=getattr(settings, 'CARETAKER_EXPORT_SHARD_SIZE',
+                                   100000),
+                engine=engine,
+                max_chain=getattr(settings,
+                                  'CARETAKER_INCREMENTAL_MAX_CHAIN', 7),
+                watermark_lag=getattr(
+                    settings, 'CARETAKER_INCREMENTAL_WATERMARK_LAG', 300),
+                append_only=getattr(
+                    settings, 'CARETAKER_INCREMENTAL_APPEND_ONLY_MODELS', []),
+                export_format=export_format, compression=compression,
+                include=include, exclude=exclude)
+
+            write_manifest(manifest=manifest,
+                           output_file=Path(output_directory) /
+                           manifest_key(data_file))
+
+            logger.info('Wrote {} ({} export)'.format(data_file,
+                                                       manifest['type']))
+
+            return output_file
+
+        if sharded:
+            export_json_shards(
+                output_file=output_file, workers=workers,
+                shard_size=getattr(settings, 'CARETAKER_EXPORT_SHARD_SIZE',
+                                   100000),
+                engine=engine, export_format=export_format,
+                compression=compression, include=include, exclude=exclude)
 
-        with (Path(output_directory) / data_file).open('w') as out_file:
-            out_file.write(buffer.read())
             logger.info('Wrote {}'.format(data_file))
 
-        return buffer
+            return output_file
+
+        # both engines write to a filename, so a stream is fed through a pipe
+        with frontend_utils.stream_path(data_writer) if data_writer \
+                else contextlib.nullcontext(output_file) as target:
+            if engine == 'fast':
+                export_json_fast(output_file=Path(target), include=include,
+                                 exclude=exclude)
+            else:
+                # verbosity 0 stops dumpdata from counting every object first
+                # to draw a progress bar when run from a terminal
+                labels = [model._meta.label for model in select_models(
+                    database=DEFAULT_DB_ALIAS, include=include,
+                    exclude=exclude)] if include or exclude else []
+
+                call_command('dumpdata', *labels, output=str(target),
+                             verbosity=0)
+
+        logger.info('Wrote {}'.format(data_file))
+
+        return data_writer if data_writer else output_file
 
     @staticmethod
     def generate_terraform(output_directory: str,
@@ -371,6 +746,25 @@ class DjangoFrontend(AbstractFrontend):
 
         return results
 
+    @staticmethod
+    def list_archive(remote_key: str, backend: AbstractBackend,
+                     bucket_name: str, backup_version: str = '',
+                     raise_on_error: bool = False) -> list[dict] | None:
+        """
+        Lists the files in a version of a remote archive without downloading it
+
+        :param remote_key: the remote key (filename) of the archive
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param backup_version: the version to list (the latest if empty)
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of dictionaries that contain the keys "path", "size", "compressed_size" and "mtime", or None on error
+        """
+        return backend.list_archive(bucket_name=bucket_name,
+                                    remote_key=remote_key,
+                                    version_id=backup_version,
+                                    raise_on_error=raise_on_error)
+
     @staticmethod
     def pull_backup(backup_version: str, out_file: str, remote_key: str,
                     backend: AbstractBackend, bucket_name: str,
@@ -456,7 +850,9 @@ class DjangoFrontend(AbstractFrontend):
                     alternative_args: list | None = None,
                     input_file: str = '-',
                     raise_on_error: bool = False,
-                    dry_run: bool = False) -> bool:
+                    dry_run: bool = False,
+                    delta_files: list | None = None,
+                    skip_unchanged: bool = False) -> bool:
         """
         Import a file into the database
 
@@ -466,6 +862,9 @@ class DjangoFrontend(AbstractFrontend):
         :param input_file: an input file to import
         :param raise_on_error: whether to raise exceptions or log them
         :param dry_run: if True, will not commit to the database
+        :param delta_files: incremental archives or JSON exports to replay, in order, on top of an archive or sharded JSON input file
+        :param skip_unchanged: whether to leave media files whose size, mtime and CRC already match the archive (also enabled by CARETAKER_RESTORE_SKIP_UNCHANGED)
+        :raises FrontendError: if CARETAKER_IMPORT_ENGINE is not 'loaddata' or 'bulk'
         :return: a string of the database output
         """
         logger = log.get_logger('import-file')
@@ -482,6 +881,33 @@ class DjangoFrontend(AbstractFrontend):
         # determine the type of file
         file_type = file.determine_type(input_file)
 
+        import_engine = getattr(settings, 'CARETAKER_IMPORT_ENGINE',
+                                'loaddata')
+
+        # more than one worker loads models in parallel with BulkLoader
+        import_workers = getattr(settings, 'CARETAKER_IMPORT_WORKERS', 1)
+
+        # drop secondary indexes while BulkLoader runs and rebuild them after
+        fast_restore = getattr(settings, 'CARETAKER_FAST_RESTORE', False)
+
+        if import_engine not in ['loaddata', 'bulk']:
+            raise FrontendError('Unknown import engine {}'.format(
+                import_engine))
+
+        delta_files = [file.normalize_path(delta_file)
+                       for delta_file in delta_files] \
+            if delta_files else []
+
+        for delta_file in delta_files:
+            if file.determine_type(delta_file) != file_type:
+                logger.error('{} is not in the same format as '
+                             '{}'.format(delta_file, input_file))
+
+                if raise_on_error:
+                    raise FrontendError
+
+                return False
+
         # handle UNKNOWN file type
         if file_type == FileType.UNKNOWN:
             logger.error('Unable to determine input type of {}'.format(
@@ -494,7 +920,24 @@ class DjangoFrontend(AbstractFrontend):
         # handle JSON file type
         elif file_type == FileType.JSON:
             logger.info('File {} appears to be a JSON dump'.format(input_file))
-            with transaction.atomic(using=database):
+            with DjangoFrontend._import_transaction(database=database,
+                                                    workers=import_workers):
+                if import_engine == 'bulk' or import_workers != 1 or \
+                        fast_restore:
+                    if dry_run:
+                        logger.info('Operating in dry run mode. '
+                                    'No objects loaded.')
+                    else:
+                        import_json_stream(
+                            input_file=input_file, database=database,
+                            batch_size=getattr(
+                                settings, 'CARETAKER_IMPORT_BATCH_SIZE',
+                                5000),
+                            workers=import_workers,
+                            defer_indexes=fast_restore)
+
+                    return True
+
                 buffer = StringIO()
                 logger.info(
                     'Calling: loaddata --database {} {}'.format(
@@ -513,6 +956,23 @@ class DjangoFrontend(AbstractFrontend):
 
                 return True
 
+        # handle sharded JSON exports
+        elif file_type == FileType.JSON_SHARDS:
+            logger.info('File {} appears to be a sharded JSON '
+                        'dump'.format(input_file))
+
+            with DjangoFrontend._import_transaction(database=database,
+                                                    workers=import_workers):
+                import_json_shards(
+                    input_file=input_file, database=database,
+                    dry_run=dry_run, delta_files=delta_files,
+                    engine=import_engine,
+                    batch_size=getattr(settings,
+                                       'CARETAKER_IMPORT_BATCH_SIZE', 5000),
+                    workers=import_workers, defer_indexes=fast_restore)
+
+                return True
+
         # handle SQL files
         elif file_type == FileType.SQL:
             connection: BaseDatabaseWrapper | AbstractDatabaseImporter \
@@ -569,9 +1029,105 @@ class DjangoFrontend(AbstractFrontend):
             else:
                 raise DatabaseImporterNotFoundError
 
-        # handle media ZIP files
+        # handle pg_dump and mydumper archives
+        elif file_type in [FileType.POSTGRES_ARCHIVE, FileType.MYSQL_ARCHIVE]:
+            connection: BaseDatabaseWrapper = connections[database]
+
+            vendor, jobs_setting = ('postgresql', 'CARETAKER_POSTGRES_JOBS') \
+                if file_type == FileType.POSTGRES_ARCHIVE \
+                else ('mysql', 'CARETAKER_MYSQL_JOBS')
+
+            if connection.vendor != vendor:
+                logger.error('{} is a {} archive, which can only be restored '
+                             'into {}'.format(input_file, vendor, vendor))
+
+                if raise_on_error:
+                    raise FrontendError
+
+                return False
+
+            _, importer = \
+                frontend_utils.DatabasePatcher.patch_importer(connection)
+
+            if dry_run:
+                logger.info('Operating in dry run mode. No command run.')
+
+                return True
+
+            try:
+                importer.restore_archive(
+                    connection=connection, input_file=str(input_file),
+                    jobs=getattr(settings, jobs_setting, 0) or os.cpu_count(),
+                    alternative_binary=alternative_binary)
+            except FileNotFoundError:
+                DjangoFrontend.reload_database(database=database)
+                binary_name = importer.restore_binary_name \
+                    if not alternative_binary else alternative_binary
+                raise CommandError(
+                    "You appear not to have the %r program installed or "
+                    "on your path." % binary_name
+                )
+            except subprocess.CalledProcessError as e:
+                DjangoFrontend.reload_database(database=database)
+                raise CommandError(
+                    '"%s" returned non-zero exit status %s.'
+                    % (
+                        e.cmd,
+                        e.returncode,
+                    ),
+                    returncode=e.returncode,
+                )
+
+            DjangoFrontend.reload_database(database=database)
+
+            return True
+
+        # handle SQLite snapshots
+        elif file_type == FileType.SQLITE_DATABASE:
+            connection: BaseDatabaseWrapper = connections[database]
+
+            if connection.vendor != 'sqlite':
+                logger.error('{} is an SQLite database, which can only be '
+                             'restored into SQLite'.format(input_file))
+
+                if raise_on_error:
+                    raise FrontendError
+
+                return False
+
+            _, importer = \
+                frontend_utils.DatabasePatcher.patch_importer(connection)
+
+            if dry_run:
+                logger.info('Operating in dry run mode. The database was not '
+                            'replaced.')
+
+                return True
+
+            importer.restore_snapshot(connection=connection,
+                                      input_file=str(input_file))
+
+            DjangoFrontend.reload_database(database=database)
+
+            return True
+
+        # handle media archives
         else:
-            unzip_file(input_file=input_file, dry_run=dry_run)
+            if file_type == FileType.TAR_ARCHIVE:
+                untar_file(input_file=input_file, dry_run=dry_run,
+                           delta_files=delta_files,
+                           skip_unchanged=skip_unchanged or getattr(
+                               settings, 'CARETAKER_RESTORE_SKIP_UNCHANGED',
+                               False))
+                return True
+
+            unzip_file(input_file=input_file, dry_run=dry_run,
+                       delta_files=delta_files,
+                       workers=getattr(settings, 'CARETAKER_RESTORE_WORKERS',
+                                       1),
+                       skip_unchanged=skip_unchanged or getattr(
+                           settings, 'CARETAKER_RESTORE_SKIP_UNCHANGED',
+                           False))
 
     @staticmethod
     def run_backup(data_file: str = 'data.json',
@@ -583,8 +1139,16 @@ class DjangoFrontend(AbstractFrontend):
                    sql_mode: bool = False,
                    database: str = DEFAULT_DB_ALIAS,
                    alternative_binary: str = '',
-                   alternative_arguments: str = '') -> (Path | None,
-                                                        Path | None):
+                   alternative_arguments: str = '',
+                   incremental: bool = False,
+                   stream_archive: bool = False,
+                   content_addressed: bool = False,
+                   incremental_data: bool = False,
+                   include: list[str] | None = None,
+                   exclude: list[str] | None = None,
+                   tiers: list[str] | None = None,
+                   stream_data: bool = False) -> (Path | BinaryIO | None,
+                                                  Path | None):
         """
         Creates a backup set and pushes it to the remote store
 
@@ -598,33 +1162,611 @@ class DjangoFrontend(AbstractFrontend):
         :param database: the database to export (will use default if unspecified)
         :param alternative_arguments: alternative arguments to pass in SQL mode
         :param alternative_binary: alternative export binary to use in SQL mode
+        :param incremental: whether to archive only the files that changed since the last pushed manifest (also enabled by CARETAKER_INCREMENTAL_ARCHIVES)
+        :param stream_archive: whether to upload the archive while it is being written instead of staging it on disk (also enabled by CARETAKER_STREAM_ARCHIVE)
+        :param content_addressed: whether to push media as deduplicated blobs and a content manifest instead of an archive (also enabled by CARETAKER_CONTENT_ADDRESSED_MEDIA)
+        :param incremental_data: whether to export only the rows that changed since the last pushed data manifest (also enabled by CARETAKER_INCREMENTAL_DATA)
+        :param include: apps, models or tables to export, leaving out the rest (added to CARETAKER_BACKUP_INCLUDE)
+        :param exclude: apps, models or tables to leave out (added to CARETAKER_BACKUP_EXCLUDE)
+        :param tiers: the retention tiers in CARETAKER_BACKUP_TIERS to back up in this run
+        :param stream_data: whether to upload the data file while it is being dumped instead of staging it on disk (also enabled by CARETAKER_STREAM_DATA)
         :return: 2-tuple of pathlib.Path objects to the data file & archive file
         """
         logger = log.get_logger('django')
 
         path_list = path_list if path_list else []
 
+        content_addressed = content_addressed or getattr(
+            settings, 'CARETAKER_CONTENT_ADDRESSED_MEDIA', False)
+
+        # content-addressed media replaces the archive altogether
+        incremental = not content_addressed and (incremental or getattr(
+            settings, 'CARETAKER_INCREMENTAL_ARCHIVES', False))
+        stream_archive = not content_addressed and (stream_archive or getattr(
+            settings, 'CARETAKER_STREAM_ARCHIVE', False))
+
+        previous_manifest = DjangoFrontend._fetch_manifest(
+            backend=backend, bucket_name=bucket_name,
+            remote_key=manifest_key(archive_file),
+            raise_on_error=raise_on_error) if incremental else None
+
+        incremental_data = not sql_mode and (incremental_data or getattr(
+            settings, 'CARETAKER_INCREMENTAL_DATA', False))
+
+        previous_data_manifest = DjangoFrontend._fetch_manifest(
+            backend=backend, bucket_name=bucket_name,
+            remote_key=manifest_key(data_file),
+            raise_on_error=raise_on_error) if incremental_data else None
+
+        stream_data = stream_data or getattr(settings, 'CARETAKER_STREAM_DATA',
+                                             False)
+
+        if stream_data and not DjangoFrontend._data_streamable(
+                sql_mode=sql_mode, database=database,
+                incremental_data=incremental_data):
+            logger.warning('This data file cannot be written to a stream, so '
+                           'it is staged on disk')
+            stream_data = False
+
+        previous_digest = DjangoFrontend._fetch_digest(
+            backend=backend, bucket_name=bucket_name,
+            remote_key=data_file,
+            raise_on_error=raise_on_error) if stream_data else None
+
         # set up a temporary directory
         with tempfile.TemporaryDirectory() as temporary_directory_name:
-            # create a local backup set in this temporary directory
-            json_file, zip_file = DjangoFrontend.create_backup(
-                output_directory=temporary_directory_name,
-                path_list=path_list, sql_mode=sql_mode,
-                archive_file=archive_file,
-                data_file=data_file,
-                alternative_binary=alternative_binary,
-                alternative_arguments=alternative_arguments
-            )
-
-            # push the data
-            DjangoFrontend.push_backup(backup_local_file=json_file,
-                                       remote_key=data_file,
-                                       backend=backend, bucket_name=bucket_name,
-                                       raise_on_error=raise_on_error)
-            DjangoFrontend.push_backup(backup_local_file=zip_file,
-                                       remote_key=archive_file,
-                                       backend=backend, bucket_name=bucket_name,
-                                       raise_on_error=raise_on_error)
+            backup_arguments = {
+                'output_directory': temporary_directory_name,
+                'path_list': path_list, 'sql_mode': sql_mode,
+                'archive_file': archive_file,
+                'data_file': data_file,
+                'alternative_binary': alternative_binary,
+                'alternative_arguments': alternative_arguments,
+                'incremental': incremental,
+                'previous_manifest': previous_manifest,
+                'incremental_data': incremental_data,
+                'previous_data_manifest': previous_data_manifest,
+                'include': include, 'exclude': exclude, 'tiers': tiers
+            }
+
+            archive_writer = None
+            data_object = None
+            data_writer = None
+
+            # streamed files are uploaded as they are written, so only what
+            # is not streamed is written to the temporary directory
+            with contextlib.ExitStack() as writers:
+                if stream_archive:
+                    archive_writer = writers.enter_context(backend.open_writer(
+                        bucket_name=bucket_name, remote_key=archive_file,
+                        raise_on_error=raise_on_error))
+
+                if stream_data:
+                    data_object = writers.enter_context(backend.open_writer(
+                        bucket_name=bucket_name, remote_key=data_file,
+                        raise_on_error=raise_on_error))
+                    data_writer = HashingWriter(data_object)
+
+                json_file, zip_file = DjangoFrontend.create_backup(
+                    archive=not content_addressed,
+                    archive_writer=archive_writer, data_writer=data_writer,
+                    **backup_arguments)
+
+                # the dump is hashed as it is uploaded, so an unchanged
+                # database is discarded rather than stored again
+                if stream_data and data_writer.hexdigest() == previous_digest:
+                    data_object.abort(outcome=StoreOutcome.IDENTICAL)
+
+            if stream_archive:
+                logger.info('Streamed {} bytes of {} ({})'.format(
+                    archive_writer.size, archive_file,
+                    archive_writer.outcome))
+
+            if stream_data:
+                logger.info('Streamed {} bytes of {} ({}, sha256 {})'.format(
+                    data_object.size, data_file, data_object.outcome,
+                    data_writer.hexdigest()))
+
+                # the digest is pushed after the data file so that it only
+                # ever describes a data file that was stored
+                if data_object.outcome == StoreOutcome.STORED:
+                    write_digest(digest=data_writer.hexdigest(),
+                                 remote_key=data_file,
+                                 output_file=Path(temporary_directory_name) /
+                                 digest_key(data_file))
+
+                    DjangoFrontend.push_backup(
+                        backup_local_file=str(Path(temporary_directory_name) /
+                                              digest_key(data_file)),
+                        remote_key=digest_key(data_file),
+                        backend=backend, bucket_name=bucket_name,
+                        raise_on_error=raise_on_error, check_identical=False)
+            else:
+                # push the data
+                DjangoFrontend.push_backup(backup_local_file=json_file,
+                                           remote_key=data_file,
+                                           backend=backend,
+                                           bucket_name=bucket_name,
+                                           raise_on_error=raise_on_error)
+
+            if content_addressed:
+                DjangoFrontend.push_content(path_list=path_list,
+                                            backend=backend,
+                                            bucket_name=bucket_name,
+                                            archive_file=archive_file,
+                                            raise_on_error=raise_on_error)
+            elif not stream_archive:
+                DjangoFrontend.push_backup(backup_local_file=zip_file,
+                                           remote_key=archive_file,
+                                           backend=backend,
+                                           bucket_name=bucket_name,
+                                           raise_on_error=raise_on_error)
+
+            # the manifest is pushed last so that the next incremental run
+            # only builds on an archive that was stored successfully
+            if incremental:
+                DjangoFrontend.push_backup(
+                    backup_local_file=str(
+                        Path(temporary_directory_name) /
+                        manifest_key(archive_file)),
+                    remote_key=manifest_key(archive_file),
+                    backend=backend, bucket_name=bucket_name,
+                    raise_on_error=raise_on_error, check_identical=False)
+
+            if incremental_data:
+                DjangoFrontend.push_backup(
+                    backup_local_file=str(
+                        Path(temporary_directory_name) /
+                        manifest_key(data_file)),
+                    remote_key=manifest_key(data_file),
+                    backend=backend, bucket_name=bucket_name,
+                    raise_on_error=raise_on_error, check_identical=False)
 
             logger.info('Pushed backups to remote store')
             return json_file, archive_file
+
+    @staticmethod
+    def push_content(path_list: list | None, backend: AbstractBackend,
+                     bucket_name: str, archive_file: str = 'media.zip',
+                     raise_on_error: bool = False) -> dict | None:
+        """
+        Push media as content-addressed blobs and a manifest of paths to digests
+
+        Each unique file is uploaded once, under its SHA-256 digest. Digests
+        listed in the previous manifest are assumed to be stored already; the
+        rest are checked with the backend before they are uploaded.
+
+        :param path_list: the list of paths to back up
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from (e.g. media.zip gives media.content.json)
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the manifest dictionary or None if a blob could not be stored
+        """
+        logger = log.get_logger('content-store')
+
+        remote_key = content_key(archive_file)
+
+        previous = DjangoFrontend._fetch_manifest(
+            backend=backend, bucket_name=bucket_name, remote_key=remote_key,
+            raise_on_error=raise_on_error)
+
+        manifest = build_content_manifest(
+            input_paths=DjangoFrontend._archive_paths(path_list=path_list,
+                                                      logger=logger),
+            previous=previous, walker=DjangoFrontend._walker())
+
+        known = {entry[2] for entry in previous['files'].values()} \
+            if previous else set()
+
+        # one source file for each digest that may need uploading
+        pending = {}
+
+        for path, entry in manifest['files'].items():
+            if entry[2] not in known:
+                pending.setdefault(entry[2], Path(path))
+
+        def store(digest: str) -> StoreOutcome:
+            if backend.has_blob(bucket_name=bucket_name, digest=digest,
+                                raise_on_error=raise_on_error):
+                return StoreOutcome.IDENTICAL
+
+            return backend.store_blob(local_file=pending[digest],
+                                      bucket_name=bucket_name, digest=digest,
+                                      raise_on_error=raise_on_error)
+
+        with ThreadPoolExecutor(
+                max_workers=getattr(settings, 'CARETAKER_BLOB_WORKERS', 4)) \
+                as executor:
+            outcomes = collections.Counter(executor.map(store, pending))
+
+        unique = {entry[2] for entry in manifest['files'].values()}
+
+        logger.info('{} files, {} unique: stored {} new blobs'.format(
+            len(manifest['files']), len(unique),
+            outcomes[StoreOutcome.STORED]))
+
+        # without every blob the manifest would reference missing content
+        if outcomes[StoreOutcome.FAILED]:
+            logger.error('Failed to store {} blobs. The content manifest was '
+                         'not pushed.'.format(outcomes[StoreOutcome.FAILED]))
+
+            if raise_on_error:
+                raise FrontendError('Failed to store content blobs')
+
+            return None
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            DjangoFrontend.push_backup(
+                backup_local_file=str(write_manifest(
+                    manifest=manifest,
+                    output_file=Path(temporary_directory_name) / remote_key)),
+                remote_key=remote_key, backend=backend,
+                bucket_name=bucket_name, raise_on_error=raise_on_error,
+                check_identical=False)
+
+        return manifest
+
+    @staticmethod
+    def restore_content(backend: AbstractBackend, bucket_name: str,
+                        archive_file: str = 'media.zip',
+                        backup_version: str = '', dry_run: bool = False,
+                        raise_on_error: bool = False) -> bool:
+        """
+        Rebuild media from a content manifest and its blobs
+
+        Files that are already on disk with the right contents are left alone.
+        Every fetched blob is checked against its digest before it replaces
+        the file on disk.
+
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from
+        :param backup_version: the version of the manifest to restore (the latest if empty)
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a true/false boolean of success
+        """
+        logger = log.get_logger('content-store')
+
+        manifest = DjangoFrontend._fetch_manifest(
+            backend=backend, bucket_name=bucket_name,
+            remote_key=content_key(archive_file), version_id=backup_version,
+            raise_on_error=raise_on_error)
+
+        if not manifest:
+            logger.error('Unable to find a content manifest')
+
+            if raise_on_error:
+                raise FrontendError('Unable to find a content manifest')
+
+            return False
+
+        def restore(item: tuple) -> str:
+            path, (size, mtime_ns, digest) = Path(item[0]), item[1]
+
+            if path.is_file() and path.stat().st_size == size \
+                    and hash_file(path) == digest:
+                return 'skipped'
+
+            if dry_run:
+                logger.info('Would restore {}'.format(path))
+                return 'restored'
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # fetch beside the target so that the rename is atomic
+            with tempfile.NamedTemporaryFile(dir=path.parent,
+                                             prefix='.caretaker-',
+                                             delete=False) as out_file:
+                temporary_file = Path(out_file.name)
+
+            try:
+                if not backend.fetch_blob(local_file=temporary_file,
+                                          bucket_name=bucket_name,
+                                          digest=digest,
+                                          raise_on_error=raise_on_error):
+                    return 'failed'
+
+                if hash_file(temporary_file) != digest:
+                    logger.error('Blob {} for {} does not match its '
+                                 'digest'.format(digest, path))
+                    return 'failed'
+
+                os.replace(temporary_file, path)
+                os.utime(path, ns=(mtime_ns, mtime_ns))
+            finally:
+                temporary_file.unlink(missing_ok=True)
+
+            return 'restored'
+
+        with ThreadPoolExecutor(
+                max_workers=getattr(settings, 'CARETAKER_BLOB_WORKERS', 4)) \
+                as executor:
+            outcomes = collections.Counter(
+                executor.map(restore, manifest['files'].items()))
+
+        logger.info('Restored {} files, skipped {} unchanged files, {} '
+                    'failed'.format(outcomes['restored'],
+                                    outcomes['skipped'], outcomes['failed']))
+
+        if outcomes['failed'] and raise_on_error:
+            raise FrontendError('Failed to restore {} files'.format(
+                outcomes['failed']))
+
+        return not outcomes['failed']
+
+    @staticmethod
+    def collect_garbage(backend: AbstractBackend, bucket_name: str,
+                        archive_file: str = 'media.zip',
+                        dry_run: bool = False,
+                        raise_on_error: bool = False) -> list[str]:
+        """
+        Delete content-addressed blobs that no stored manifest references
+
+        References are counted across every stored version of the content
+        manifest, so a blob lives for as long as any backup that uses it.
+        Blobs younger than CARETAKER_BLOB_GRACE_PERIOD seconds are kept so that
+        a backup that is still uploading does not lose its blobs.
+
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of the digests that were (or, in dry run mode, would be) deleted
+        """
+        logger = log.get_logger('content-store')
+        remote_key = content_key(archive_file)
+
+        references = collections.Counter()
+
+        for version in backend.versions(bucket_name=bucket_name,
+                                        remote_key=remote_key,
+                                        raise_on_error=raise_on_error):
+            manifest = DjangoFrontend._fetch_manifest(
+                backend=backend, bucket_name=bucket_name,
+                remote_key=remote_key, version_id=version['version_id'],
+                raise_on_error=raise_on_error)
+
+            # a manifest that cannot be read may reference any blob
+            if not manifest:
+                logger.error('Unable to read version {} of {}. No blobs were '
+                             'deleted.'.format(version['version_id'],
+                                               remote_key))
+
+                if raise_on_error:
+                    raise FrontendError('Unable to read a content manifest')
+
+                return []
+
+            references.update({entry[2] for entry
+                               in manifest['files'].values()})
+
+        cutoff = time.time() - getattr(settings,
+                                       'CARETAKER_BLOB_GRACE_PERIOD', 86400)
+
+        unreferenced = [
+            blob['digest'] for blob in backend.list_blobs(
+                bucket_name=bucket_name, raise_on_error=raise_on_error)
+            if not references[blob['digest']]
+            and blob['last_modified'].timestamp() < cutoff
+        ]
+
+        for digest in unreferenced:
+            if dry_run:
+                logger.info('Would delete blob {}'.format(digest))
+            else:
+                backend.delete_blob(bucket_name=bucket_name, digest=digest,
+                                    raise_on_error=raise_on_error)
+
+        logger.info('{} blobs are referenced, {} unreferenced blobs '
+                    '{}'.format(len(references), len(unreferenced),
+                                'would be deleted' if dry_run
+                                else 'were deleted'))
+
+        return unreferenced
+
+    @staticmethod
+    def restore_paths(patterns: list[str], backend: AbstractBackend,
+                      bucket_name: str, remote_key: str = 'media.zip',
+                      backup_version: str = '', dry_run: bool = False,
+                      raise_on_error: bool = False) -> list[str]:
+        """
+        Restore only the members of a remote zip archive that match path globs
+
+        The archive is read with byte-range requests: first its central
+        directory, then the matching members, so nothing else is downloaded.
+
+        :param patterns: shell-style globs matched against absolute paths (e.g. /var/www/media/users/42/*)
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param remote_key: the remote key (filename) of the archive
+        :param backup_version: the version of the archive to read (the latest if empty)
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of the restored (or, in dry run mode, matching) paths
+        """
+        logger = log.get_logger('restore-paths')
+
+        try:
+            if not backup_version:
+                versions = backend.versions(bucket_name=bucket_name,
+                                            remote_key=remote_key,
+                                            raise_on_error=raise_on_error)
+
+                if not versions:
+                    raise RemoteFileError('No versions of {} were '
+                                          'found'.format(remote_key))
+
+                latest = max(versions, key=lambda item: item['last_modified'])
+                backup_version = latest['version_id']
+
+            remote_file = RemoteFile(
+                backend=backend, bucket_name=bucket_name,
+                remote_key=remote_key, version_id=backup_version,
+                block_size=getattr(settings, 'CARETAKER_RANGE_BLOCK_SIZE',
+                                   1024 * 1024))
+
+            restored = []
+
+            with zipfile.ZipFile(remote_file) as zf:
+                for info in zf.infolist():
+                    path = '/{}'.format(info.filename)
+
+                    if info.is_dir() or info.filename == MANIFEST_MEMBER \
+                            or not any(fnmatch.fnmatchcase(path, pattern)
+                                       for pattern in patterns):
+                        continue
+
+                    if dry_run:
+                        logger.info('Would restore {}'.format(path))
+                    else:
+                        zf.extract(info, '/')
+
+                        mtime = zip_mtime(info)
+                        os.utime(path, (mtime, mtime))
+
+                    restored.append(path)
+
+            logger.info('Restored {} files from {} using {} requests for {} '
+                        'of {} bytes'.format(len(restored), remote_key,
+                                             remote_file.requests,
+                                             remote_file.bytes_fetched,
+                                             remote_file.size))
+
+            return restored
+        except (RemoteFileError, zipfile.BadZipFile, ClientError) as e:
+            logger.error('Unable to restore from {}: {}'.format(remote_key,
+                                                                 e))
+
+            if raise_on_error:
+                raise e
+
+            return []
+
+    @staticmethod
+    def _import_transaction(database: str, workers: int):
+        """
+        The transaction to load JSON in
+
+        A load on one process runs in a single transaction, so that it is
+        rolled back entirely if it fails. A load on several processes commits
+        each unit of models as it is loaded, so it is run outside any
+        transaction, and a failure leaves the units already loaded in place.
+
+        :param database: the database alias
+        :param workers: the number of processes asked for (0 for every core)
+        :return: a context manager
+        """
+        if workers != 1 and resolve_import_workers(database=database,
+                                                   workers=workers) > 1:
+            return contextlib.nullcontext()
+
+        return transaction.atomic(using=database)
+
+    @staticmethod
+    def _data_streamable(sql_mode: bool, database: str,
+                         incremental_data: bool) -> bool:
+        """
+        Whether the data file can be written to a stream as it is dumped
+
+        Incremental and sharded JSON exports, SQLite snapshots, Postgres
+        directory dumps and mydumper dumps are written as files first.
+
+        :param sql_mode: whether the data is exported in SQL format
+        :param database: the database to export
+        :param incremental_data: whether only the rows that changed are exported
+        :return: True if the data file can be streamed
+        """
+        if not sql_mode:
+            return not incremental_data and \
+                getattr(settings, 'CARETAKER_EXPORT_WORKERS', 1) == 1 and \
+                getattr(settings, 'CARETAKER_EXPORT_FORMAT', 'json') \
+                == 'json' and \
+                getattr(settings, 'CARETAKER_EXPORT_COMPRESSION',
+                        'deflate') == 'deflate'
+
+        vendor = connections[database if database else DEFAULT_DB_ALIAS].vendor
+
+        if vendor == 'sqlite':
+            return getattr(settings, 'CARETAKER_SQLITE_EXPORT_MODE',
+                           'dump') == 'dump'
+        elif vendor == 'postgresql':
+            return getattr(settings, 'CARETAKER_POSTGRES_DUMP_FORMAT',
+                           'plain') != 'directory'
+        elif vendor == 'mysql':
+            return getattr(settings, 'CARETAKER_MYSQL_DUMP_PROFILE',
+                           'default') != 'parallel'
+
+        return True
+
+    @staticmethod
+    def _fetch_digest(backend: AbstractBackend, bucket_name: str,
+                      remote_key: str,
+                      raise_on_error: bool = False) -> str | None:
+        """
+        Fetch the digest of the most recent version of an object
+
+        A digest is only returned if it was pushed after the most recent
+        version of the object, so that a version pushed without one is never
+        taken to match it.
+
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param remote_key: the remote key (filename) of the object
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the SHA-256 hex digest or None if there is no current digest
+        """
+        versions = backend.versions(bucket_name=bucket_name,
+                                    remote_key=digest_key(remote_key),
+                                    raise_on_error=raise_on_error)
+        object_versions = backend.versions(bucket_name=bucket_name,
+                                           remote_key=remote_key,
+                                           raise_on_error=raise_on_error)
+
+        if not versions or not object_versions:
+            return None
+
+        latest = max(versions, key=lambda item: item['last_modified'])
+
+        if latest['last_modified'] < max(
+                item['last_modified'] for item in object_versions):
+            return None
+
+        response_object = backend.get_object(
+            bucket_name=bucket_name, remote_key=digest_key(remote_key),
+            version_id=latest['version_id'], raise_on_error=raise_on_error)
+
+        return read_digest(response_object) if response_object else None
+
+    @staticmethod
+    def _fetch_manifest(backend: AbstractBackend, bucket_name: str,
+                        remote_key: str, version_id: str = '',
+                        raise_on_error: bool = False) -> dict | None:
+        """
+        Fetch a version of a manifest from the remote store
+
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param remote_key: the remote key (filename) of the manifest
+        :param version_id: the version to fetch (the most recent if empty)
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the manifest dictionary or None if there is no manifest
+        """
+        if not version_id:
+            versions = backend.versions(bucket_name=bucket_name,
+                                        remote_key=remote_key,
+                                        raise_on_error=raise_on_error)
+
+            if not versions:
+                return None
+
+            latest = max(versions, key=lambda item: item['last_modified'])
+            version_id = latest['version_id']
+
+        response_object = backend.get_object(
+            bucket_name=bucket_name, remote_key=remote_key,
+            version_id=version_id, raise_on_error=raise_on_error)
+
+        return read_manifest(response_object) if response_object else None
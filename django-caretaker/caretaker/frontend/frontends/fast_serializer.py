@@ -0,0 +1,317 @@
+import datetime
+import json
+from typing import BinaryIO, Callable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Field, QuerySet
+from django.utils.encoding import is_protected_type
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# the formats that RowWriter can write
+ROW_FORMATS = ['jsonl', 'msgpack']
+
+
+class _Value:
+    """
+    A stand-in for a model instance that holds a single attribute
+
+    Field.value_to_string only reads the field's attribute from the instance
+    it is given, so one of these is enough to reuse a field's own conversion.
+    """
+
+    def __init__(self, attname: str, value: object):
+        setattr(self, attname, value)
+
+
+def _converter(field: Field) -> Callable[[object], object]:
+    """
+    Build a function that converts a field's value as the JSON serializer does
+
+    Protected types (None, numbers, dates and Decimals) are kept as they are
+    and everything else goes through value_to_string, which for most fields is
+    plain str, so that case avoids building an instance.
+
+    :param field: the model field
+    :return: a function of the database value
+    """
+    if type(field).value_to_string is Field.value_to_string:
+        return lambda value: value if type(value) is str \
+            or is_protected_type(value) else str(value)
+
+    return lambda value: value if is_protected_type(value) \
+        else field.value_to_string(_Value(field.attname, value))
+
+
+def _encode(objects: list[dict]) -> bytes:
+    """
+    Encode a batch of fixture objects as the body of a JSON array
+
+    :param objects: the fixture objects
+    :return: the objects as JSON, separated by commas, without brackets
+    """
+    if orjson is not None:
+        return orjson.dumps(objects,
+                            default=DjangoJSONEncoder().default)[1:-1]
+
+    return json.dumps(objects, cls=DjangoJSONEncoder,
+                      ensure_ascii=False)[1:-1].encode()
+
+
+def _schema(model) -> (dict, list, list):
+    """
+    Describe the columns that are written for a model
+
+    :param model: the model class
+    :return: a 3-tuple of the schema dictionary, the serialized fields and the serialized many-to-many fields
+    """
+    meta = model._meta.concrete_model._meta
+
+    fields = [field for field in meta.local_fields
+              if field.serialize and not field.primary_key]
+    many_to_many = [field for field in meta.local_many_to_many
+                    if field.serialize and
+                    field.remote_field.through._meta.auto_created]
+
+    schema = {'model': model._meta.label_lower,
+              'fields': [field.name for field in fields],
+              'many_to_many': [field.name for field in many_to_many]}
+
+    return schema, fields, many_to_many
+
+
+def _batches(queryset: QuerySet,
+             batch_size: int) -> Iterator[tuple[dict, list[list]]]:
+    """
+    Read the rows of a queryset in batches, converted for serialization
+
+    Each row is a list of the primary key, the value of every field in the
+    schema and the related primary keys of every many-to-many field.
+
+    :param queryset: a queryset of a model, in the order to read it
+    :param batch_size: the number of rows in a batch
+    :return: a generator of 2-tuples of the schema and a batch of rows
+    """
+    schema, fields, many_to_many = _schema(queryset.model)
+    meta = queryset.model._meta.concrete_model._meta
+
+    convert_pk = _converter(meta.pk)
+    converters = [_converter(field) for field in fields]
+
+    def convert(batch: list[tuple]) -> list[list]:
+        related = [_related(field, [row[0] for row in batch], queryset.db)
+                   for field in many_to_many]
+
+        return [[convert_pk(row[0])] +
+                [converter(value) for converter, value
+                 in zip(converters, row[1:])] +
+                [mapping.get(row[0], []) for mapping in related]
+                for row in batch]
+
+    rows = queryset.values_list(
+        meta.pk.attname, *[field.attname for field in fields]).iterator(
+        chunk_size=batch_size)
+
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            yield schema, convert(batch)
+            batch = []
+
+    if batch:
+        yield schema, convert(batch)
+
+
+def _related(field: Field, keys: list, database: str) -> dict:
+    """
+    Read the related primary keys of a many-to-many field for some rows
+
+    :param field: the many-to-many field
+    :param keys: the primary keys of the rows
+    :param database: the database alias
+    :return: a dictionary of row primary key to a list of related primary keys
+    """
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name())
+    target = through._meta.get_field(field.m2m_reverse_field_name())
+    convert = _converter(field.remote_field.model._meta.pk)
+
+    mapping = {}
+
+    for source_key, target_key in through._default_manager.using(
+            database).filter(**{'{}__in'.format(source.attname): keys}) \
+            .order_by(through._meta.pk.attname) \
+            .values_list(source.attname, target.attname):
+        mapping.setdefault(source_key, []).append(convert(target_key))
+
+    return mapping
+
+
+class FixtureWriter:
+    """
+    Write loaddata fixtures straight from database rows
+
+    Rows are read with values_list in batches, so no model instances are
+    built, and each batch is encoded in one call, with orjson if it is
+    installed. Many-to-many fields are read from their through tables once
+    per batch rather than once per object. The output is a JSON array of
+    the same objects that dumpdata writes (without natural keys).
+    """
+
+    def __init__(self, out_file: BinaryIO, batch_size: int = 2000):
+        self.out_file = out_file
+        self.batch_size = batch_size
+
+        self._empty = True
+
+    def __enter__(self) -> 'FixtureWriter':
+        self.out_file.write(b'[')
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.out_file.write(b']')
+
+    def write_queryset(self, queryset: QuerySet) -> int:
+        """
+        Write every row of a queryset
+
+        :param queryset: a queryset of a model, in the order to write it
+        :return: the number of objects written
+        """
+        count = 0
+
+        for schema, rows in _batches(queryset, self.batch_size):
+            names = schema['fields'] + schema['many_to_many']
+
+            objects = [{'model': schema['model'], 'pk': row[0],
+                        'fields': dict(zip(names, row[1:]))}
+                       for row in rows]
+
+            if not self._empty:
+                self.out_file.write(b', ')
+
+            self.out_file.write(_encode(objects))
+            self._empty = False
+
+            count += len(objects)
+
+        return count
+
+
+class RowWriter:
+    """
+    Write rows in a compact, line-delimited format
+
+    A schema header that names the model and its columns is written once,
+    followed by one array per row of the primary key, the field values and
+    the related keys of each many-to-many field, so field names are not
+    repeated. The 'jsonl' format writes one JSON document per line and the
+    'msgpack' format writes a stream of msgpack objects. read_rows reads
+    either back one row at a time.
+    """
+
+    def __init__(self, out_file: BinaryIO, row_format: str = 'jsonl',
+                 batch_size: int = 2000):
+        if row_format not in ROW_FORMATS:
+            raise ValueError('Unknown row format {}'.format(row_format))
+
+        if row_format == 'msgpack':
+            _require_msgpack()
+
+        self.out_file = out_file
+        self.row_format = row_format
+        self.batch_size = batch_size
+
+    def _pack(self, items: list) -> bytes:
+        """
+        Encode a list of headers or rows
+
+        :param items: the items to encode
+        :return: the encoded items, one after another
+        """
+        if self.row_format == 'msgpack':
+            return b''.join(msgpack.packb(item, default=_msgpack_default)
+                            for item in items)
+
+        return b''.join(_encode([item]) + b'\n' for item in items)
+
+    def write_queryset(self, queryset: QuerySet) -> int:
+        """
+        Write a schema header and every row of a queryset
+
+        :param queryset: a queryset of a model, in the order to write it
+        :return: the number of rows written
+        """
+        self.out_file.write(self._pack([_schema(queryset.model)[0]]))
+
+        count = 0
+
+        for _, rows in _batches(queryset, self.batch_size):
+            self.out_file.write(self._pack(rows))
+            count += len(rows)
+
+        return count
+
+
+def read_rows(in_file: BinaryIO, row_format: str = 'jsonl') -> Iterator[dict]:
+    """
+    Read the output of RowWriter as the objects of Django's python serializer
+
+    :param in_file: the file-like object to read
+    :param row_format: the format it was written in: 'jsonl' or 'msgpack'
+    :return: a generator of dictionaries of the 'model', 'pk' and 'fields'
+    """
+    if row_format == 'msgpack':
+        _require_msgpack()
+        items = msgpack.Unpacker(in_file, raw=False)
+    else:
+        loads = orjson.loads if orjson is not None else json.loads
+        items = (loads(line) for line in in_file if line.strip())
+
+    schema = None
+
+    for item in items:
+        if isinstance(item, dict):
+            schema = item
+            names = schema['fields'] + schema['many_to_many']
+            continue
+
+        yield {'model': schema['model'], 'pk': item[0],
+               'fields': dict(zip(names, item[1:]))}
+
+
+def _msgpack_default(value: object) -> object:
+    """
+    Convert a value that msgpack cannot pack as orjson would
+
+    :param value: the value to convert
+    :return: a value that msgpack can pack
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+
+    return DjangoJSONEncoder().default(value)
+
+
+def _require_msgpack() -> None:
+    """
+    Raise an informative error if msgpack is not installed
+
+    :raises ImportError: if msgpack is not installed
+    :return: None
+    """
+    if msgpack is None:
+        raise ImportError('The msgpack export format needs the msgpack '
+                          'package (pip install django-caretaker[msgpack])')
@@ -0,0 +1,765 @@
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import tempfile
+import time
+import uuid
+import zipfile
+from multiprocessing.pool import Pool
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+
+from django.apps import apps
+from django.core import serializers
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import DateTimeField, IntegerField, Max, QuerySet
+
+from caretaker.frontend.frontends.fast_serializer import FixtureWriter, \
+    RowWriter, ROW_FORMATS
+from caretaker.frontend.frontends.selection import select_models
+from caretaker.utils import log
+from caretaker.utils.manifest import SHARD_INDEX_MEMBER
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SHARD_INDEX_VERSION = 1
+
+# the formats that shards can be written in
+EXPORT_FORMATS = ['json'] + ROW_FORMATS
+
+# how shards can be compressed: by the zip file, as zstd streams or not at all
+EXPORT_COMPRESSIONS = ['deflate', 'zstd', 'none']
+
+INCREMENTAL_STATE_VERSION = 1
+
+# how many primary keys are read at a time
+_KEY_BATCH_SIZE = 10000
+
+# database wrappers inherited from the parent process. They are kept alive so
+# that they are never closed (and their sessions ended) from a worker.
+_inherited_connections = []
+
+
+class Snapshot:
+    """
+    Hold a consistent view of a database open while workers read from it
+
+    On PostgreSQL, the parent exports a snapshot that every worker imports.
+    On MySQL, the parent holds a global read lock until every worker has
+    started a consistent snapshot transaction. On SQLite, the parent holds a
+    read transaction, which stops writers from committing. With a single
+    worker, everything is read in the parent's own transaction instead.
+    """
+
+    def __init__(self, database: str, workers: int):
+        self.database = database
+        self.connection: BaseDatabaseWrapper = connections[database]
+        self.identifier = None
+        self.shared = workers > 1
+        self.barrier = multiprocessing.get_context('fork').Barrier(
+            workers + 1) if self.shared and \
+            self.connection.vendor == 'mysql' else None
+
+        self._atomic = None
+        self._locked = False
+
+    def __enter__(self) -> 'Snapshot':
+        # the isolation level can only be set before a transaction's first
+        # query, which an enclosing atomic block may already have run
+        outermost = not self.connection.in_atomic_block
+
+        self._atomic = transaction.atomic(using=self.database)
+        self._atomic.__enter__()
+
+        if not self.shared:
+            return self
+
+        with self.connection.cursor() as cursor:
+            if self.connection.vendor == 'postgresql':
+                if outermost:
+                    cursor.execute('SET TRANSACTION ISOLATION LEVEL '
+                                   'REPEATABLE READ')
+
+                cursor.execute('SELECT pg_export_snapshot()')
+                self.identifier = cursor.fetchone()[0]
+            elif self.connection.vendor == 'mysql':
+                cursor.execute('FLUSH TABLES WITH READ LOCK')
+                self._locked = True
+            elif self.connection.vendor == 'sqlite':
+                # a read takes the shared lock that the transaction then holds
+                cursor.execute('SELECT COUNT(*) FROM sqlite_master')
+
+        return self
+
+    def workers_ready(self) -> None:
+        """
+        Release anything that was only needed until every worker had joined
+
+        :return: None
+        """
+        if self.barrier:
+            self.barrier.wait()
+
+        if self._locked:
+            with self.connection.cursor() as cursor:
+                cursor.execute('UNLOCK TABLES')
+
+            self._locked = False
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._locked:
+            with self.connection.cursor() as cursor:
+                cursor.execute('UNLOCK TABLES')
+
+        return self._atomic.__exit__(exc_type, exc_val, exc_tb)
+
+
+def require_zstandard() -> None:
+    """
+    Raise an informative error if zstandard is not installed
+
+    :raises ImportError: if zstandard is not installed
+    :return: None
+    """
+    if zstandard is None:
+        raise ImportError('zstd-compressed exports need the zstandard '
+                          'package (pip install django-caretaker[zstd])')
+
+
+def detach_connection(database: str) -> bool:
+    """
+    Make a forked worker open its own connection on the next query
+
+    :param database: the database alias
+    :return: False if the connection is to an in-memory SQLite database, which is kept because it only exists in the memory the worker was forked with
+    """
+    connection = connections[database]
+
+    if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+        return False
+
+    _inherited_connections.append(connection)
+    del connections[database]
+
+    return True
+
+
+def _join_snapshot(database: str, identifier: str | None,
+                   barrier) -> None:
+    """
+    Give a worker process its own connection inside the parent's snapshot
+
+    :param database: the database alias
+    :param identifier: the exported PostgreSQL snapshot or None
+    :param barrier: a barrier to wait on once the snapshot is held, or None
+    :return: None
+    """
+    # an in-memory SQLite database only exists in the memory that the worker
+    # was forked with, so the inherited connection is the snapshot
+    if not detach_connection(database):
+        return
+
+    connection = connections[database]
+    connection.set_autocommit(False)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+            cursor.execute('SET TRANSACTION SNAPSHOT %s', [identifier])
+        elif connection.vendor == 'mysql':
+            cursor.execute('SET SESSION TRANSACTION ISOLATION LEVEL '
+                           'REPEATABLE READ')
+            cursor.execute('START TRANSACTION WITH CONSISTENT SNAPSHOT')
+
+    if barrier:
+        barrier.wait()
+
+
+def _shard_queryset(task: dict) -> QuerySet:
+    """
+    The rows of a model that one shard holds, in primary key order
+
+    :param task: a dictionary with the 'database', 'model' label, an optional [start, end) 'pk_range', where None is unbounded, and optional 'filters' for QuerySet.filter
+    :return: a queryset
+    """
+    model = apps.get_model(task['model'])
+
+    queryset = model._default_manager.using(task['database']).order_by(
+        model._meta.pk.name)
+
+    if task.get('pk_range'):
+        start, end = task['pk_range']
+
+        if start is not None:
+            queryset = queryset.filter(pk__gte=start)
+
+        if end is not None:
+            queryset = queryset.filter(pk__lt=end)
+
+    if task.get('filters'):
+        queryset = queryset.filter(**task['filters'])
+
+    return queryset
+
+
+@contextlib.contextmanager
+def _open_shard(path: str, compression: str) -> Iterator[BinaryIO]:
+    """
+    Open a shard file for writing, compressing it with zstd if asked to
+
+    :param path: the shard file
+    :param compression: the compression of the shard
+    :return: a context manager of a writable binary stream
+    """
+    with Path(path).open('wb') as out_file:
+        if compression != 'zstd':
+            yield out_file
+            return
+
+        require_zstandard()
+
+        with zstandard.ZstdCompressor().stream_writer(
+                out_file, closefd=False) as writer:
+            yield writer
+
+
+def _export_shard(task: dict) -> int:
+    """
+    Serialize one shard of a model
+
+    :param task: a dictionary as for _shard_queryset, plus the 'path' to write, the 'engine' ('dumpdata' or 'fast'), the 'format' (one of EXPORT_FORMATS) and the 'compression' (one of EXPORT_COMPRESSIONS)
+    :return: the number of objects written
+    """
+    queryset = _shard_queryset(task)
+
+    with _open_shard(task['path'], task['compression']) as out_file:
+        if task['format'] in ROW_FORMATS:
+            return RowWriter(out_file=out_file,
+                             row_format=task['format']).write_queryset(
+                queryset)
+
+        if task['engine'] == 'fast':
+            with FixtureWriter(out_file=out_file) as writer:
+                return writer.write_queryset(queryset)
+
+        count = 0
+
+        def counted(objects):
+            nonlocal count
+
+            for item in objects:
+                count += 1
+                yield item
+
+        stream = io.TextIOWrapper(out_file, encoding='utf-8')
+
+        serializers.serialize('json', counted(queryset.iterator()),
+                              stream=stream)
+
+        # leave the binary stream open for _open_shard to close
+        stream.flush()
+        stream.detach()
+
+        return count
+
+
+def _prepare_tasks(tasks: list[dict], shard_directory: str, engine: str,
+                   export_format: str, compression: str) -> None:
+    """
+    Give every task a shard file and the way to write it
+
+    :param tasks: the tasks from _plan_shards
+    :param shard_directory: the directory to write the shards to
+    :param engine: the serializer for the 'json' format
+    :param export_format: one of EXPORT_FORMATS
+    :param compression: one of EXPORT_COMPRESSIONS
+    :return: None
+    """
+    suffix = '.{}{}'.format(export_format,
+                            '.zst' if compression == 'zstd' else '')
+
+    for index, task in enumerate(tasks):
+        task['path'] = str(Path(shard_directory) /
+                           '{:05d}{}'.format(index, suffix))
+        task['engine'] = engine
+        task['format'] = export_format
+        task['compression'] = compression
+
+
+def _plan_shards(database: str, shard_size: int,
+                 filters: dict | None = None,
+                 include: list[str] | None = None,
+                 exclude: list[str] | None = None) -> list[dict]:
+    """
+    Split every model into shards of at most shard_size rows by primary key
+
+    The boundaries are found by reading the primary keys alone, in order, so
+    each shard is a cheap indexed range scan rather than an OFFSET.
+
+    :param database: the database alias
+    :param shard_size: the most rows in a shard (0 for one shard per model)
+    :param filters: a dictionary of model label to the filters that select the rows to export (every row of models that are not listed)
+    :param include: if not empty, export only the apps, models and tables that these name
+    :param exclude: apps, models and tables to leave out
+    :return: a list of tasks for _export_shard, without paths
+    """
+    filters = filters if filters else {}
+    tasks = []
+
+    for model in select_models(database=database, include=include,
+                               exclude=exclude):
+        label = model._meta.label_lower
+        boundaries = []
+
+        if shard_size:
+            keys = _shard_queryset(
+                {'database': database, 'model': label,
+                 'filters': filters.get(label)}).values_list('pk', flat=True)
+
+            boundaries = [key for index, key in enumerate(keys.iterator())
+                          if index and not index % shard_size]
+
+        if not boundaries:
+            tasks.append({'database': database, 'model': label,
+                          'pk_range': None, 'filters': filters.get(label)})
+            continue
+
+        for start, end in zip([None] + boundaries, boundaries + [None]):
+            tasks.append({'database': database, 'model': label,
+                          'pk_range': [start, end],
+                          'filters': filters.get(label)})
+
+    return tasks
+
+
+@contextlib.contextmanager
+def _worker_pool(database: str, workers: int) -> Iterator[Pool | None]:
+    """
+    Hold a snapshot of a database open with a pool of processes that read it
+
+    :param database: the database alias
+    :param workers: the number of worker processes
+    :return: a context manager of the pool, or None to run in this process when there is only one worker
+    """
+    with Snapshot(database=database, workers=workers) as snapshot:
+        if not snapshot.shared:
+            yield None
+            return
+
+        with multiprocessing.get_context('fork').Pool(
+                processes=workers, initializer=_join_snapshot,
+                initargs=(database, snapshot.identifier,
+                          snapshot.barrier)) as pool:
+            snapshot.workers_ready()
+
+            yield pool
+
+
+def _map(pool: Pool | None, function: Callable, tasks: list) -> list:
+    """
+    Run a function over tasks on a pool, or in this process without one
+
+    :param pool: the pool from _worker_pool
+    :param function: the function to run
+    :param tasks: the tasks to pass to it
+    :return: a list of the results, in task order
+    """
+    if pool is None:
+        return [function(task) for task in tasks]
+
+    return pool.map(function, tasks, chunksize=1)
+
+
+def _write_shards(output_file: Path, tasks: list[dict], counts: list[int],
+                  index: dict) -> dict:
+    """
+    Store exported shards and an index that lists them in a zip file
+
+    :param output_file: the zip file to write
+    :param tasks: the tasks that were exported
+    :param counts: the number of objects in each task's shard
+    :param index: further keys to store in the index
+    :return: the index dictionary
+    """
+    compression = tasks[0]['compression'] if tasks else 'deflate'
+
+    index = {
+        'version': SHARD_INDEX_VERSION,
+        'created': time.time(),
+        'format': tasks[0]['format'] if tasks else 'json',
+        'compression': compression,
+        'shards': [],
+        **index,
+    }
+
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED
+                         if compression == 'deflate'
+                         else zipfile.ZIP_STORED) as zf:
+        for task, count in zip(tasks, counts):
+            if not count:
+                continue
+
+            name = 'shards/{}'.format(Path(task['path']).name)
+            zf.write(task['path'], name)
+
+            index['shards'].append({'name': name,
+                                    'model': task['model'],
+                                    'count': count})
+
+        zf.writestr(SHARD_INDEX_MEMBER, json.dumps(index))
+
+    return index
+
+
+def export_json_fast(output_file: Path,
+                     database: str = DEFAULT_DB_ALIAS,
+                     include: list[str] | None = None,
+                     exclude: list[str] | None = None) -> Path:
+    """
+    Export every model to a single fixture with the fast engine
+
+    :param output_file: the fixture file to write
+    :param database: the database alias
+    :param include: if not empty, export only the apps, models and tables that these name
+    :param exclude: apps, models and tables to leave out
+    :return: a pathlib.Path object pointing to the fixture
+    """
+    logger = log.get_logger('json-export')
+    start = time.perf_counter()
+    count = 0
+
+    with transaction.atomic(using=database), \
+            Path(output_file).open('wb') as out_file, \
+            FixtureWriter(out_file=out_file) as writer:
+        for model in select_models(database=database, include=include,
+                                   exclude=exclude):
+            count += writer.write_queryset(_shard_queryset(
+                {'database': database, 'model': model._meta.label_lower}))
+
+    logger.info('Exported {} objects in {:.1f}s'.format(
+        count, time.perf_counter() - start))
+
+    return Path(output_file)
+
+
+def export_json_shards(output_file: Path, workers: int,
+                       shard_size: int = 0,
+                       database: str = DEFAULT_DB_ALIAS,
+                       engine: str = 'dumpdata',
+                       export_format: str = 'json',
+                       compression: str = 'deflate',
+                       include: list[str] | None = None,
+                       exclude: list[str] | None = None) -> Path:
+    """
+    Export every model to JSON shards on a pool of processes
+
+    Each worker process has its own connection, and every worker reads the
+    same consistent snapshot of the database. The shards and an index that
+    lists them are stored in a zip file, which import_json_shards loads.
+
+    :param output_file: the zip file to write
+    :param workers: the number of worker processes (0 uses every core)
+    :param shard_size: the most rows in a shard (0 for one shard per model)
+    :param database: the database alias
+    :param engine: the serializer to use: 'dumpdata' for Django's own or 'fast' for FixtureWriter
+    :param export_format: 'json' for loaddata fixtures, or 'jsonl' or 'msgpack' for RowWriter rows
+    :param compression: 'deflate' to compress shards in the zip file, 'zstd' to compress each shard as a zstd stream or 'none'
+    :param include: if not empty, export only the apps, models and tables that these name
+    :param exclude: apps, models and tables to leave out
+    :return: a pathlib.Path object pointing to the zip file
+    """
+    logger = log.get_logger('json-export')
+    workers = workers if workers else multiprocessing.cpu_count()
+
+    with tempfile.TemporaryDirectory() as shard_directory, \
+            _worker_pool(database=database, workers=workers) as pool:
+        tasks = _plan_shards(database=database, shard_size=shard_size,
+                             include=include, exclude=exclude)
+
+        _prepare_tasks(tasks=tasks, shard_directory=shard_directory,
+                       engine=engine, export_format=export_format,
+                       compression=compression)
+
+        start = time.perf_counter()
+
+        counts = _map(pool, _export_shard, tasks)
+
+        index = _write_shards(output_file=output_file, tasks=tasks,
+                              counts=counts, index={})
+
+        logger.info('Exported {} objects in {} shards on {} workers in '
+                    '{:.1f}s'.format(sum(counts), len(index['shards']),
+                                     workers,
+                                     time.perf_counter() - start))
+
+    return Path(output_file)
+
+
+def _watermark_field(model) -> str | None:
+    """
+    The auto_now timestamp of a model, which is set whenever a row is saved
+
+    :param model: the model class
+    :return: the name of the field or None if the model has no such field
+    """
+    for field in model._meta.concrete_fields:
+        if isinstance(field, DateTimeField) and field.auto_now:
+            return field.name
+
+    return None
+
+
+def _integer_key(model) -> bool:
+    """
+    Check whether a model's primary key is an integer
+
+    :param model: the model class
+    :return: True if the keys can be recorded as ranges
+    """
+    pk = model._meta.pk
+
+    return isinstance(pk.target_field if pk.is_relation else pk,
+                      IntegerField)
+
+
+def _model_state(task: dict) -> dict:
+    """
+    Record the watermarks and primary keys of a model
+
+    Integer primary keys are stored as inclusive [first, last] runs, which
+    are compact for tables whose rows are mostly never deleted. Other keys
+    are stored as a list of strings.
+
+    :param task: a dictionary with the 'database' and 'model' label
+    :return: a dictionary of the 'field', 'watermark', 'max_pk' and either 'ranges' or 'keys'
+    """
+    model = apps.get_model(task['model'])
+    queryset = _shard_queryset(task)
+    field = _watermark_field(model)
+
+    state = {'field': field, 'watermark': None, 'max_pk': None}
+
+    if field:
+        watermark = queryset.aggregate(watermark=Max(field))['watermark']
+        state['watermark'] = watermark.isoformat() if watermark else None
+
+    keys = queryset.values_list('pk', flat=True).iterator(
+        chunk_size=_KEY_BATCH_SIZE)
+
+    if not _integer_key(model):
+        state['keys'] = [key if isinstance(key, str) else str(key)
+                         for key in keys]
+
+        return state
+
+    ranges = []
+
+    for key in keys:
+        if ranges and key == ranges[-1][1] + 1:
+            ranges[-1][1] = key
+        else:
+            ranges.append([key, key])
+
+    state['ranges'] = ranges
+    state['max_pk'] = ranges[-1][1] if ranges else None
+
+    return state
+
+
+def _subtract_ranges(previous: list[list[int]],
+                     current: list[list[int]]) -> list[list[int]]:
+    """
+    Find the keys in one sorted list of inclusive ranges that are not in another
+
+    :param previous: the ranges recorded by the previous backup
+    :param current: the ranges recorded now
+    :return: the ranges of keys that have gone
+    """
+    gone = []
+    index = 0
+
+    for start, end in previous:
+        while index < len(current) and current[index][1] < start:
+            index += 1
+
+        position = start
+        cursor = index
+
+        while cursor < len(current) and current[cursor][0] <= end:
+            if current[cursor][0] > position:
+                gone.append([position, current[cursor][0] - 1])
+
+            position = max(position, current[cursor][1] + 1)
+            cursor += 1
+
+        if position <= end:
+            gone.append([position, end])
+
+    return gone
+
+
+def _deleted_keys(previous: dict, current: dict) -> dict | None:
+    """
+    Compare the keys that two backups recorded for a model
+
+    :param previous: the previous state of the model
+    :param current: the current state of the model
+    :return: a dictionary of the 'ranges' or 'keys' that were deleted, or None if none were
+    """
+    if 'ranges' in previous and 'ranges' in current:
+        ranges = _subtract_ranges(previous['ranges'], current['ranges'])
+
+        return {'ranges': ranges} if ranges else None
+
+    if 'keys' in previous and 'keys' in current:
+        keys = sorted(set(previous['keys']) - set(current['keys']))
+
+        return {'keys': keys} if keys else None
+
+    return None
+
+
+def _incremental_filters(model, previous: dict | None,
+                         watermark_lag: int, append_only: bool) -> dict:
+    """
+    The filters that select the rows of a model changed since a backup
+
+    :param model: the model class
+    :param previous: the state of the model in the previous backup or None
+    :param watermark_lag: the seconds subtracted from a timestamp watermark to allow for transactions that were still open when it was read
+    :param append_only: whether rows of the model are only ever inserted, so that keys above the previous largest key are the only changes
+    :return: a dictionary for QuerySet.filter (empty to export every row)
+    """
+    if not previous:
+        return {}
+
+    field = _watermark_field(model)
+
+    if field and previous['field'] == field and previous['watermark']:
+        return {'{}__gte'.format(field): datetime.datetime.fromisoformat(
+            previous['watermark']) - datetime.timedelta(
+            seconds=watermark_lag)}
+
+    if append_only and _integer_key(model) and \
+            previous['max_pk'] is not None:
+        return {'pk__gt': previous['max_pk']}
+
+    return {}
+
+
+def export_json_incremental(output_file: Path, previous: dict | None = None,
+                            workers: int = 1, shard_size: int = 0,
+                            database: str = DEFAULT_DB_ALIAS,
+                            engine: str = 'dumpdata', max_chain: int = 0,
+                            watermark_lag: int = 300,
+                            append_only: list[str] | None = None,
+                            export_format: str = 'json',
+                            compression: str = 'deflate',
+                            include: list[str] | None = None,
+                            exclude: list[str] | None = None) -> dict:
+    """
+    Export only the rows that changed since a previous backup
+
+    A model with an auto_now DateTimeField exports the rows saved since the
+    previous backup's latest timestamp. A model listed in append_only exports
+    the rows whose integer key is above the previous largest key. Any other
+    model is exported in full. The keys of every model are recorded so that
+    rows deleted since the previous backup are listed in the index, for
+    import_json_shards to delete. The output is a sharded export. Models
+    left out by include or exclude are not recorded, so they are exported in
+    full by the next export that selects them again.
+
+    :param output_file: the zip file to write
+    :param previous: the state returned by the previous export or None for a full export
+    :param workers: the number of worker processes (0 uses every core)
+    :param shard_size: the most rows in a shard (0 for one shard per model)
+    :param database: the database alias
+    :param engine: the serializer to use: 'dumpdata' or 'fast'
+    :param max_chain: the number of incremental exports allowed before a new full export is taken (0 for no limit)
+    :param watermark_lag: the seconds to reach back before a timestamp watermark
+    :param append_only: labels of models (e.g. 'app.event') whose rows are never updated
+    :param export_format: 'json', 'jsonl' or 'msgpack', as for export_json_shards
+    :param compression: 'deflate', 'zstd' or 'none', as for export_json_shards
+    :param include: if not empty, export only the apps, models and tables that these name
+    :param exclude: apps, models and tables to leave out
+    :return: a state dictionary to pass as previous to the next export
+    """
+    logger = log.get_logger('json-export')
+    workers = workers if workers else multiprocessing.cpu_count()
+    append_only = {label.lower() for label in
+                   (append_only if append_only else [])}
+
+    if previous and (previous['version'] != INCREMENTAL_STATE_VERSION or
+                     (max_chain and previous['chain'] >= max_chain)):
+        previous = None
+
+    state = {
+        'version': INCREMENTAL_STATE_VERSION,
+        'id': str(uuid.uuid4()),
+        'created': time.time(),
+        'type': 'incremental' if previous else 'full',
+        'parent': previous['id'] if previous else None,
+        'chain': previous['chain'] + 1 if previous else 0,
+        'models': {},
+    }
+
+    previous_models = previous['models'] if previous else {}
+
+    filters = {model._meta.label_lower: _incremental_filters(
+        model=model, previous=previous_models.get(model._meta.label_lower),
+        watermark_lag=watermark_lag,
+        append_only=model._meta.label_lower in append_only)
+        for model in select_models(database=database, include=include,
+                                   exclude=exclude)}
+
+    with tempfile.TemporaryDirectory() as shard_directory, \
+            _worker_pool(database=database, workers=workers) as pool:
+        tasks = _plan_shards(database=database, shard_size=shard_size,
+                             filters=filters, include=include,
+                             exclude=exclude)
+
+        _prepare_tasks(tasks=tasks, shard_directory=shard_directory,
+                       engine=engine, export_format=export_format,
+                       compression=compression)
+
+        start = time.perf_counter()
+
+        counts = _map(pool, _export_shard, tasks)
+
+        # the keys are read in the same snapshot as the rows
+        labels = list(filters)
+        state['models'] = dict(zip(labels, _map(
+            pool, _model_state,
+            [{'database': database, 'model': label} for label in labels])))
+
+        deleted = {}
+
+        for label, current in state['models'].items():
+            if label in previous_models:
+                keys = _deleted_keys(previous_models[label], current)
+
+                if keys:
+                    deleted[label] = keys
+
+        index = _write_shards(output_file=output_file, tasks=tasks,
+                              counts=counts,
+                              index={'id': state['id'],
+                                     'type': state['type'],
+                                     'parent': state['parent'],
+                                     'chain': state['chain'],
+                                     'deleted': deleted})
+
+        logger.info('Exported {} changed objects of {} models in a {} '
+                    'export with deletions in {} models in {:.1f}s'.format(
+                        sum(counts),
+                        len({shard['model'] for shard in index['shards']}),
+                        state['type'], len(deleted),
+                        time.perf_counter() - start))
+
+    return state
@@ -0,0 +1,753 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, TextIO
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Model, Q
+
+from caretaker.frontend.frontends.fast_serializer import ROW_FORMATS, \
+    read_rows
+from caretaker.frontend.frontends.json_export import detach_connection, \
+    require_zstandard, zstandard
+from caretaker.frontend.frontends.utils import DatabasePatcher
+from caretaker.utils import log
+from caretaker.utils.manifest import SHARD_INDEX_MEMBER
+
+# how many characters of a fixture are read at a time
+_READ_SIZE = 1024 * 1024
+
+# how many primary keys are passed to one IN (...) when deleting
+_DELETE_BATCH_SIZE = 500
+
+
+def iter_fixture(in_file: TextIO,
+                 read_size: int = _READ_SIZE) -> Iterator[dict]:
+    """
+    Parse the objects of a JSON array fixture one at a time
+
+    The fixture is read in blocks and each object is decoded as soon as the
+    whole of it has been read, so memory use is bounded by the block size and
+    the largest object rather than the size of the fixture.
+
+    :param in_file: a text file-like object holding a JSON array
+    :param read_size: the number of characters to read at a time
+    :raises ValueError: if the fixture is not a JSON array
+    :return: a generator of the objects in the array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    finished = False
+
+    while not finished:
+        block = in_file.read(read_size)
+        buffer = buffer[position:] + block
+        position = 0
+
+        while True:
+            # skip the whitespace and separators between objects
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+
+            if position == len(buffer):
+                break
+
+            if not started:
+                if buffer[position] != '[':
+                    raise ValueError('A fixture must be a JSON array')
+
+                started = True
+                position += 1
+                continue
+
+            if buffer[position] == ']':
+                finished = True
+                break
+
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if not block:
+                    raise
+
+                # the object continues in the next block
+                break
+
+            yield item
+
+        if not block and not finished:
+            raise ValueError('The fixture ended before its closing bracket')
+
+
+class BulkLoader:
+    """
+    Load deserialized objects into the database in batches
+
+    Consecutive objects of the same model are inserted with bulk_create, and
+    objects whose primary keys already exist are updated with bulk_update, so
+    that a restore overwrites rows as loaddata does. Many-to-many relations
+    are written to their through tables a batch at a time. Save methods and
+    signals are bypassed, as are the pre_save and post_save signals that
+    loaddata sends with raw=True. Models with multi-table inheritance, which
+    bulk_create cannot write, are saved one object at a time.
+
+    Constraints are checked and sequences are reset once loading finishes.
+
+    With defer_indexes, the secondary indexes of each table are dropped
+    before its first row is written and are rebuilt in one pass each once
+    loading finishes, and constraint checks are deferred in the way of the
+    database's importer (see DatabasePatcher.patch_importer). On databases
+    that cannot roll back DDL, such as MySQL, dropping an index commits the
+    transaction, so the load is not atomic there.
+    """
+
+    def __init__(self, database: str = DEFAULT_DB_ALIAS,
+                 batch_size: int = 5000, defer_indexes: bool = False):
+        self.database = database
+        self.batch_size = batch_size
+        self.defer_indexes = defer_indexes
+        self.count = 0
+
+        self._connection = connections[database]
+        self._models = set()
+        self._batch = []
+        self._model = None
+        self._checks_disabled = False
+        self._start = None
+        self._importer = None
+        self._dropped = {}
+
+    def __enter__(self) -> 'BulkLoader':
+        if self.defer_indexes:
+            patched, self._importer = DatabasePatcher.patch_importer(
+                self._connection)
+
+            if not patched:
+                log.get_logger('json-import').warning(
+                    'Indexes cannot be deferred on {}'.format(
+                        self._connection.vendor))
+
+        self._checks_disabled = \
+            self._importer.defer_constraints(self._connection) \
+            if self._importer else \
+            self._connection.disable_constraint_checking()
+        self._start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self._flush()
+        finally:
+            # a rollback brings back the indexes dropped in a transaction,
+            # except on databases such as MySQL where DDL commits
+            if exc_type is None or not self._connection.in_atomic_block or \
+                    not self._connection.features.can_rollback_ddl:
+                self._rebuild_indexes()
+
+            if self._checks_disabled and self._importer:
+                self._importer.restore_constraints(self._connection)
+            elif self._checks_disabled:
+                self._connection.enable_constraint_checking()
+
+        if exc_type is not None:
+            return
+
+        self._connection.check_constraints(
+            table_names=[model._meta.db_table for model in self._models])
+
+        sequence_sql = self._connection.ops.sequence_reset_sql(
+            no_style(), self._models)
+
+        if sequence_sql:
+            with self._connection.cursor() as cursor:
+                for line in sequence_sql:
+                    cursor.execute(line)
+
+        elapsed = time.perf_counter() - self._start
+
+        log.get_logger('json-import').info(
+            'Loaded {} objects of {} models in {:.1f}s ({:.0f} rows/s)'.format(
+                self.count, len(self._models), elapsed,
+                self.count / elapsed if elapsed else 0))
+
+    def load(self, objects: Iterable[dict]) -> int:
+        """
+        Load objects in the form of Django's python serializer
+
+        :param objects: dictionaries of the 'model', 'pk' and 'fields'
+        :return: the number of objects loaded
+        """
+        loaded = 0
+
+        for item in serializers.deserialize('python', objects,
+                                            using=self.database):
+            model = type(item.object)
+
+            if model is not self._model or \
+                    len(self._batch) >= self.batch_size:
+                self._flush()
+                self._model = model
+
+            self._batch.append(item)
+            loaded += 1
+
+        self.count += loaded
+
+        return loaded
+
+    def _flush(self) -> None:
+        """
+        Write the pending batch of objects
+
+        :return: None
+        """
+        if not self._batch:
+            return
+
+        batch, self._batch = self._batch, []
+        model: type[Model] = type(batch[0].object)
+        meta = model._meta
+        self._models.add(model)
+
+        for table in [meta.db_table] + [
+                field.remote_field.through._meta.db_table
+                for field in meta.many_to_many]:
+            self._drop_indexes(table)
+
+        # bulk_create cannot write the parent rows of a child model
+        if meta.parents:
+            for item in batch:
+                item.save(using=self.database)
+
+            return
+
+        manager = model._base_manager.using(self.database)
+
+        keys = [item.object.pk for item in batch
+                if item.object.pk is not None]
+
+        existing = set(manager.filter(pk__in=keys).values_list(
+            'pk', flat=True)) if keys else set()
+
+        created = [item.object for item in batch
+                   if item.object.pk not in existing]
+        updated = [item.object for item in batch
+                   if item.object.pk in existing]
+
+        if created:
+            manager.bulk_create(created, batch_size=self.batch_size)
+
+        if updated:
+            manager.bulk_update(
+                updated, fields=[field.name for field in meta.concrete_fields
+                                 if not field.primary_key],
+                batch_size=self.batch_size)
+
+        for field in meta.many_to_many:
+            self._set_related(field, batch, existing)
+
+    def _drop_indexes(self, table: str) -> None:
+        """
+        Drop the secondary indexes of a table the first time it is written
+
+        :param table: the name of the table
+        :return: None
+        """
+        if not self._importer or table in self._dropped:
+            return
+
+        self._dropped[table] = self._importer.secondary_indexes(
+            self._connection, table)
+
+        with self._connection.cursor() as cursor:
+            for name, _ in self._dropped[table]:
+                cursor.execute(self._importer.drop_index_sql(
+                    self._connection, table, name))
+
+    def _rebuild_indexes(self) -> None:
+        """
+        Create the indexes dropped by _drop_indexes again
+
+        :return: None
+        """
+        if not self._dropped:
+            return
+
+        dropped, self._dropped = self._dropped, {}
+        start = time.perf_counter()
+
+        with self._connection.cursor() as cursor:
+            for indexes in dropped.values():
+                for _, sql in indexes:
+                    cursor.execute(sql)
+
+        log.get_logger('json-import').info(
+            'Rebuilt {} indexes on {} tables in {:.1f}s'.format(
+                sum(len(indexes) for indexes in dropped.values()),
+                len(dropped), time.perf_counter() - start))
+
+    def _set_related(self, field, batch: list, existing: set) -> None:
+        """
+        Replace the related rows of a many-to-many field for a batch
+
+        :param field: the many-to-many field
+        :param batch: the deserialized objects
+        :param existing: the primary keys of objects that were already stored
+        :return: None
+        """
+        items = [item for item in batch
+                 if item.m2m_data and field.name in item.m2m_data]
+
+        if not items:
+            return
+
+        through = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(
+            field.m2m_reverse_field_name()).attname
+        manager = through._base_manager.using(self.database)
+
+        stale = [item.object.pk for item in items
+                 if item.object.pk in existing]
+
+        if stale:
+            manager.filter(**{'{}__in'.format(source): stale}).delete()
+
+        manager.bulk_create(
+            [through(**{source: item.object.pk, target: related})
+             for item in items for related in item.m2m_data[field.name]],
+            batch_size=self.batch_size)
+
+
+@contextlib.contextmanager
+def open_member(zf: zipfile.ZipFile, name: str,
+                 compression: str) -> Iterator[BinaryIO]:
+    """
+    Open a shard in a zip file for reading, decompressing zstd shards
+
+    :param zf: the zip file
+    :param name: the name of the shard
+    :param compression: the compression of the shards
+    :return: a context manager of a readable binary stream
+    """
+    with zf.open(name) as member:
+        if compression != 'zstd':
+            yield member
+            return
+
+        require_zstandard()
+
+        with zstandard.ZstdDecompressor().stream_reader(member) as reader:
+            yield io.BufferedReader(reader)
+
+
+@contextlib.contextmanager
+def read_source(source: dict) -> Iterator[Iterable[dict]]:
+    """
+    Read the objects of a fixture, a shard or a file of objects
+
+    :param source: a dictionary of the 'path' of a file, the 'member' of a zip file at that path to read (if any), its 'format' ('json', 'objects' for one fixture object per line, or one of ROW_FORMATS) and its 'compression'
+    :return: a context manager of an iterable of dictionaries of the 'model', 'pk' and 'fields'
+    """
+    with contextlib.ExitStack() as stack:
+        if source.get('member'):
+            zf = stack.enter_context(zipfile.ZipFile(source['path']))
+            in_file = stack.enter_context(open_member(
+                zf, source['member'], source.get('compression', 'deflate')))
+        else:
+            in_file = stack.enter_context(Path(source['path']).open('rb'))
+
+        if source['format'] in ROW_FORMATS:
+            yield read_rows(in_file, source['format'])
+        elif source['format'] == 'objects':
+            yield (json.loads(line) for line in in_file if line.strip())
+        else:
+            yield iter_fixture(stack.enter_context(
+                io.TextIOWrapper(in_file, encoding='utf-8')))
+
+
+def model_dependencies(labels: Iterable[str]) -> dict[str, set[str]]:
+    """
+    Find the models that each model refers to with a relation
+
+    :param labels: the labels of the models to consider, e.g. auth.user
+    :return: a dictionary of each label to the labels (of those given) that its foreign keys, one-to-one and many-to-many fields point to
+    """
+    labels = set(labels)
+    graph = {}
+
+    for label in labels:
+        meta = apps.get_model(label)._meta
+
+        related = [field.remote_field.model for field
+                   in list(meta.concrete_fields) + list(meta.many_to_many)
+                   if field.is_relation]
+
+        graph[label] = {model._meta.label_lower for model in related
+                        if model._meta.label_lower in labels} - {label}
+
+    return graph
+
+
+def plan_units(graph: dict[str, set[str]]) -> dict[frozenset, set[frozenset]]:
+    """
+    Group models into units that can be loaded in topological order
+
+    Each model is a unit of its own unless it is part of a cycle of
+    references, in which case the whole cycle is loaded together.
+
+    :param graph: the result of model_dependencies
+    :return: a dictionary of each unit (a frozenset of labels) to the units that must be loaded before it
+    """
+    unit_of = {label: frozenset([label]) for label in graph}
+
+    while True:
+        units = {}
+
+        for label, dependencies in graph.items():
+            units.setdefault(unit_of[label], set()).update(
+                unit_of[dependency] for dependency in dependencies
+                if unit_of[dependency] != unit_of[label])
+
+        try:
+            TopologicalSorter(units).prepare()
+
+            return units
+        except CycleError as error:
+            merged = frozenset().union(*error.args[1])
+
+            for label in merged:
+                unit_of[label] = merged
+
+
+def import_workers(database: str, workers: int) -> int:
+    """
+    The number of processes to load models with
+
+    Each worker commits its own units, which a transaction that is already
+    open could neither roll back nor see, and a worker waiting on a row lock
+    held by that transaction would never be released. Inside a transaction,
+    models are therefore loaded in a single process.
+
+    :param database: the database alias
+    :param workers: the number of processes asked for (0 for every core)
+    :return: the number of processes to use
+    """
+    workers = workers if workers else multiprocessing.cpu_count()
+
+    # SQLite only allows one writer at a time
+    if workers > 1 and connections[database].vendor == 'sqlite':
+        log.get_logger('json-import').info(
+            'SQLite databases are loaded in a single process')
+
+        return 1
+
+    if workers > 1 and connections[database].in_atomic_block:
+        log.get_logger('json-import').warning(
+            'Models are loaded in a single process inside a transaction')
+
+        return 1
+
+    return workers
+
+
+def _load_unit(task: dict) -> int:
+    """
+    Load the sources of one unit of models in a transaction of its own
+
+    :param task: a dictionary of the 'database', the 'batch_size', whether to 'defer_indexes' and the 'sources' to read
+    :return: the number of objects loaded
+    """
+    with transaction.atomic(using=task['database']), \
+            BulkLoader(database=task['database'],
+                       batch_size=task['batch_size'],
+                       defer_indexes=task['defer_indexes']) as loader:
+        for source in task['sources']:
+            with read_source(source) as objects:
+                loader.load(objects)
+
+    return loader.count
+
+
+def load_models(sources: dict[str, list[dict]],
+                database: str = DEFAULT_DB_ALIAS, workers: int = 1,
+                batch_size: int = 5000, defer_indexes: bool = False) -> int:
+    """
+    Load the objects of several models in the order of their dependencies
+
+    Models are grouped into units by plan_units. With one worker, every unit
+    is loaded in topological order by a single BulkLoader in the current
+    transaction. With more, each unit is loaded as soon as the units it
+    depends on have committed, on a pool of processes that each have their
+    own connection and commit each unit in their own transaction, so the
+    restore takes as long as its longest chain of dependent models rather
+    than the sum of them. A parallel load is therefore not atomic, and is
+    only run outside a transaction (see import_workers).
+
+    :param sources: a dictionary of model label to the sources (see read_source) of its objects
+    :param database: the database alias
+    :param workers: the number of worker processes (0 uses every core)
+    :param batch_size: the most objects inserted in one statement
+    :param defer_indexes: whether to drop secondary indexes while loading and rebuild them afterwards
+    :return: the number of objects loaded
+    """
+    workers = import_workers(database=database, workers=workers)
+    units = plan_units(model_dependencies(sources))
+
+    def task(unit: frozenset) -> dict:
+        return {'database': database, 'batch_size': batch_size,
+                'defer_indexes': defer_indexes,
+                'sources': [source for label in sorted(unit)
+                            for source in sources[label]]}
+
+    if workers <= 1:
+        with BulkLoader(database=database, batch_size=batch_size,
+                        defer_indexes=defer_indexes) as loader:
+            for unit in TopologicalSorter(units).static_order():
+                for source in task(unit)['sources']:
+                    with read_source(source) as objects:
+                        loader.load(objects)
+
+        return loader.count
+
+    logger = log.get_logger('json-import')
+    start = time.perf_counter()
+    sorter = TopologicalSorter(units)
+    sorter.prepare()
+
+    pending = {}
+    total = 0
+
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=detach_connection, initargs=(database,)) as executor:
+        while sorter.is_active():
+            for unit in sorter.get_ready():
+                pending[executor.submit(_load_unit, task(unit))] = unit
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                total += future.result()
+                sorter.done(pending.pop(future))
+
+    logger.info('Loaded {} objects of {} models in {} units on {} workers '
+                'in {:.1f}s'.format(total, len(sources), len(units), workers,
+                                    time.perf_counter() - start))
+
+    return total
+
+
+def split_fixture(input_file: Path,
+                  output_directory: str) -> dict[str, list[dict]]:
+    """
+    Split a fixture into a file of objects per model
+
+    :param input_file: the fixture
+    :param output_directory: the directory to write the files to
+    :return: a dictionary of model label to sources for load_models
+    """
+    sources = {}
+
+    with Path(input_file).open('r', encoding='utf-8') as in_file, \
+            contextlib.ExitStack() as stack:
+        files = {}
+
+        for item in iter_fixture(in_file):
+            label = item['model'].lower()
+
+            if label not in files:
+                path = Path(output_directory) / '{:05d}.objects'.format(
+                    len(files))
+                files[label] = stack.enter_context(path.open('wb'))
+                sources[label] = [{'path': str(path), 'format': 'objects'}]
+
+            files[label].write(json.dumps(item).encode() + b'\n')
+
+    return sources
+
+
+def import_json_stream(input_file: Path, database: str = DEFAULT_DB_ALIAS,
+                       batch_size: int = 5000, workers: int = 1,
+                       defer_indexes: bool = False) -> int:
+    """
+    Load a JSON fixture with BulkLoader without reading it all into memory
+
+    With more than one worker, the fixture is first split into a file per
+    model, which load_models loads in parallel.
+
+    :param input_file: the fixture written by dumpdata or export_json_fast
+    :param database: the database alias
+    :param batch_size: the most objects inserted in one statement
+    :param workers: the number of worker processes (0 uses every core)
+    :param defer_indexes: whether to drop secondary indexes while loading and rebuild them afterwards
+    :return: the number of objects loaded
+    """
+    if import_workers(database=database, workers=workers) > 1:
+        with tempfile.TemporaryDirectory() as output_directory:
+            return load_models(
+                sources=split_fixture(input_file=input_file,
+                                      output_directory=output_directory),
+                database=database, workers=workers, batch_size=batch_size,
+                defer_indexes=defer_indexes)
+
+    with Path(input_file).open('r', encoding='utf-8') as in_file, \
+            BulkLoader(database=database, batch_size=batch_size,
+                       defer_indexes=defer_indexes) as loader:
+        return loader.load(iter_fixture(in_file))
+
+
+def _delete_keys(label: str, keys: dict, database: str) -> int:
+    """
+    Delete the rows of a model whose keys an incremental export lists
+
+    :param label: the model label
+    :param keys: a dictionary of 'ranges' or 'keys'
+    :param database: the database alias
+    :return: the number of rows of the model that were deleted
+    """
+    model = apps.get_model(label)
+    queryset = model._base_manager.using(database)
+    deleted = 0
+
+    selections = [Q(pk__gte=start, pk__lte=end)
+                  for start, end in keys.get('ranges', [])]
+
+    values = keys.get('keys', [])
+    selections += [Q(pk__in=values[offset:offset + _DELETE_BATCH_SIZE])
+                   for offset in range(0, len(values), _DELETE_BATCH_SIZE)]
+
+    for selection in selections:
+        _, counts = queryset.filter(selection).delete()
+        deleted += counts.get(model._meta.label, 0)
+
+    return deleted
+
+
+def _extract_shard(zf: zipfile.ZipFile, name: str, compression: str,
+                   shard_directory: str) -> str:
+    """
+    Extract a JSON shard to a file that loaddata can read
+
+    :param zf: the zip file
+    :param name: the name of the shard
+    :param compression: the compression of the shards
+    :param shard_directory: the directory to extract to
+    :return: the path of the extracted fixture
+    """
+    if compression != 'zstd':
+        return zf.extract(name, shard_directory)
+
+    path = Path(shard_directory) / Path(name).with_suffix('').name
+
+    with open_member(zf, name, compression) as in_file, \
+            path.open('wb') as out_file:
+        shutil.copyfileobj(in_file, out_file)
+
+    return str(path)
+
+
+def import_json_shards(input_file: Path, database: str = DEFAULT_DB_ALIAS,
+                       dry_run: bool = False,
+                       delta_files: list | None = None,
+                       engine: str = 'loaddata',
+                       batch_size: int = 5000, workers: int = 1,
+                       defer_indexes: bool = False) -> int:
+    """
+    Load the shards of a sharded JSON export
+
+    With the 'loaddata' engine, the JSON shards of each export are passed to
+    a single loaddata call, so references between shards are only checked
+    once everything has been loaded. With the 'bulk' engine, with more than
+    one worker or deferred indexes, and always for shards in a row format,
+    the shards are streamed in by load_models instead.
+    Incremental exports in delta_files are then applied in order, loading
+    their changed rows and deleting the rows that they list. The deletions of
+    each export are committed on their own before the next export is loaded,
+    so that workers never wait on rows locked by an open transaction.
+
+    :param input_file: the zip file written by export_json_shards or export_json_incremental
+    :param database: the database alias
+    :param dry_run: whether to operate in dry run mode
+    :param delta_files: incremental exports to apply in order after the first
+    :param engine: 'loaddata' or 'bulk' for BulkLoader
+    :param batch_size: the most objects inserted in one statement by BulkLoader
+    :param workers: the number of processes to load models on (0 uses every core)
+    :param defer_indexes: whether BulkLoader drops secondary indexes while loading and rebuilds them afterwards
+    :return: the number of objects in the shards
+    """
+    logger = log.get_logger('json-import')
+    workers = import_workers(database=database, workers=workers)
+    parent = None
+    total = 0
+
+    for export in [input_file] + list(delta_files if delta_files else []):
+        with tempfile.TemporaryDirectory() as shard_directory, \
+                zipfile.ZipFile(export) as zf:
+            index = json.loads(zf.read(SHARD_INDEX_MEMBER))
+            index.setdefault('format', 'json')
+            index.setdefault('compression', 'deflate')
+            count = sum(shard['count'] for shard in index['shards'])
+            deleted = index.get('deleted', {})
+            total += count
+
+            if parent and index.get('parent') != parent:
+                logger.warning('{} does not follow on from the previous '
+                               'export in the chain'.format(export))
+
+            parent = index.get('id')
+
+            if dry_run:
+                logger.info('Would load {} objects from {} shards and delete '
+                            'rows of {} models'.format(
+                                count, len(index['shards']), len(deleted)))
+                continue
+
+            if index['format'] in ROW_FORMATS or engine == 'bulk' or \
+                    workers > 1 or defer_indexes:
+                sources = {}
+
+                for shard in index['shards']:
+                    sources.setdefault(shard['model'], []).append(
+                        {'path': str(export), 'member': shard['name'],
+                         'format': index['format'],
+                         'compression': index['compression']})
+
+                load_models(sources=sources, database=database,
+                            workers=workers, batch_size=batch_size,
+                            defer_indexes=defer_indexes)
+            elif index['shards']:
+                call_command('loaddata', *[_extract_shard(
+                    zf=zf, name=shard['name'],
+                    compression=index['compression'],
+                    shard_directory=shard_directory)
+                    for shard in index['shards']],
+                    database=database, verbosity=0)
+
+            with transaction.atomic(using=database):
+                removed = sum(_delete_keys(label=label, keys=keys,
+                                           database=database)
+                              for label, keys in deleted.items())
+
+            logger.info('Loaded {} objects from {} shards and deleted {} '
+                        'rows of {}'.format(count, len(index['shards']),
+                                            removed, export))
+
+    return total
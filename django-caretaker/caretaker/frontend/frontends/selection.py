@@ -0,0 +1,83 @@
+from django.apps import apps
+from django.db import router
+
+
+def _matches(model, entries: set[str]) -> bool:
+    """
+    Whether an entry names a model's app, the model itself or its table
+
+    :param model: the model class
+    :param entries: lower case app labels (e.g. auth), model labels (e.g. auth.user) and table names (e.g. auth_user)
+    :return: True if any entry names the model
+    """
+    meta = model._meta
+
+    return bool(entries & {meta.app_label, meta.label_lower,
+                           meta.db_table.lower()})
+
+
+def select_models(database: str, include: list[str] | None = None,
+                  exclude: list[str] | None = None) -> list:
+    """
+    The concrete models that dumpdata would export from a database
+
+    Entries in include and exclude can name an app (e.g. sessions), a model
+    (e.g. admin.logentry) or a table (e.g. django_session), in any case.
+
+    :param database: the database alias
+    :param include: if not empty, only the models that these entries name
+    :param exclude: entries naming models to leave out
+    :return: a list of model classes
+    """
+    include = {entry.lower() for entry in (include if include else [])}
+    exclude = {entry.lower() for entry in (exclude if exclude else [])}
+
+    return [model for app_config in apps.get_app_configs()
+            if app_config.models_module is not None
+            for model in app_config.get_models()
+            if not model._meta.proxy
+            and router.allow_migrate_model(database, model)
+            and (not include or _matches(model, include))
+            and not _matches(model, exclude)]
+
+
+def model_tables(models: list) -> list[str]:
+    """
+    The tables that hold the rows of models, including many-to-many tables
+
+    :param models: the model classes
+    :return: a sorted list of table names
+    """
+    tables = set()
+
+    for model in models:
+        tables.add(model._meta.db_table)
+
+        tables.update(field.remote_field.through._meta.db_table
+                      for field in model._meta.local_many_to_many
+                      if field.remote_field.through._meta.auto_created)
+
+    return sorted(tables)
+
+
+def tier_exclusions(tiers: dict[str, list[str]],
+                    selected: list[str] | None = None) -> list[str]:
+    """
+    The entries to exclude from a backup because their tier was not selected
+
+    Models in a retention tier are only backed up by runs that select the
+    tier, so that large volatile tables can be backed up less often.
+
+    :param tiers: a dictionary of tier name to the entries (as for select_models) in the tier
+    :param selected: the names of the tiers to back up in this run
+    :raises KeyError: if a selected tier is not defined
+    :return: a list of entries
+    """
+    selected = selected if selected else []
+
+    for name in selected:
+        if name not in tiers:
+            raise KeyError(name)
+
+    return [entry for name, entries in tiers.items()
+            if name not in selected for entry in entries]
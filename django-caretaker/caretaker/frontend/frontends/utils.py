@@ -1,11 +1,18 @@
+import codecs
 import contextlib
+import errno
 import importlib
-import select
+import io
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, TextIO
 
 from django.db.backends.base.base import BaseDatabaseWrapper
 
+from caretaker.utils import file
+
 
 class DatabasePatcher:
     @staticmethod
@@ -61,49 +68,159 @@ class DatabasePatcher:
 
 class BufferedProcessReader:
     """
-    A class to read files in a neatly buffered way that can handle large output
+    A class to copy the output of a process to a file or stdout in bulk
+
+    On Linux, output is spliced from the pipe to a file without passing
+    through Python at all. Elsewhere, and for targets that cannot be spliced
+    to, whatever the pipe holds is copied in chunks of up to buffer_size
+    bytes. Output to stdout is written as bytes to its binary buffer, unless
+    stdout has been replaced by a text stream, in which case it is decoded
+    as UTF-8 without splitting multibyte characters. Compressed output is
+    compressed in chunks as it is read, and can only be written as bytes.
+    If the output cannot be written, the process is killed rather than left
+    blocked on a full pipe.
     """
 
     proc: subprocess.Popen = None
 
+    # the most bytes moved by one system call
+    buffer_size: int = 1024 * 1024
+
     def __init__(self, process: subprocess.Popen):
         self.proc = process
 
-    def handle_process(self, output_filename: str = '-'):
+    def handle_process(self, output_filename: str | BinaryIO = '-',
+                       compression: str = 'none', level: int | None = None,
+                       threads: int = 0) -> int:
         """
         Process the output from an external command
 
-        :param output_filename: the output filename or '-' for stdout
-        :return:
+        :param output_filename: the output filename, '-' for stdout or a writable file-like object
+        :param compression: one of SQL_COMPRESSIONS in caretaker.utils.file
+        :param level: the compression level (None uses the default for the compression)
+        :param threads: the number of zstd compression threads
+        :raises ValueError: if compressed output would be written to a text stream
+        :return: the number of bytes copied, before compression
+        """
+        with smart_open(output_filename) as out_file, \
+                self._killed_on_error():
+            if out_file is sys.stdout:
+                out_file.flush()
+                out_file = getattr(out_file, 'buffer', out_file)
+
+            if isinstance(out_file, io.TextIOBase):
+                if compression != 'none':
+                    raise ValueError('Compressed output cannot be written to '
+                                     'a text stream')
+
+                copied = self._copy_text(out_file)
+            elif compression != 'none':
+                with file.compressed_writer(out_file, compression=compression,
+                                            level=level,
+                                            threads=threads) as writer:
+                    copied = self._copy_chunks(writer)
+            else:
+                copied = self._copy(out_file)
+
+            out_file.flush()
+
+        self.proc.wait()
+
+        return copied
+
+    @contextlib.contextmanager
+    def _killed_on_error(self):
+        """
+        Stop the process if its output cannot be written, so it does not block
+
+        :return: None
+        """
+        try:
+            yield
+        except BaseException:
+            self.proc.kill()
+            self.proc.wait()
+            raise
+
+    def _copy(self, out_file: BinaryIO) -> int:
+        """
+        Copy the output to a binary file, splicing it if possible
+
+        :param out_file: the binary file to write to
+        :return: the number of bytes copied
+        """
+        copied = 0
+
+        try:
+            target = out_file.fileno() if hasattr(os, 'splice') else None
+        except (OSError, ValueError):
+            target = None
+
+        if target is not None:
+            out_file.flush()
+
+            try:
+                while chunk := os.splice(self.proc.stdout.fileno(), target,
+                                         self.buffer_size):
+                    copied += chunk
+
+                return copied
+            except OSError as error:
+                # some targets, such as terminals, cannot be spliced to
+                if copied or error.errno not in (errno.EINVAL, errno.ENOSYS,
+                                                 errno.EBADF):
+                    raise
+
+        return self._copy_chunks(out_file)
+
+    def _copy_chunks(self, out_file: BinaryIO) -> int:
+        """
+        Copy the output to a binary file in chunks
+
+        :param out_file: the binary file to write to
+        :return: the number of bytes copied
         """
-        with smart_open(output_filename) as out_file:
-            reached_end = False
-            while (self.proc.returncode is None) or (not reached_end):
-                self.proc.poll()
-                reached_end = False
-
-                select.select([self.proc.stdout], [], [], float(1.0))
-
-                data = self.proc.stdout.read(1024)
-                if len(data) == 0:  # Read of zero bytes means EOF
-                    reached_end = True
-                else:
-                    # pass it to the buffer
-                    if out_file is sys.stdout:
-                        out_file.write(data.decode('utf-8'))
-                    else:
-                        out_file.write(data)
-                    out_file.flush()
+        copied = 0
+
+        while chunk := self.proc.stdout.read1(self.buffer_size):
+            out_file.write(chunk)
+            copied += len(chunk)
+
+        return copied
+
+    def _copy_text(self, out_file: TextIO) -> int:
+        """
+        Copy the output to a text stream, decoding it as UTF-8
+
+        :param out_file: the text stream to write to
+        :return: the number of bytes copied
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        copied = 0
+
+        while chunk := self.proc.stdout.read1(self.buffer_size):
+            out_file.write(decoder.decode(chunk))
+            copied += len(chunk)
+
+        out_file.write(decoder.decode(b'', final=True))
+
+        return copied
 
 
 @contextlib.contextmanager
-def smart_open(filename: str = None):
+def smart_open(filename: str | BinaryIO = None):
     """
     Opens a file for binary writing or stdout for text writing
 
-    :param filename: the filename to open or "-" for stdout
+    A writable file-like object is passed through and left open.
+
+    :param filename: the filename to open, "-" for stdout or a writable file-like object
     :return: a file handle or stdout
     """
+    if hasattr(filename, 'write'):
+        yield filename
+        return
+
     if filename and filename != '-':
         fh = open(filename, 'wb')
     else:
@@ -115,6 +232,46 @@ def smart_open(filename: str = None):
             fh.close()
 
 
+@contextlib.contextmanager
+def stream_path(out_file: BinaryIO):
+    """
+    A path for code that can only write to a filename, copied to a stream
+
+    The path is the write end of a pipe, which a thread drains into out_file
+    as it is written. If out_file raises, the pipe is still drained so that
+    the writer is not blocked, and the error is raised once the path is
+    released.
+
+    :param out_file: the writable file-like object to copy to
+    :return: a path to write to
+    """
+    read_fd, write_fd = os.pipe()
+
+    def copy() -> None:
+        error = None
+
+        with open(read_fd, 'rb', buffering=0) as pipe:
+            while chunk := pipe.read(BufferedProcessReader.buffer_size):
+                if error is None:
+                    try:
+                        out_file.write(chunk)
+                    except Exception as exception:
+                        error = exception
+
+        if error is not None:
+            raise error
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        copying = executor.submit(copy)
+
+        try:
+            yield '/dev/fd/{}'.format(write_fd)
+        finally:
+            os.close(write_fd)
+
+        copying.result()
+
+
 def ternary_switch(primary: object, secondary: object) -> object:
     """
     Return primary if not secondary
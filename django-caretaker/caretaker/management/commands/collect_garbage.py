@@ -0,0 +1,43 @@
+import djclick as click
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import BackendNotFoundError
+from caretaker.frontend.abstract_frontend import FrontendFactory
+from caretaker.frontend.abstract_frontend import FrontendNotFoundError
+from caretaker.utils import log
+
+
+@click.command()
+@click.option('--archive-file',
+              help='The archive filename the manifests were pushed for',
+              type=str, default='media.zip')
+@click.option('--backend-name', '-b',
+              help='The name of the backend to use',
+              type=str)
+@click.option('--frontend-name', '-f',
+              help='The name of the frontend to use',
+              type=str)
+@click.option('--dry-run', '-d', is_flag=True, help="Run in dry mode.")
+def command(archive_file: str, backend_name: str, frontend_name: str,
+            dry_run: bool = False) -> None:
+    """
+    Deletes content-addressed blobs that no stored manifest references
+    """
+    logger = log.get_logger('')
+
+    try:
+        frontend, backend = FrontendFactory.get_frontend_and_backend(
+            backend_name=backend_name,
+            frontend_name=frontend_name,
+            raise_on_none=True
+        )
+
+        frontend.collect_garbage(backend=backend,
+                                 bucket_name=settings.CARETAKER_BACKUP_BUCKET,
+                                 archive_file=archive_file, dry_run=dry_run)
+    except BackendNotFoundError:
+        logger.error('Unable to find a valid backend')
+    except FrontendNotFoundError:
+        logger.error('Unable to find a valid frontend')
+    except NotImplementedError as nie:
+        logger.error(str(nie))
@@ -32,12 +32,23 @@ from caretaker.utils import log
 @click.option('--archive-file',
               help='The archive filename to use',
               type=str, default='media.zip')
+@click.option('--include', multiple=True,
+              help='An app, model or table to back up, leaving out the rest',
+              type=str)
+@click.option('--exclude', multiple=True,
+              help='An app, model or table to leave out of the backup',
+              type=str)
+@click.option('--tier', multiple=True,
+              help='A retention tier from CARETAKER_BACKUP_TIERS to back up',
+              type=str)
 def command(output_directory: str, additional_files: tuple,
             frontend_name: str = '', sql_mode: bool = False,
             database: str = DEFAULT_DB_ALIAS, alternative_binary: str = '',
             alternative_arguments: str = '',
             data_file: str = 'data.json',
-            archive_file: str = 'media.zip') -> None:
+            archive_file: str = 'media.zip',
+            include: tuple = (), exclude: tuple = (),
+            tier: tuple = ()) -> None:
     """
     Create a local backup archive in the specified OUTPUT-DIRECTORY
     """
@@ -56,7 +67,9 @@ def command(output_directory: str, additional_files: tuple,
                                    sql_mode=sql_mode, archive_file=archive_file,
                                    data_file=data_file,
                                    alternative_binary=alternative_binary,
-                                   alternative_arguments=alternative_arguments)
+                                   alternative_arguments=alternative_arguments,
+                                   include=list(include),
+                                   exclude=list(exclude), tiers=list(tier))
 
         except FrontendNotFoundError:
             logger.error('Unable to find a valid frontend')
@@ -1,5 +1,5 @@
 import djclick as click
-from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db import DEFAULT_DB_ALIAS
 
 from caretaker.frontend.abstract_frontend import FrontendFactory, \
     FrontendNotFoundError
@@ -20,36 +20,45 @@ from caretaker.utils import log, file
               help='The alternative arguments to use',
               type=str, default='')
 @click.option('--dry-run', '-d', is_flag=True, help="Run in dry mode.")
+@click.option('--delta', multiple=True,
+              help='An incremental archive or JSON export to replay after '
+                   'INPUT-FILE (repeat in chain order)',
+              type=str)
+@click.option('--skip-unchanged', is_flag=True,
+              help='Leave media files that already match the archive')
 def command(input_file: str, frontend_name: str,
             database: str = DEFAULT_DB_ALIAS,
             alternative_binary: str = '', alternative_arguments: str = '',
-            dry_run: bool = False) -> None:
+            dry_run: bool = False, delta: tuple = (),
+            skip_unchanged: bool = False) -> None:
     """
     Imports INPUT-FILE back into the system. Warning: overwrites database and FS
     """
 
     database = database if database else DEFAULT_DB_ALIAS
 
-    with transaction.atomic(using=database):
-        logger = log.get_logger('command')
+    logger = log.get_logger('command')
 
-        if dry_run:
-            logger.info('Operating in dry-run mode. Nothing will be changed.')
+    if dry_run:
+        logger.info('Operating in dry-run mode. Nothing will be changed.')
 
-        try:
-            frontend = FrontendFactory.get_frontend(frontend_name=frontend_name,
-                                                    raise_on_none=True)
+    try:
+        frontend = FrontendFactory.get_frontend(frontend_name=frontend_name,
+                                                raise_on_none=True)
 
-            alternative_arguments = alternative_arguments.split(' ') \
-                if alternative_arguments else None
+        alternative_arguments = alternative_arguments.split(' ') \
+            if alternative_arguments else None
 
-            frontend.import_file(
-                database=database, alternative_binary=alternative_binary,
-                alternative_args=alternative_arguments, input_file=input_file,
-                raise_on_error=False, dry_run=dry_run
-            )
+        # not run in a transaction, as the frontend opens its own and a
+        # parallel JSON load must not be nested in one
+        frontend.import_file(
+            database=database, alternative_binary=alternative_binary,
+            alternative_args=alternative_arguments, input_file=input_file,
+            raise_on_error=False, dry_run=dry_run,
+            delta_files=list(delta), skip_unchanged=skip_unchanged
+        )
 
-        except FrontendNotFoundError:
-            logger.error('Unable to find a valid frontend')
-        except PermissionError:
-            logger.error('Unable to open output file {}'.format(input_file))
+    except FrontendNotFoundError:
+        logger.error('Unable to find a valid frontend')
+    except PermissionError:
+        logger.error('Unable to open output file {}'.format(input_file))
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import djclick as click
+import humanize
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import BackendNotFoundError
+from caretaker.frontend.abstract_frontend import FrontendNotFoundError
+from caretaker.frontend.abstract_frontend import FrontendFactory
+from caretaker.utils import log
+
+
+@click.command()
+@click.argument('remote-key', default='media.zip')
+@click.option('--backup-version', '-v',
+              help='The version of the archive to list '
+                   '(defaults to the latest)',
+              type=str, default='')
+@click.option('--backend-name', '-b',
+              help='The name of the backend to use',
+              type=str)
+@click.option('--frontend-name', '-f',
+              help='The name of the frontend to use',
+              type=str)
+def command(remote_key: str, backup_version: str, backend_name: str,
+            frontend_name: str) -> None:
+    """
+    Lists the files inside a remote version of REMOTE-KEY (an archive)
+    """
+    logger = log.get_logger('')
+
+    try:
+        frontend, backend = FrontendFactory.get_frontend_and_backend(
+            backend_name=backend_name,
+            frontend_name=frontend_name,
+            raise_on_none=True
+        )
+
+        results = frontend.list_archive(
+            backend=backend, remote_key=remote_key,
+            bucket_name=settings.CARETAKER_BACKUP_BUCKET,
+            backup_version=backup_version)
+
+        for item in results if results else []:
+            logger.info('{} [{}] {}'.format(
+                datetime.fromtimestamp(item['mtime']),
+                humanize.naturalsize(item['size']),
+                item['path']
+            ))
+    except BackendNotFoundError:
+        logger.error('Unable to find a valid backend')
+    except FrontendNotFoundError:
+        logger.error('Unable to find a valid frontend')
@@ -0,0 +1,47 @@
+import djclick as click
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import BackendNotFoundError
+from caretaker.frontend.abstract_frontend import FrontendFactory
+from caretaker.frontend.abstract_frontend import FrontendNotFoundError
+from caretaker.utils import log
+
+
+@click.command()
+@click.option('--backup-version', '-v',
+              help='The version of the content manifest to restore '
+                   '(defaults to the latest)',
+              type=str, default='')
+@click.option('--archive-file',
+              help='The archive filename the manifest was pushed for',
+              type=str, default='media.zip')
+@click.option('--backend-name', '-b',
+              help='The name of the backend to use',
+              type=str)
+@click.option('--frontend-name', '-f',
+              help='The name of the frontend to use',
+              type=str)
+@click.option('--dry-run', '-d', is_flag=True, help="Run in dry mode.")
+def command(backup_version: str, archive_file: str, backend_name: str,
+            frontend_name: str, dry_run: bool = False) -> None:
+    """
+    Rebuilds content-addressed media from its manifest. Warning: overwrites FS
+    """
+    logger = log.get_logger('')
+
+    try:
+        frontend, backend = FrontendFactory.get_frontend_and_backend(
+            backend_name=backend_name,
+            frontend_name=frontend_name,
+            raise_on_none=True
+        )
+
+        frontend.restore_content(backend=backend,
+                                 bucket_name=settings.CARETAKER_BACKUP_BUCKET,
+                                 archive_file=archive_file,
+                                 backup_version=backup_version,
+                                 dry_run=dry_run)
+    except BackendNotFoundError:
+        logger.error('Unable to find a valid backend')
+    except FrontendNotFoundError:
+        logger.error('Unable to find a valid frontend')
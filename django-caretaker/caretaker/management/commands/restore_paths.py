@@ -0,0 +1,49 @@
+import djclick as click
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import BackendNotFoundError
+from caretaker.frontend.abstract_frontend import FrontendFactory
+from caretaker.frontend.abstract_frontend import FrontendNotFoundError
+from caretaker.utils import log
+
+
+@click.command()
+@click.argument('patterns', nargs=-1, required=True)
+@click.option('--remote-key', '-r',
+              help='The remote key of the archive to restore from',
+              type=str, default='media.zip')
+@click.option('--backup-version', '-v',
+              help='The version of the archive to restore from '
+                   '(defaults to the latest)',
+              type=str, default='')
+@click.option('--backend-name', '-b',
+              help='The name of the backend to use',
+              type=str)
+@click.option('--frontend-name', '-f',
+              help='The name of the frontend to use',
+              type=str)
+@click.option('--dry-run', '-d', is_flag=True, help="Run in dry mode.")
+def command(patterns: tuple[str], remote_key: str, backup_version: str,
+            backend_name: str, frontend_name: str,
+            dry_run: bool = False) -> None:
+    """
+    Restores only the paths in a remote archive that match the given globs
+    """
+    logger = log.get_logger('')
+
+    try:
+        frontend, backend = FrontendFactory.get_frontend_and_backend(
+            backend_name=backend_name,
+            frontend_name=frontend_name,
+            raise_on_none=True
+        )
+
+        frontend.restore_paths(patterns=list(patterns), backend=backend,
+                               bucket_name=settings.CARETAKER_BACKUP_BUCKET,
+                               remote_key=remote_key,
+                               backup_version=backup_version,
+                               dry_run=dry_run)
+    except BackendNotFoundError:
+        logger.error('Unable to find a valid backend')
+    except FrontendNotFoundError:
+        logger.error('Unable to find a valid frontend')
@@ -35,12 +35,42 @@ from caretaker.utils import log
 @click.option('--archive-file',
               help='The archive filename to use',
               type=str, default='media.zip')
+@click.option('--incremental', '-i', is_flag=True,
+              help='Only archive files that changed since the last backup',
+              type=bool)
+@click.option('--content-addressed', is_flag=True,
+              help='Push media as deduplicated blobs instead of an archive',
+              type=bool)
+@click.option('--incremental-data', is_flag=True,
+              help='Only export rows that changed since the last backup',
+              type=bool)
+@click.option('--stream', is_flag=True,
+              help='Upload the archive while it is written instead of '
+                   'staging it on disk',
+              type=bool)
+@click.option('--stream-data', is_flag=True,
+              help='Upload the data file while it is dumped instead of '
+                   'staging it on disk',
+              type=bool)
+@click.option('--include', multiple=True,
+              help='An app, model or table to back up, leaving out the rest',
+              type=str)
+@click.option('--exclude', multiple=True,
+              help='An app, model or table to leave out of the backup',
+              type=str)
+@click.option('--tier', multiple=True,
+              help='A retention tier from CARETAKER_BACKUP_TIERS to back up',
+              type=str)
 def command(additional_files: tuple, backend_name: str,
             frontend_name: str, sql_mode: bool = False,
             database: str = DEFAULT_DB_ALIAS, alternative_binary: str = '',
             alternative_arguments: str = '',
             data_file: str = 'data.json',
-            archive_file: str = 'media.zip') -> None:
+            archive_file: str = 'media.zip',
+            incremental: bool = False, content_addressed: bool = False,
+            stream: bool = False, incremental_data: bool = False,
+            include: tuple = (), exclude: tuple = (),
+            tier: tuple = (), stream_data: bool = False) -> None:
     """
     Pushes LOCAL-FILE to the latest version of REMOTE-KEY
     """
@@ -62,7 +92,13 @@ def command(additional_files: tuple, backend_name: str,
                                 raise_on_error=True, sql_mode=sql_mode,
                                 archive_file=archive_file, data_file=data_file,
                                 alternative_binary=alternative_binary,
-                                alternative_arguments=alternative_arguments)
+                                alternative_arguments=alternative_arguments,
+                                incremental=incremental,
+                                stream_archive=stream,
+                                content_addressed=content_addressed,
+                                incremental_data=incremental_data,
+                                include=list(include), exclude=list(exclude),
+                                tiers=list(tier), stream_data=stream_data)
 
         except BackendNotFoundError:
             logger.error('Unable to find a valid backend')
@@ -0,0 +1,106 @@
+import shutil
+import tempfile
+
+import django
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import BackendFactory
+from caretaker.tests.frontend.django.backend.local.caretaker_test import \
+    AbstractDjangoLocalTest
+from caretaker.utils import file
+from caretaker.utils.manifest import content_key, hash_file
+
+
+class TestContentBackupDjangoLocal(AbstractDjangoLocalTest):
+    def setUp(self):
+        self.logger.info('Setup for content-addressed run_backup local')
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for content-addressed run_backup local')
+        pass
+
+    def test(self):
+        self.logger.info('Testing content-addressed run_backup local')
+
+        with tempfile.TemporaryDirectory() as bucket_store, \
+                tempfile.TemporaryDirectory() as media_directory:
+
+            settings.CARETAKER_LOCAL_STORE_DIRECTORY = bucket_store
+            settings.CARETAKER_BLOB_GRACE_PERIOD = 0
+            self.backend = BackendFactory.get_backend('Local')
+
+            media_directory = file.normalize_path(media_directory)
+
+            original = media_directory / 'original.txt'
+            duplicate = media_directory / 'nested' / 'duplicate.txt'
+            changing = media_directory / 'changing.txt'
+
+            duplicate.parent.mkdir()
+            original.write_text('the same')
+            duplicate.write_text('the same')
+            changing.write_text('first version')
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True,
+                                     content_addressed=True)
+
+            # identical files share a blob and no archive is pushed
+            self.assertEqual(
+                len(self.backend.list_blobs(bucket_name=self.bucket_name)), 2)
+            self.assertEqual(len(self.frontend.list_backups(
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend)), 0)
+
+            changing.write_text('second version')
+
+            manifest = self.frontend.push_content(
+                path_list=[media_directory], backend=self.backend,
+                bucket_name=self.bucket_name, raise_on_error=True)
+
+            # only the changed file adds a blob
+            self.assertEqual(
+                len(self.backend.list_blobs(bucket_name=self.bucket_name)), 3)
+            self.assertEqual(manifest['files'][str(changing)][2],
+                             hash_file(changing))
+
+            # every version of the manifest keeps its blobs alive
+            self.assertEqual(self.frontend.collect_garbage(
+                backend=self.backend, bucket_name=self.bucket_name), [])
+
+            # restore the latest tree from the manifest
+            shutil.rmtree(media_directory)
+
+            self.assertTrue(self.frontend.restore_content(
+                backend=self.backend, bucket_name=self.bucket_name,
+                raise_on_error=True))
+
+            self.assertEqual(original.read_text(), 'the same')
+            self.assertEqual(duplicate.read_text(), 'the same')
+            self.assertEqual(changing.read_text(), 'second version')
+
+            # once the oldest manifest is gone, its unique blob is collected
+            versions = self.frontend.list_backups(
+                remote_key=content_key(self.data_key),
+                bucket_name=self.bucket_name, backend=self.backend)
+            self.assertEqual(len(versions), 2)
+            versions[-1]['file_name'].unlink()
+
+            deleted = self.frontend.collect_garbage(
+                backend=self.backend, bucket_name=self.bucket_name,
+                dry_run=True)
+            self.assertEqual(len(deleted), 1)
+            self.assertEqual(
+                len(self.backend.list_blobs(bucket_name=self.bucket_name)), 3)
+
+            self.frontend.collect_garbage(backend=self.backend,
+                                          bucket_name=self.bucket_name)
+            self.assertEqual(
+                len(self.backend.list_blobs(bucket_name=self.bucket_name)), 2)
+            self.assertFalse(self.backend.has_blob(
+                bucket_name=self.bucket_name, digest=deleted[0]))
+
+            del settings.CARETAKER_BLOB_GRACE_PERIOD
@@ -0,0 +1,110 @@
+import shutil
+import tempfile
+import zipfile
+
+import django
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import BackendFactory
+from caretaker.tests.frontend.django.backend.local.caretaker_test import \
+    AbstractDjangoLocalTest
+from caretaker.utils import file
+from caretaker.utils.manifest import manifest_key, MANIFEST_MEMBER
+
+
+class TestIncrementalBackupDjangoLocal(AbstractDjangoLocalTest):
+    def setUp(self):
+        self.logger.info('Setup for incremental run_backup local')
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for incremental run_backup local')
+        pass
+
+    def test(self):
+        self.logger.info('Testing incremental run_backup local')
+
+        with tempfile.TemporaryDirectory() as bucket_store, \
+                tempfile.TemporaryDirectory() as media_directory, \
+                tempfile.TemporaryDirectory() as download_directory:
+
+            settings.CARETAKER_LOCAL_STORE_DIRECTORY = bucket_store
+            self.backend = BackendFactory.get_backend('Local')
+
+            media_directory = file.normalize_path(media_directory)
+            download_directory = file.normalize_path(download_directory)
+
+            first = media_directory / 'first.txt'
+            second = media_directory / 'second.txt'
+            third = media_directory / 'third.txt'
+
+            first.write_text('first')
+            second.write_text('second')
+
+            # the first run has no manifest to build on, so it is full
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     incremental=True)
+
+            # change one file, delete one file and add one file
+            first.unlink()
+            second.write_text('second, but longer')
+            third.write_text('third')
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     incremental=True)
+
+            # the manifest key is not listed alongside the archive
+            versions = self.frontend.list_backups(
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend)
+            self.assertEqual(len(versions), 2)
+
+            manifests = self.frontend.list_backups(
+                remote_key=manifest_key(self.data_key),
+                bucket_name=self.bucket_name, backend=self.backend)
+            self.assertEqual(len(manifests), 2)
+
+            # versions are sorted newest first
+            delta_file = self.frontend.pull_backup(
+                backup_version=versions[0]['version_id'],
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend,
+                out_file=download_directory / 'delta.zip')
+            base_file = self.frontend.pull_backup(
+                backup_version=versions[1]['version_id'],
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend,
+                out_file=download_directory / 'base.zip')
+
+            # the delta only holds the changed and added files
+            with zipfile.ZipFile(delta_file) as zf:
+                self.assertEqual(
+                    sorted(zf.namelist()),
+                    sorted([MANIFEST_MEMBER, str(second)[1:],
+                            str(third)[1:]]))
+
+            # restoring the base alone gives the original tree
+            shutil.rmtree(media_directory)
+
+            self.frontend.import_file(input_file=str(base_file),
+                                      raise_on_error=True)
+
+            self.assertEqual(first.read_text(), 'first')
+            self.assertEqual(second.read_text(), 'second')
+            self.assertFalse(third.exists())
+
+            # replaying the chain gives the latest tree
+            shutil.rmtree(media_directory)
+
+            self.frontend.import_file(input_file=str(base_file),
+                                      raise_on_error=True,
+                                      delta_files=[str(delta_file)])
+
+            self.assertFalse(first.exists())
+            self.assertEqual(second.read_text(), 'second, but longer')
+            self.assertEqual(third.read_text(), 'third')
@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+import django
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import BackendFactory
+from caretaker.tests.frontend.django.backend.local.caretaker_test import \
+    AbstractDjangoLocalTest
+from caretaker.utils import file
+
+
+class TestListArchiveDjangoLocal(AbstractDjangoLocalTest):
+    def setUp(self):
+        self.logger.info('Setup for list_archive local')
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for list_archive local')
+        pass
+
+    def test(self):
+        self.logger.info('Testing list_archive local')
+
+        with tempfile.TemporaryDirectory() as bucket_store, \
+                tempfile.TemporaryDirectory() as cache_directory, \
+                tempfile.TemporaryDirectory() as media_directory:
+
+            settings.CARETAKER_LOCAL_STORE_DIRECTORY = bucket_store
+            settings.CARETAKER_ARCHIVE_INDEX_CACHE = cache_directory
+            settings.CARETAKER_RANGE_BLOCK_SIZE = 64 * 1024
+            self.backend = BackendFactory.get_backend('Local')
+
+            media_directory = file.normalize_path(media_directory)
+
+            small_file = media_directory / 'small.txt'
+            small_file.write_text(self.test_contents)
+
+            # a large, incompressible file that must not be read
+            (media_directory / 'large.bin').write_bytes(
+                os.urandom(4 * 1024 * 1024))
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True)
+
+            members = self.frontend.list_archive(
+                remote_key=self.data_key, backend=self.backend,
+                bucket_name=self.bucket_name, raise_on_error=True)
+
+            members = {item['path']: item for item in members}
+
+            self.assertEqual(sorted(members),
+                             sorted([str(small_file),
+                                     str(media_directory / 'large.bin')]))
+            self.assertEqual(members[str(small_file)]['size'],
+                             len(self.test_contents))
+            self.assertAlmostEqual(members[str(small_file)]['mtime'],
+                                   small_file.stat().st_mtime, delta=2)
+
+            # the listing is cached by version, so it is still served once
+            # the archive itself has gone
+            self.assertEqual(len(os.listdir(
+                os.path.join(cache_directory, self.bucket_name))), 1)
+
+            version = self.backend.versions(bucket_name=self.bucket_name,
+                                            remote_key=self.data_key)[0]
+            os.remove(version['file_name'])
+
+            cached = self.frontend.list_archive(
+                remote_key=self.data_key, backend=self.backend,
+                bucket_name=self.bucket_name,
+                backup_version=version['version_id'], raise_on_error=True)
+
+            self.assertEqual({item['path'] for item in cached}, set(members))
+
+            del settings.CARETAKER_ARCHIVE_INDEX_CACHE
+            del settings.CARETAKER_RANGE_BLOCK_SIZE
+
+            # an archive that does not exist lists nothing
+            self.assertIsNone(self.frontend.list_archive(
+                remote_key='missing.zip', backend=self.backend,
+                bucket_name=self.bucket_name))
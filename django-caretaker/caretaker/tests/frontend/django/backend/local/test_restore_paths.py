@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+
+import django
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import BackendFactory
+from caretaker.tests.frontend.django.backend.local.caretaker_test import \
+    AbstractDjangoLocalTest
+from caretaker.utils import file
+
+
+class TestRestorePathsDjangoLocal(AbstractDjangoLocalTest):
+    def setUp(self):
+        self.logger.info('Setup for restore_paths local')
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for restore_paths local')
+        pass
+
+    def test(self):
+        self.logger.info('Testing restore_paths local')
+
+        with tempfile.TemporaryDirectory() as bucket_store, \
+                tempfile.TemporaryDirectory() as media_directory:
+
+            settings.CARETAKER_LOCAL_STORE_DIRECTORY = bucket_store
+            self.backend = BackendFactory.get_backend('Local')
+
+            media_directory = file.normalize_path(media_directory)
+
+            wanted = media_directory / 'users' / '42'
+            wanted.mkdir(parents=True)
+            (wanted / 'avatar.txt').write_text(self.test_contents)
+
+            # a large, incompressible file that must not be read
+            (media_directory / 'large.bin').write_bytes(
+                os.urandom(4 * 1024 * 1024))
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True)
+
+            shutil.rmtree(media_directory)
+            media_directory.mkdir()
+
+            settings.CARETAKER_RANGE_BLOCK_SIZE = 64 * 1024
+
+            restored = self.frontend.restore_paths(
+                patterns=['{}/users/42/*'.format(media_directory)],
+                backend=self.backend, bucket_name=self.bucket_name,
+                remote_key=self.data_key, dry_run=True,
+                raise_on_error=True)
+
+            self.assertEqual(restored, [str(wanted / 'avatar.txt')])
+            self.assertFalse(wanted.exists())
+
+            restored = self.frontend.restore_paths(
+                patterns=['{}/users/42/*'.format(media_directory)],
+                backend=self.backend, bucket_name=self.bucket_name,
+                remote_key=self.data_key, raise_on_error=True)
+
+            del settings.CARETAKER_RANGE_BLOCK_SIZE
+
+            self.assertEqual(restored, [str(wanted / 'avatar.txt')])
+            self.assertEqual((wanted / 'avatar.txt').read_text(),
+                             self.test_contents)
+            self.assertFalse((media_directory / 'large.bin').exists())
+
+            # an archive that does not exist restores nothing
+            self.assertEqual(self.frontend.restore_paths(
+                patterns=['*'], backend=self.backend,
+                bucket_name=self.bucket_name, remote_key='missing.zip'), [])
@@ -0,0 +1,80 @@
+import tempfile
+import zipfile
+
+import django
+from django.conf import settings
+
+from caretaker.backend.abstract_backend import AbstractBackend, \
+    BackendFactory, StoreOutcome
+from caretaker.tests.frontend.django.backend.local.caretaker_test import \
+    AbstractDjangoLocalTest
+from caretaker.utils import file
+
+
+class TestStreamBackupDjangoLocal(AbstractDjangoLocalTest):
+    def setUp(self):
+        self.logger.info('Setup for streamed run_backup local')
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for streamed run_backup local')
+        pass
+
+    def test(self):
+        self.logger.info('Testing streamed run_backup local')
+
+        with tempfile.TemporaryDirectory() as bucket_store, \
+                tempfile.TemporaryDirectory() as media_directory, \
+                tempfile.TemporaryDirectory() as download_directory:
+
+            settings.CARETAKER_LOCAL_STORE_DIRECTORY = bucket_store
+            self.backend = BackendFactory.get_backend('Local')
+
+            media_directory = file.normalize_path(media_directory)
+            download_directory = file.normalize_path(download_directory)
+
+            media_file = media_directory / 'media.txt'
+            media_file.write_text(self.test_contents)
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True,
+                                     stream_archive=True)
+
+            versions = self.frontend.list_backups(
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend)
+            self.assertEqual(len(versions), 1)
+
+            archive = self.frontend.pull_backup(
+                backup_version=versions[0]['version_id'],
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend,
+                out_file=download_directory / self.data_key)
+
+            with zipfile.ZipFile(archive) as zf:
+                self.assertIsNone(zf.testzip())
+                self.assertEqual(zf.read(str(media_file)[1:]).decode(),
+                                 self.test_contents)
+
+            # no partial files are left behind in the store
+            self.assertEqual(
+                list(file.normalize_path(bucket_store).glob('.caretaker-*')),
+                [])
+
+            # the fallback for backends without a streaming writer spools to
+            # a temporary file and calls store_object
+            with AbstractBackend.open_writer(
+                    self.backend, bucket_name=self.bucket_name,
+                    remote_key=self.json_key) as writer:
+                writer.write(self.test_contents.encode())
+
+            self.assertEqual(writer.outcome, StoreOutcome.STORED)
+
+            versions = self.frontend.list_backups(
+                remote_key=self.json_key, bucket_name=self.bucket_name,
+                backend=self.backend)
+            self.assertEqual(len(versions), 1)
+            self.assertEqual(versions[0]['size'], len(self.test_contents))
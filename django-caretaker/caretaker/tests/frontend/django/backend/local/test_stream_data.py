@@ -0,0 +1,127 @@
+import json
+import tempfile
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+
+from caretaker.backend.abstract_backend import BackendFactory
+from caretaker.tests.frontend.django.backend.local.caretaker_test import \
+    AbstractDjangoLocalTest
+from caretaker.utils import file
+from caretaker.utils.manifest import digest_key, hash_file
+
+
+class TestStreamDataDjangoLocal(AbstractDjangoLocalTest):
+    def setUp(self):
+        self.logger.info('Setup for streamed data run_backup local')
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for streamed data run_backup local')
+        pass
+
+    def _versions(self, remote_key: str) -> list:
+        return self.frontend.list_backups(
+            remote_key=remote_key, bucket_name=self.bucket_name,
+            backend=self.backend)
+
+    def _pull(self, remote_key: str, download_directory) -> bytes:
+        return self.frontend.pull_backup(
+            backup_version=self._versions(remote_key)[0]['version_id'],
+            remote_key=remote_key, bucket_name=self.bucket_name,
+            backend=self.backend,
+            out_file=download_directory / remote_key).read_bytes()
+
+    def test(self):
+        self.logger.info('Testing streamed data run_backup local')
+
+        User.objects.create_user(username='test_user',
+                                 email='martin@eve.gd',
+                                 password='test_password_123')
+
+        with tempfile.TemporaryDirectory() as bucket_store, \
+                tempfile.TemporaryDirectory() as media_directory, \
+                tempfile.TemporaryDirectory() as download_directory:
+
+            settings.CARETAKER_LOCAL_STORE_DIRECTORY = bucket_store
+            settings.CARETAKER_POST_EXECUTE = []
+            self.backend = BackendFactory.get_backend('Local')
+
+            media_directory = file.normalize_path(media_directory)
+            download_directory = file.normalize_path(download_directory)
+
+            (media_directory / 'media.txt').write_text(self.test_contents)
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True, stream_data=True)
+
+            self.assertEqual(len(self._versions(self.dump_key)), 1)
+            self.assertEqual(len(self._versions(self.data_key)), 1)
+
+            data = self._pull(self.dump_key, download_directory)
+            self.assertIn('test_user', [
+                item['fields'].get('username') for item in json.loads(data)])
+
+            # the digest was computed as the dump was uploaded
+            digest = self._pull(digest_key(self.dump_key),
+                                download_directory).decode()
+            self.assertEqual(digest, '{}  {}\n'.format(
+                hash_file(download_directory / self.dump_key),
+                self.dump_key))
+
+            # an unchanged database is not stored again
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True, stream_data=True)
+
+            self.assertEqual(len(self._versions(self.dump_key)), 1)
+            self.assertEqual(len(self._versions(
+                digest_key(self.dump_key))), 1)
+
+            # SQL dumps are streamed from the client's output
+            settings.CARETAKER_STREAM_DATA = True
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True, sql_mode=True)
+
+            self.assertEqual(len(self._versions(self.dump_key)), 2)
+            self.assertIn(b'CREATE TABLE IF NOT EXISTS "auth_user"',
+                          self._pull(self.dump_key, download_directory))
+
+            # and a snapshot, which needs a file, is staged on disk
+            settings.CARETAKER_SQLITE_EXPORT_MODE = 'backup'
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True, sql_mode=True)
+
+            del settings.CARETAKER_SQLITE_EXPORT_MODE
+            del settings.CARETAKER_STREAM_DATA
+
+            self.assertEqual(len(self._versions(self.dump_key)), 3)
+            self.assertEqual(file.determine_type(
+                self.frontend.pull_backup(
+                    backup_version=self._versions(
+                        self.dump_key)[0]['version_id'],
+                    remote_key=self.dump_key, bucket_name=self.bucket_name,
+                    backend=self.backend,
+                    out_file=download_directory / 'snapshot')),
+                file.FileType.SQLITE_DATABASE)
+
+            # the digest no longer describes the latest data file, so the
+            # next streamed dump is stored even though it matches the digest
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True, sql_mode=True,
+                                     stream_data=True)
+
+            self.assertEqual(len(self._versions(self.dump_key)), 4)
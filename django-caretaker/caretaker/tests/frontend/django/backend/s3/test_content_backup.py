@@ -0,0 +1,89 @@
+import shutil
+import tempfile
+
+import django
+from django.conf import settings
+from moto import mock_s3
+
+from caretaker.tests.frontend.django.backend.s3.caretaker_test import \
+    AbstractDjangoS3Test
+from caretaker.utils import file
+from caretaker.utils.manifest import content_key
+
+
+@mock_s3
+class TestContentBackupDjangoS3(AbstractDjangoS3Test):
+    def setUp(self):
+        self.logger.info('Setup for content-addressed run_backup S3')
+
+        self.create_bucket()
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for content-addressed run_backup S3')
+        pass
+
+    def test(self):
+        self.logger.info('Testing content-addressed run_backup S3')
+
+        with tempfile.TemporaryDirectory() as media_directory:
+            settings.CARETAKER_BLOB_GRACE_PERIOD = 0
+
+            media_directory = file.normalize_path(media_directory)
+
+            kept = media_directory / 'kept.txt'
+            removed = media_directory / 'removed.txt'
+
+            kept.write_text('kept')
+            removed.write_text('removed')
+
+            for _ in range(2):
+                self.frontend.push_content(path_list=[media_directory],
+                                           backend=self.backend,
+                                           bucket_name=self.bucket_name,
+                                           raise_on_error=True)
+
+            blobs = self.backend.list_blobs(bucket_name=self.bucket_name)
+            self.assertEqual(len(blobs), 2)
+
+            removed.unlink()
+
+            self.frontend.push_content(path_list=[media_directory],
+                                       backend=self.backend,
+                                       bucket_name=self.bucket_name,
+                                       raise_on_error=True)
+
+            # drop the manifests that still reference the removed file
+            versions = self.frontend.list_backups(
+                remote_key=content_key(self.data_key),
+                bucket_name=self.bucket_name, backend=self.backend)
+            self.assertEqual(len(versions), 3)
+
+            for version in versions[1:]:
+                self.backend.client.delete_object(
+                    Bucket=self.bucket_name,
+                    Key=content_key(self.data_key),
+                    VersionId=version['version_id'])
+
+            deleted = self.frontend.collect_garbage(
+                backend=self.backend, bucket_name=self.bucket_name,
+                raise_on_error=True)
+            self.assertEqual(len(deleted), 1)
+
+            # every version of the blob is gone, not just hidden
+            self.assertFalse(self.backend.has_blob(
+                bucket_name=self.bucket_name, digest=deleted[0]))
+            self.assertEqual(len(self.backend.list_blobs(
+                bucket_name=self.bucket_name)), 1)
+
+            shutil.rmtree(media_directory)
+
+            self.assertTrue(self.frontend.restore_content(
+                backend=self.backend, bucket_name=self.bucket_name,
+                raise_on_error=True))
+
+            self.assertEqual(kept.read_text(), 'kept')
+            self.assertFalse(removed.exists())
+
+            del settings.CARETAKER_BLOB_GRACE_PERIOD
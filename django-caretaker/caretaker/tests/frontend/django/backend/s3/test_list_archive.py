@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import django
+from django.conf import settings
+from moto import mock_s3
+
+from caretaker.tests.frontend.django.backend.s3.caretaker_test import \
+    AbstractDjangoS3Test
+from caretaker.utils import file
+from caretaker.utils.tar import zstandard
+
+
+@unittest.skipIf(zstandard is None, 'zstandard is not installed')
+@mock_s3
+class TestListArchiveDjangoS3(AbstractDjangoS3Test):
+    def setUp(self):
+        self.logger.info('Setup for list_archive S3')
+
+        self.create_bucket()
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for list_archive S3')
+        pass
+
+    def test(self):
+        self.logger.info('Testing list_archive S3')
+
+        with tempfile.TemporaryDirectory() as cache_directory, \
+                tempfile.TemporaryDirectory() as media_directory:
+            settings.CARETAKER_ARCHIVE_INDEX_CACHE = cache_directory
+
+            media_directory = file.normalize_path(media_directory)
+
+            small_file = media_directory / 'small.txt'
+            small_file.write_text(self.test_contents)
+
+            for archive_format in ['zip', 'tar.zst']:
+                settings.CARETAKER_ARCHIVE_FORMAT = archive_format
+
+                self.frontend.run_backup(path_list=[media_directory],
+                                         bucket_name=self.bucket_name,
+                                         backend=self.backend,
+                                         raise_on_error=True)
+
+            del settings.CARETAKER_ARCHIVE_FORMAT
+
+            versions = self.frontend.list_backups(
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend)
+            self.assertEqual(len(versions), 2)
+
+            # both the zip and the tar.zst version can be listed
+            for version in versions:
+                members = self.frontend.list_archive(
+                    remote_key=self.data_key, backend=self.backend,
+                    bucket_name=self.bucket_name,
+                    backup_version=version['version_id'],
+                    raise_on_error=True)
+
+                self.assertEqual([item['path'] for item in members],
+                                 [str(small_file)])
+                self.assertEqual(members[0]['size'],
+                                 len(self.test_contents))
+
+            self.assertEqual(len(os.listdir(
+                os.path.join(cache_directory, self.bucket_name))), 2)
+
+            del settings.CARETAKER_ARCHIVE_INDEX_CACHE
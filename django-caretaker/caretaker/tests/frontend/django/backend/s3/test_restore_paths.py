@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+
+import django
+from django.conf import settings
+from moto import mock_s3
+
+from caretaker.backend.remote_file import RemoteFile
+from caretaker.tests.frontend.django.backend.s3.caretaker_test import \
+    AbstractDjangoS3Test
+from caretaker.utils import file
+
+
+@mock_s3
+class TestRestorePathsDjangoS3(AbstractDjangoS3Test):
+    def setUp(self):
+        self.logger.info('Setup for restore_paths S3')
+
+        self.create_bucket()
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for restore_paths S3')
+        pass
+
+    def test(self):
+        self.logger.info('Testing restore_paths S3')
+
+        with tempfile.TemporaryDirectory() as media_directory:
+            media_directory = file.normalize_path(media_directory)
+
+            wanted = media_directory / 'users' / '42'
+            wanted.mkdir(parents=True)
+            (wanted / 'avatar.txt').write_text(self.test_contents)
+
+            # a large, incompressible file that must not be downloaded
+            (media_directory / 'large.bin').write_bytes(
+                os.urandom(4 * 1024 * 1024))
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True)
+
+            versions = self.frontend.list_backups(
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend)
+
+            shutil.rmtree(media_directory)
+            media_directory.mkdir()
+
+            settings.CARETAKER_RANGE_BLOCK_SIZE = 64 * 1024
+
+            restored = self.frontend.restore_paths(
+                patterns=['{}/users/*'.format(media_directory)],
+                backend=self.backend, bucket_name=self.bucket_name,
+                remote_key=self.data_key,
+                backup_version=versions[0]['version_id'],
+                raise_on_error=True)
+
+            del settings.CARETAKER_RANGE_BLOCK_SIZE
+
+            self.assertEqual(restored, [str(wanted / 'avatar.txt')])
+            self.assertEqual((wanted / 'avatar.txt').read_text(),
+                             self.test_contents)
+            self.assertFalse((media_directory / 'large.bin').exists())
+
+            # ranged reads return exactly the requested bytes
+            remote_file = RemoteFile(
+                backend=self.backend, bucket_name=self.bucket_name,
+                remote_key=self.data_key,
+                version_id=versions[0]['version_id'], block_size=1024)
+
+            remote_file.seek(-22, os.SEEK_END)
+            self.assertEqual(remote_file.read(4), b'PK\x05\x06')
+            self.assertLess(remote_file.bytes_fetched, 4 * 1024 * 1024)
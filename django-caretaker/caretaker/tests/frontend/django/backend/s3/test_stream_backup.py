@@ -0,0 +1,96 @@
+import os
+import tempfile
+import zipfile
+
+import django
+from django.conf import settings
+from moto import mock_s3
+
+from caretaker.backend.abstract_backend import StoreOutcome
+from caretaker.tests.frontend.django.backend.s3.caretaker_test import \
+    AbstractDjangoS3Test
+from caretaker.utils import file
+
+
+@mock_s3
+class TestStreamBackupDjangoS3(AbstractDjangoS3Test):
+    def setUp(self):
+        self.logger.info('Setup for streamed run_backup S3')
+
+        self.create_bucket()
+
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for streamed run_backup S3')
+        pass
+
+    def test(self):
+        self.logger.info('Testing streamed run_backup S3')
+
+        with tempfile.TemporaryDirectory() as media_directory, \
+                tempfile.TemporaryDirectory() as download_directory:
+            media_directory = file.normalize_path(media_directory)
+            download_directory = file.normalize_path(download_directory)
+
+            # a file that is stored, not deflated, so that the archive spans
+            # several of the smallest allowed parts
+            large_file = media_directory / 'large.bin'
+            large_file.write_bytes(os.urandom(12 * 1024 * 1024))
+            (media_directory / 'small.txt').write_text(self.test_contents)
+
+            settings.CARETAKER_S3_PART_SIZE = 5 * 1024 * 1024
+
+            self.frontend.run_backup(path_list=[media_directory],
+                                     bucket_name=self.bucket_name,
+                                     backend=self.backend,
+                                     raise_on_error=True,
+                                     stream_archive=True)
+
+            del settings.CARETAKER_S3_PART_SIZE
+
+            versions = self.frontend.list_backups(
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend)
+            self.assertEqual(len(versions), 1)
+
+            # the archive was uploaded in parts
+            head = self.backend.client.head_object(Bucket=self.bucket_name,
+                                                   Key=self.data_key)
+            self.assertTrue(head['ETag'].endswith('-3"'))
+
+            archive = self.frontend.pull_backup(
+                backup_version=versions[0]['version_id'],
+                remote_key=self.data_key, bucket_name=self.bucket_name,
+                backend=self.backend,
+                out_file=download_directory / self.data_key)
+
+            with zipfile.ZipFile(archive) as zf:
+                self.assertIsNone(zf.testzip())
+                self.assertEqual(
+                    zf.read(str(large_file)[1:]), large_file.read_bytes())
+
+            # the data file is pushed as normal
+            self.assertEqual(len(self.frontend.list_backups(
+                remote_key=self.dump_key, bucket_name=self.bucket_name,
+                backend=self.backend)), 1)
+
+            # a small stream is sent in a single request and an error
+            # inside the block discards the object
+            with self.backend.open_writer(bucket_name=self.bucket_name,
+                                          remote_key=self.json_key) as writer:
+                writer.write(self.test_contents.encode())
+
+            self.assertEqual(writer.outcome, StoreOutcome.STORED)
+
+            with self.assertRaises(RuntimeError):
+                with self.backend.open_writer(
+                        bucket_name=self.bucket_name,
+                        remote_key=self.json_key) as writer:
+                    writer.write(self.test_contents.encode())
+                    raise RuntimeError
+
+            self.assertEqual(writer.outcome, StoreOutcome.FAILED)
+            self.assertEqual(len(self.frontend.list_backups(
+                remote_key=self.json_key, bucket_name=self.bucket_name,
+                backend=self.backend)), 1)
@@ -0,0 +1,81 @@
+import tempfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase
+
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend, FrontendError
+from caretaker.utils import log, file
+from caretaker.utils.file import FileType
+
+
+class TestImportMysqlArchiveDjango(TransactionTestCase):
+    databases = {'mysql'}
+
+    def setUp(self):
+        self.logger: Logger = log.get_logger('import-mysql-archive-test')
+        self.logger.info('Setup for test MySQL profile import into Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test MySQL profile import into Django')
+        pass
+
+    def test(self):
+        self.logger.info('Testing test MySQL profile import into Django')
+
+        database_name = 'mysql'
+
+        User.objects.using(database_name).create(username='test_user',
+                                                 email='martin@eve.gd',
+                                                 password='test_password_123')
+
+        settings.CARETAKER_MYSQL_JOBS = 2
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            for profile, file_type in [('consistent', FileType.SQL),
+                                       ('parallel', FileType.MYSQL_ARCHIVE)]:
+                file_path = Path(temporary_directory_name) / '{}.sql'.format(
+                    profile)
+
+                settings.CARETAKER_MYSQL_DUMP_PROFILE = profile
+
+                self.frontend.export_sql(output_file=str(file_path),
+                                         database=database_name)
+
+                del settings.CARETAKER_MYSQL_DUMP_PROFILE
+
+                self.assertEqual(file.determine_type(file_path), file_type)
+                self.assertEqual(list(Path(temporary_directory_name).glob(
+                    'tmp*')), [])
+
+                User.objects.using(database_name).filter(
+                    username='test_user').update(username='user2')
+
+                self.frontend.import_file(
+                    database=database_name, input_file=str(file_path),
+                    raise_on_error=True)
+
+                self.assertEqual(list(User.objects.using(
+                    database_name).values_list('username', flat=True)),
+                    ['test_user'])
+
+            # archives cannot be restored into other databases
+            with self.assertRaises(FrontendError):
+                self.frontend.import_file(
+                    input_file=str(Path(temporary_directory_name) /
+                                   'parallel.sql'), raise_on_error=True)
+
+        del settings.CARETAKER_MYSQL_JOBS
+
+        settings.CARETAKER_MYSQL_DUMP_PROFILE = 'fast'
+
+        with self.assertRaises(FrontendError):
+            self.frontend.export_sql(output_file='-', database=database_name)
+
+        del settings.CARETAKER_MYSQL_DUMP_PROFILE
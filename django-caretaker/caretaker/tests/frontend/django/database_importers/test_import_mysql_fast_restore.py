@@ -0,0 +1,70 @@
+from logging import Logger
+
+import django
+from django.db import connections, IntegrityError
+from django.contrib.auth.models import Group
+from django.test import TransactionTestCase
+
+from caretaker.frontend.frontends.json_import import BulkLoader
+from caretaker.frontend.frontends.utils import DatabasePatcher
+from caretaker.utils import log
+
+
+class TestImportMysqlFastRestoreDjango(TransactionTestCase):
+    databases = {'mysql'}
+
+    def setUp(self):
+        self.logger: Logger = log.get_logger('import-mysql-fast-restore-test')
+        self.logger.info('Setup for test MySQL fast restore into Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test MySQL fast restore into Django')
+        pass
+
+    def test(self):
+        self.logger.info('Testing test MySQL fast restore into Django')
+
+        database_name = 'mysql'
+        connection = connections[database_name]
+
+        _, importer = DatabasePatcher.patch_importer(connection)
+
+        # the index on the expiry date is dropped and rebuilt as it was
+        indexes = importer.secondary_indexes(connection, 'django_session')
+
+        self.assertEqual([sql for _, sql in indexes],
+                         ['CREATE INDEX `{}` ON `django_session` '
+                          '(`expire_date`)'.format(indexes[0][0])])
+
+        # indexes that back foreign keys are kept
+        self.assertEqual(importer.secondary_indexes(
+            connection, 'auth_permission'), [])
+
+        with connection.cursor() as cursor:
+            for name, _ in indexes:
+                cursor.execute(importer.drop_index_sql(
+                    connection, 'django_session', name))
+
+            self.assertEqual(importer.secondary_indexes(
+                connection, 'django_session'), [])
+
+            for _, sql in indexes:
+                cursor.execute(sql)
+
+        self.assertEqual(importer.secondary_indexes(
+            connection, 'django_session'), indexes)
+
+        # unique indexes are still checked while foreign keys are deferred
+        with self.assertRaises(IntegrityError):
+            with BulkLoader(database=database_name,
+                            defer_indexes=True) as loader:
+                loader.load([{'model': 'auth.group', 'pk': 1,
+                              'fields': {'name': 'editors',
+                                         'permissions': []}},
+                             {'model': 'auth.group', 'pk': 2,
+                              'fields': {'name': 'editors',
+                                         'permissions': []}}])
+
+        self.assertFalse(Group.objects.using(database_name).filter(
+            name='editors', pk=2).exists())
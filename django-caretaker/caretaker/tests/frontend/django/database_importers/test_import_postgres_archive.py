@@ -0,0 +1,92 @@
+import tempfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase
+
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend, FrontendError
+from caretaker.utils import log, file
+from caretaker.utils.file import FileType
+
+
+class TestImportPostgresArchiveDjango(TransactionTestCase):
+    databases = {'postgres'}
+
+    def setUp(self):
+        self.logger: Logger = log.get_logger('import-postgresql-archive-test')
+        self.logger.info('Setup for test Postgres archive import into Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test Postgres archive import into '
+                         'Django')
+        pass
+
+    def test(self):
+        self.logger.info('Testing test Postgres archive import into Django')
+
+        database_name = 'postgres'
+
+        User.objects.using(database_name).create(username='test_user',
+                                                 email='martin@eve.gd',
+                                                 password='test_password_123')
+
+        settings.CARETAKER_POSTGRES_JOBS = 2
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            for dump_format in ['custom', 'directory']:
+                file_path = Path(temporary_directory_name) / '{}.dump'.format(
+                    dump_format)
+
+                settings.CARETAKER_POSTGRES_DUMP_FORMAT = dump_format
+
+                self.frontend.export_sql(output_file=str(file_path),
+                                         database=database_name)
+
+                del settings.CARETAKER_POSTGRES_DUMP_FORMAT
+
+                self.assertEqual(file.determine_type(file_path),
+                                 FileType.POSTGRES_ARCHIVE)
+                self.assertEqual(file.postgres_archive_format(file_path),
+                                 dump_format)
+                self.assertEqual(list(Path(temporary_directory_name).glob(
+                    'tmp*')), [])
+
+                User.objects.using(database_name).filter(
+                    username='test_user').update(username='user2')
+
+                # a dry run leaves the database as it is
+                self.frontend.import_file(
+                    database=database_name, input_file=str(file_path),
+                    raise_on_error=True, dry_run=True)
+
+                self.assertFalse(User.objects.using(database_name).filter(
+                    username='test_user').exists())
+
+                self.frontend.import_file(
+                    database=database_name, input_file=str(file_path),
+                    raise_on_error=True)
+
+                self.assertEqual(list(User.objects.using(
+                    database_name).values_list('username', flat=True)),
+                    ['test_user'])
+
+            # archives cannot be restored into other databases
+            with self.assertRaises(FrontendError):
+                self.frontend.import_file(
+                    input_file=str(Path(temporary_directory_name) /
+                                   'custom.dump'), raise_on_error=True)
+
+        del settings.CARETAKER_POSTGRES_JOBS
+
+        settings.CARETAKER_POSTGRES_DUMP_FORMAT = 'tar'
+
+        with self.assertRaises(FrontendError):
+            self.frontend.export_sql(output_file='-', database=database_name)
+
+        del settings.CARETAKER_POSTGRES_DUMP_FORMAT
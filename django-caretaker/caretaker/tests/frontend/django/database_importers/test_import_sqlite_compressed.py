@@ -0,0 +1,93 @@
+import tempfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend, FrontendError
+from caretaker.utils import log, file
+from caretaker.utils.file import FileType
+
+
+class TestImportSQLiteCompressedDjango(TransactionTestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('import-sqlite-compressed-test')
+        self.logger.info('Setup for test compressed SQL import into Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test compressed SQL import into '
+                         'Django')
+        pass
+
+    def test(self):
+        self.logger.info('Testing test compressed SQL import into Django')
+
+        User.objects.create_user(username='test_user',
+                                 email='martin@eve.gd',
+                                 password='test_password_123')
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            plain_path = Path(temporary_directory_name) / 'data.sql'
+
+            for compression in ['gzip', 'zstd']:
+                self.frontend.export_sql(output_file=str(plain_path))
+
+                file_path = Path(temporary_directory_name) / '{}.sql'.format(
+                    compression)
+
+                settings.CARETAKER_SQL_COMPRESSION = compression
+                settings.CARETAKER_SQL_COMPRESSION_LEVEL = 1
+
+                self.frontend.export_sql(output_file=str(file_path))
+
+                del settings.CARETAKER_SQL_COMPRESSION
+                del settings.CARETAKER_SQL_COMPRESSION_LEVEL
+
+                self.assertEqual(file.compression_type(file_path),
+                                 compression)
+                self.assertEqual(file.determine_type(file_path), FileType.SQL)
+                self.assertLess(file_path.stat().st_size,
+                                plain_path.stat().st_size)
+
+                with file.compressed_reader(file_path,
+                                            compression=compression) \
+                        as reader:
+                    self.assertEqual(reader.read(), plain_path.read_bytes())
+
+                User.objects.filter(username='test_user').update(
+                    username='user2')
+
+                self.frontend.import_file(input_file=str(file_path),
+                                          raise_on_error=True)
+
+                self.assertEqual(list(User.objects.values_list(
+                    'username', flat=True)), ['test_user'])
+
+            # a truncated dump is refused and the database is rolled back
+            damaged = Path(temporary_directory_name) / 'damaged.sql'
+            data = (Path(temporary_directory_name) / 'zstd.sql').read_bytes()
+            damaged.write_bytes(data[:len(data) // 2])
+
+            User.objects.filter(username='test_user').update(
+                username='user2')
+
+            with self.assertRaises(CommandError):
+                self.frontend.import_file(input_file=str(damaged),
+                                          raise_on_error=True)
+
+            self.assertEqual(list(User.objects.values_list(
+                'username', flat=True)), ['user2'])
+
+        settings.CARETAKER_SQL_COMPRESSION = 'bzip2'
+
+        with self.assertRaises(FrontendError):
+            self.frontend.export_sql(output_file='-')
+
+        del settings.CARETAKER_SQL_COMPRESSION
@@ -0,0 +1,116 @@
+import contextlib
+import sqlite3
+import tempfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TransactionTestCase
+
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend, FrontendError
+from caretaker.utils import log, file
+from caretaker.utils.file import FileType
+
+
+class TestImportSQLiteSnapshotDjango(TransactionTestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('import-sqlite-snapshot-test')
+        self.logger.info('Setup for test SQLite snapshot import into Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test SQLite snapshot import into '
+                         'Django')
+        pass
+
+    def test(self):
+        self.logger.info('Testing test SQLite snapshot import into Django')
+
+        User.objects.create_user(username='test_user',
+                                 email='martin@eve.gd',
+                                 password='test_password_123')
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            for method in ['backup', 'vacuum']:
+                file_path = Path(temporary_directory_name) / '{}.sqlite3'.format(
+                    method)
+
+                settings.CARETAKER_SQLITE_EXPORT_MODE = method
+
+                self.frontend.export_sql(output_file=str(file_path))
+
+                del settings.CARETAKER_SQLITE_EXPORT_MODE
+
+                self.assertEqual(file.determine_type(file_path),
+                                 FileType.SQLITE_DATABASE)
+                self.assertFalse(Path(str(file_path) + '.partial').exists())
+
+                User.objects.filter(username='test_user').update(
+                    username='user2')
+                User.objects.create(username='user3')
+
+                # a dry run leaves the database as it is
+                self.frontend.import_file(input_file=str(file_path),
+                                          raise_on_error=True, dry_run=True)
+
+                self.assertFalse(
+                    User.objects.filter(username='test_user').exists())
+
+                # another connection holds the database open throughout
+                with contextlib.closing(sqlite3.connect(
+                        connection.settings_dict['NAME'])) as other:
+                    self.frontend.import_file(input_file=str(file_path),
+                                              raise_on_error=True)
+
+                    self.assertEqual(other.execute(
+                        'SELECT username FROM auth_user').fetchall(),
+                        [('test_user',)])
+
+                self.assertEqual(list(User.objects.values_list(
+                    'username', flat=True)), ['test_user'])
+
+            # a damaged snapshot is refused and the database is untouched
+            damaged = Path(temporary_directory_name) / 'damaged.sqlite3'
+            data = (Path(temporary_directory_name) /
+                    'backup.sqlite3').read_bytes()
+            damaged.write_bytes(data[:len(data) // 2])
+
+            with self.assertRaises(sqlite3.DatabaseError):
+                self.frontend.import_file(input_file=str(damaged),
+                                          raise_on_error=True)
+
+            self.assertTrue(
+                User.objects.filter(username='test_user').exists())
+
+            # a database locked by another connection is not restored
+            with contextlib.closing(sqlite3.connect(
+                    connection.settings_dict['NAME'])) as other:
+                other.execute('BEGIN IMMEDIATE')
+
+                settings.DATABASES['default'].setdefault('OPTIONS', {})
+                connection.settings_dict['OPTIONS']['timeout'] = 0.1
+
+                with self.assertRaises(sqlite3.OperationalError):
+                    self.frontend.import_file(
+                        input_file=str(Path(temporary_directory_name) /
+                                       'backup.sqlite3'),
+                        raise_on_error=True)
+
+                del connection.settings_dict['OPTIONS']['timeout']
+
+                other.rollback()
+
+            self.assertTrue(
+                User.objects.filter(username='test_user').exists())
+
+        settings.CARETAKER_SQLITE_EXPORT_MODE = 'copy'
+
+        with self.assertRaises(FrontendError):
+            self.frontend.export_sql(output_file='-')
+
+        del settings.CARETAKER_SQLITE_EXPORT_MODE
@@ -0,0 +1,65 @@
+import json
+import tempfile
+import tracemalloc
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.contrib.sessions.models import Session
+from django.test import TestCase
+from django.utils import timezone
+
+from caretaker.utils import log
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend
+
+
+class TestExportJSONDjango(TestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('export-json-test')
+        self.logger.info('Setup for test JSON export from Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test JSON export from Django')
+        pass
+
+    def test(self):
+        self.logger.info('Testing test JSON export from Django')
+
+        # many more rows than the 2,000 that a queryset iterator fetches at
+        # a time
+        Session.objects.bulk_create(
+            Session(session_key='session_{}'.format(index),
+                    session_data='x' * 500, expire_date=timezone.now())
+            for index in range(20000))
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            tracemalloc.start()
+
+            try:
+                data_file = self.frontend.export_json(
+                    data_file='data.json',
+                    output_directory=temporary_directory_name,
+                    logger=self.logger)
+
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            self.assertEqual(data_file,
+                             Path(temporary_directory_name) / 'data.json')
+
+            size = data_file.stat().st_size
+
+            # memory is bounded by one chunk of rows, whereas buffering the
+            # dump would need at least its whole size
+            self.logger.info('Peak memory of {} bytes for a {} byte '
+                             'dump'.format(peak, size))
+            self.assertLess(peak, size / 3)
+
+            with data_file.open('r') as in_file:
+                self.assertEqual(
+                    len([item for item in json.load(in_file)
+                         if item['model'] == 'sessions.session']), 20000)
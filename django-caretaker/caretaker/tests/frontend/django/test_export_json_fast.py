@@ -0,0 +1,102 @@
+import datetime
+import json
+import tempfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from caretaker.utils import log
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend
+
+
+class TestExportJSONFastDjango(TestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('export-json-fast-test')
+        self.logger.info('Setup for test fast JSON export from Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test fast JSON export from Django')
+        pass
+
+    @staticmethod
+    def _normalize(value: object) -> object:
+        """
+        Compare dates by value, as dumpdata truncates them to milliseconds
+        """
+        if isinstance(value, str) and parse_datetime(value):
+            return parse_datetime(value).replace(microsecond=0)
+
+        return value
+
+    def test(self):
+        self.logger.info('Testing test fast JSON export from Django')
+
+        group = Group.objects.create(name='editors')
+        group.permissions.set(Permission.objects.all()[:3])
+
+        for index in range(25):
+            user = User.objects.create_user(
+                username='user_{}'.format(index), password='secret',
+                first_name='Ünïcode {}'.format(index))
+
+            if index % 3:
+                user.groups.add(group)
+                user.user_permissions.add(Permission.objects.first())
+
+        Session.objects.create(
+            session_key='session', session_data='data',
+            expire_date=timezone.now() + datetime.timedelta(days=1))
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            call_command('dumpdata', output=str(
+                Path(temporary_directory_name) / 'dumpdata.json'),
+                verbosity=0)
+
+            settings.CARETAKER_EXPORT_ENGINE = 'fast'
+
+            data_file = self.frontend.export_json(
+                data_file='data.json',
+                output_directory=temporary_directory_name,
+                logger=self.logger)
+
+            del settings.CARETAKER_EXPORT_ENGINE
+
+            with (Path(temporary_directory_name) / 'dumpdata.json').open() \
+                    as expected_file, data_file.open() as actual_file:
+                expected = json.load(expected_file)
+                actual = json.load(actual_file)
+
+            # the same objects and fields as dumpdata, in the same order
+            self.assertEqual([(item['model'], item['pk']) for item in actual],
+                             [(item['model'], item['pk'])
+                              for item in expected])
+
+            for expected_item, actual_item in zip(expected, actual):
+                self.assertEqual(
+                    {name: self._normalize(value) for name, value
+                     in actual_item['fields'].items()},
+                    {name: self._normalize(value) for name, value
+                     in expected_item['fields'].items()})
+
+            # and it loads back in
+            User.objects.all().delete()
+
+            self.frontend.import_file(input_file=str(data_file),
+                                      raise_on_error=True)
+
+            self.assertEqual(User.objects.count(), 25)
+            self.assertEqual(
+                User.objects.filter(groups__name='editors').count(), 16)
+            self.assertTrue(User.objects.get(username='user_1').check_password(
+                'secret'))
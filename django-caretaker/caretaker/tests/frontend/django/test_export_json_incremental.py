@@ -0,0 +1,137 @@
+import datetime
+import json
+import tempfile
+import zipfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.models import Session
+from django.test import TestCase
+from django.utils import timezone
+
+from caretaker.utils import log, file
+from caretaker.utils.file import FileType
+from caretaker.utils.manifest import SHARD_INDEX_MEMBER, manifest_key, \
+    read_manifest
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend
+
+
+class TestExportJSONIncrementalDjango(TestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('export-json-incremental-test')
+        self.logger.info('Setup for test incremental JSON export from Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test incremental JSON export from '
+                         'Django')
+        pass
+
+    def _export(self, output_directory: str,
+                previous_manifest: dict | None) -> (Path, dict):
+        data_file = self.frontend.export_json(
+            data_file='data.json', output_directory=output_directory,
+            logger=self.logger, incremental=True,
+            previous_manifest=previous_manifest)
+
+        with (Path(output_directory) / manifest_key('data.json')).open(
+                'rb') as in_file:
+            return data_file, read_manifest(in_file)
+
+    @staticmethod
+    def _current() -> dict:
+        return {
+            'users': sorted(User.objects.values_list('username', flat=True)),
+            'groups': sorted(Group.objects.values_list('name', flat=True)),
+            'members': sorted(User.objects.filter(
+                groups__name='writers').values_list('username', flat=True)),
+            'sessions': sorted(Session.objects.values_list('session_key',
+                                                           flat=True)),
+        }
+
+    def test(self):
+        self.logger.info('Testing test incremental JSON export from Django')
+
+        settings.CARETAKER_INCREMENTAL_APPEND_ONLY_MODELS = ['auth.User']
+
+        editors = Group.objects.create(name='editors')
+        Group.objects.create(name='readers')
+
+        users = [User.objects.create(username='user_{}'.format(index))
+                 for index in range(10)]
+        editors.user_set.add(*users[:5])
+
+        expiry = timezone.now() + datetime.timedelta(days=1)
+
+        for key in ['a', 'b', 'c']:
+            Session.objects.create(session_key=key, session_data='',
+                                   expire_date=expiry)
+
+        with tempfile.TemporaryDirectory() as full_directory, \
+                tempfile.TemporaryDirectory() as delta_directory:
+            full_file, full_manifest = self._export(full_directory, None)
+
+            self.assertEqual(full_manifest['type'], 'full')
+            self.assertEqual(file.determine_type(full_file),
+                             FileType.JSON_SHARDS)
+
+            # two users are added, two deleted, a group renamed and another
+            # group and a session deleted
+            User.objects.create(username='user_10')
+            User.objects.create(username='user_11')
+            User.objects.filter(pk__in=[users[3].pk, users[4].pk]).delete()
+            Group.objects.filter(name='editors').update(name='writers')
+            Group.objects.filter(name='readers').delete()
+            Session.objects.filter(session_key='b').delete()
+
+            delta_file, delta_manifest = self._export(delta_directory,
+                                                      full_manifest)
+
+            self.assertEqual(delta_manifest['type'], 'incremental')
+            self.assertEqual(delta_manifest['parent'], full_manifest['id'])
+
+            with zipfile.ZipFile(delta_file) as zf:
+                index = json.loads(zf.read(SHARD_INDEX_MEMBER))
+
+            counts = {shard['model']: shard['count']
+                      for shard in index['shards']}
+
+            # only the new users are exported but every group is
+            self.assertEqual(counts['auth.user'], 2)
+            self.assertEqual(counts['auth.group'], 1)
+
+            self.assertEqual(index['deleted']['auth.user'],
+                             {'ranges': [[users[3].pk, users[4].pk]]})
+            self.assertEqual(index['deleted']['sessions.session'],
+                             {'keys': ['b']})
+            self.assertIn('auth.group', index['deleted'])
+
+            expected = self._current()
+            self.assertEqual(expected['members'],
+                             ['user_0', 'user_1', 'user_2'])
+
+            User.objects.all().delete()
+            Group.objects.all().delete()
+            Session.objects.all().delete()
+
+            self.frontend.import_file(input_file=str(full_file),
+                                      raise_on_error=True)
+            self.assertEqual(User.objects.count(), 10)
+
+            User.objects.all().delete()
+            Group.objects.all().delete()
+            Session.objects.all().delete()
+
+            self.frontend.import_file(input_file=str(full_file),
+                                      delta_files=[str(delta_file)],
+                                      raise_on_error=True)
+
+            # the renamed group keeps its members from the full export
+            self.assertEqual(self._current(), expected)
+
+        del settings.CARETAKER_INCREMENTAL_APPEND_ONLY_MODELS
@@ -0,0 +1,110 @@
+import datetime
+import json
+import tempfile
+import unittest
+import zipfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from caretaker.frontend.frontends.fast_serializer import msgpack
+from caretaker.frontend.frontends.json_export import zstandard
+from caretaker.utils import log, file
+from caretaker.utils.file import FileType
+from caretaker.utils.manifest import SHARD_INDEX_MEMBER
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend
+
+
+class TestExportJSONRowsDjango(TestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('export-json-rows-test')
+        self.logger.info('Setup for test row format JSON export from Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test row format JSON export from '
+                         'Django')
+        pass
+
+    @staticmethod
+    def _current() -> dict:
+        return {
+            'users': list(User.objects.order_by('pk').values(
+                'pk', 'username', 'email', 'is_staff', 'date_joined')),
+            'members': sorted(User.objects.filter(
+                groups__name='editors').values_list('username', flat=True)),
+            'sessions': list(Session.objects.order_by('pk').values()),
+        }
+
+    @unittest.skipIf(msgpack is None or zstandard is None,
+                     'msgpack and zstandard are not installed')
+    def test(self):
+        self.logger.info('Testing test row format JSON export from Django')
+
+        editors = Group.objects.create(name='editors')
+
+        users = [User.objects.create(
+            username='user_{}'.format(index),
+            email='user_{}@example.org'.format(index),
+            is_staff=not index % 3) for index in range(200)]
+        editors.user_set.add(*users[::2])
+
+        expiry = timezone.now() + datetime.timedelta(days=1)
+
+        for index in range(50):
+            Session.objects.create(session_key='key_{}'.format(index),
+                                   session_data='data "{}"\n'.format(index),
+                                   expire_date=expiry)
+
+        expected = self._current()
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            fixture = Path(temporary_directory_name) / 'fixture.json'
+            call_command('dumpdata', output=str(fixture), verbosity=0)
+
+            for export_format, compression in [('jsonl', 'deflate'),
+                                               ('msgpack', 'zstd')]:
+                settings.CARETAKER_EXPORT_FORMAT = export_format
+                settings.CARETAKER_EXPORT_COMPRESSION = compression
+
+                output_directory = Path(temporary_directory_name) / \
+                    export_format
+                output_directory.mkdir()
+
+                data_file = self.frontend.export_json(
+                    data_file='data.json', logger=self.logger,
+                    output_directory=output_directory)
+
+                del settings.CARETAKER_EXPORT_FORMAT
+                del settings.CARETAKER_EXPORT_COMPRESSION
+
+                self.assertEqual(file.determine_type(data_file),
+                                 FileType.JSON_SHARDS)
+
+                with zipfile.ZipFile(data_file) as zf:
+                    index = json.loads(zf.read(SHARD_INDEX_MEMBER))
+
+                self.assertEqual(index['format'], export_format)
+                self.assertEqual(index['compression'], compression)
+
+                # rows do not repeat field names
+                self.assertLess(data_file.stat().st_size,
+                                fixture.stat().st_size)
+
+                Session.objects.all().delete()
+                User.objects.all().delete()
+                Group.objects.all().delete()
+
+                self.frontend.import_file(input_file=str(data_file),
+                                          raise_on_error=True)
+
+                self.assertEqual(self._current(), expected)
@@ -0,0 +1,77 @@
+import json
+import tempfile
+import zipfile
+from logging import Logger
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.test import TransactionTestCase
+
+from caretaker.utils import log, file
+from caretaker.utils.file import FileType
+from caretaker.utils.manifest import SHARD_INDEX_MEMBER
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend
+
+
+class TestExportJSONShardsDjango(TransactionTestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('export-json-shards-test')
+        self.logger.info('Setup for test sharded JSON export from Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test sharded JSON export from Django')
+        pass
+
+    def test(self):
+        self.logger.info('Testing test sharded JSON export from Django')
+
+        # workers open their own connections, so the rows must be committed
+        group = Group.objects.create(name='editors')
+
+        for index in range(250):
+            user = User.objects.create(username='user_{}'.format(index))
+
+            if not index % 2:
+                user.groups.add(group)
+
+        settings.CARETAKER_EXPORT_WORKERS = 2
+        settings.CARETAKER_EXPORT_SHARD_SIZE = 100
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            data_file = self.frontend.export_json(
+                data_file='data.json',
+                output_directory=temporary_directory_name,
+                logger=self.logger)
+
+            del settings.CARETAKER_EXPORT_WORKERS
+            del settings.CARETAKER_EXPORT_SHARD_SIZE
+
+            self.assertEqual(file.determine_type(data_file),
+                             FileType.JSON_SHARDS)
+
+            # the user table is split into three primary key ranges
+            with zipfile.ZipFile(data_file) as zf:
+                index = json.loads(zf.read(SHARD_INDEX_MEMBER))
+
+            user_shards = [shard for shard in index['shards']
+                           if shard['model'] == 'auth.user']
+            self.assertEqual([shard['count'] for shard in user_shards],
+                             [100, 100, 50])
+
+            # a dry run changes nothing
+            User.objects.all().delete()
+
+            self.frontend.import_file(input_file=str(data_file),
+                                      raise_on_error=True, dry_run=True)
+            self.assertEqual(User.objects.count(), 0)
+
+            self.frontend.import_file(input_file=str(data_file),
+                                      raise_on_error=True)
+
+            self.assertEqual(User.objects.count(), 250)
+            self.assertEqual(
+                User.objects.filter(groups__name='editors').count(), 125)
@@ -0,0 +1,100 @@
+import datetime
+import json
+import tempfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.models import Session
+from django.test import TestCase
+from django.utils import timezone
+
+from caretaker.frontend.frontends.database_exporters.django.postgres import \
+    PostgresDatabaseExporter
+from caretaker.utils import log
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend, FrontendError
+
+
+class TestExportSelectionDjango(TestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('export-selection-test')
+        self.logger.info('Setup for test backup model selection in Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test backup model selection in Django')
+        pass
+
+    def _exported(self, output_directory: str, **kwargs) -> set:
+        data_file, _ = self.frontend.create_backup(
+            output_directory=output_directory, archive=False, **kwargs)
+
+        with Path(data_file).open() as in_file:
+            return {item['model'] for item in json.load(in_file)}
+
+    def test(self):
+        self.logger.info('Testing test backup model selection in Django')
+
+        Group.objects.create(name='editors')
+        User.objects.create(username='user')
+        Session.objects.create(
+            session_key='key', session_data='data',
+            expire_date=timezone.now() + datetime.timedelta(days=1))
+
+        settings.CARETAKER_POST_EXECUTE = []
+        settings.CARETAKER_BACKUP_EXCLUDE = ['django_session']
+        settings.CARETAKER_BACKUP_TIERS = {'weekly': ['auth.Group']}
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            # tables and models can be named, and tiers are left out unless
+            # they are selected
+            exported = self._exported(temporary_directory_name)
+
+            self.assertIn('auth.user', exported)
+            self.assertNotIn('sessions.session', exported)
+            self.assertNotIn('auth.group', exported)
+
+            exported = self._exported(temporary_directory_name,
+                                      tiers=['weekly'])
+
+            self.assertIn('auth.group', exported)
+            self.assertNotIn('sessions.session', exported)
+
+            # apps can be named too
+            exported = self._exported(temporary_directory_name,
+                                      include=['auth'], tiers=['weekly'])
+
+            self.assertEqual({label.split('.')[0] for label in exported},
+                             {'auth'})
+
+            with self.assertRaises(FrontendError):
+                self._exported(temporary_directory_name, tiers=['monthly'])
+
+            # SQL dumps leave out the tables of excluded models
+            data_file, _ = self.frontend.create_backup(
+                output_directory=temporary_directory_name, archive=False,
+                sql_mode=True, data_file='data.sql', exclude=['auth'])
+
+            with Path(data_file).open() as in_file:
+                dump = in_file.read()
+
+            tables = [line.split('"')[1] for line in dump.splitlines()
+                      if line.startswith('CREATE TABLE')]
+
+            self.assertIn('django_migrations', tables)
+            self.assertIn('django_content_type', tables)
+            self.assertNotIn('django_session', tables)
+            self.assertFalse([table for table in tables
+                              if table.startswith('auth_')])
+
+        del settings.CARETAKER_BACKUP_EXCLUDE
+        del settings.CARETAKER_BACKUP_TIERS
+
+        self.assertEqual(PostgresDatabaseExporter().selection_args(
+            connection=None, tables=['auth_user'],
+            excluded=['django_session']),
+            ['-c', '--exclude-table=django_session'])
@@ -0,0 +1,114 @@
+import datetime
+import io
+import json
+import tempfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from caretaker.frontend.frontends.json_import import iter_fixture
+from caretaker.utils import log
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend
+
+
+class TestImportJSONBulkDjango(TestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('import-json-bulk-test')
+        self.logger.info('Setup for test bulk JSON import to Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test bulk JSON import to Django')
+        pass
+
+    @staticmethod
+    def _current() -> dict:
+        return {
+            'users': list(User.objects.order_by('pk').values(
+                'pk', 'username', 'email', 'date_joined')),
+            'members': sorted(User.objects.filter(
+                groups__name='editors').values_list('username', flat=True)),
+            'sessions': list(Session.objects.order_by('pk').values()),
+        }
+
+    def test(self):
+        self.logger.info('Testing test bulk JSON import to Django')
+
+        editors = Group.objects.create(name='editors')
+
+        # dumpdata keeps only milliseconds
+        now = timezone.now().replace(microsecond=0)
+
+        users = [User.objects.create(
+            username='user_{}'.format(index),
+            email='user_{}@example.org'.format(index), date_joined=now)
+            for index in range(120)]
+        editors.user_set.add(*users[::3])
+
+        expiry = now + datetime.timedelta(days=1)
+
+        for index in range(30):
+            Session.objects.create(
+                session_key='key_{}'.format(index),
+                session_data='[{"nested": "]"}, ' * index,
+                expire_date=expiry)
+
+        expected = self._current()
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            fixture = Path(temporary_directory_name) / 'data.json'
+            call_command('dumpdata', output=str(fixture), verbosity=0,
+                         indent=2)
+
+            # objects that span blocks, and brackets inside strings, are
+            # parsed as a whole
+            with fixture.open() as in_file:
+                whole = json.load(in_file)
+
+            with fixture.open() as in_file:
+                self.assertEqual(list(iter_fixture(in_file, read_size=7)),
+                                 whole)
+
+            self.assertEqual(list(iter_fixture(io.StringIO(' [ ] '))), [])
+
+            with self.assertRaises(ValueError):
+                list(iter_fixture(io.StringIO('[{"model": "auth.user"}, ')))
+
+            settings.CARETAKER_IMPORT_ENGINE = 'bulk'
+            settings.CARETAKER_IMPORT_BATCH_SIZE = 50
+
+            # rows that exist are overwritten and missing rows are inserted
+            User.objects.filter(pk=users[0].pk).update(username='changed')
+            editors.user_set.remove(users[3])
+            User.objects.filter(pk__gt=users[100].pk).delete()
+            Session.objects.all().delete()
+
+            self.frontend.import_file(input_file=str(fixture),
+                                      raise_on_error=True)
+
+            self.assertEqual(self._current(), expected)
+
+            # an empty database is restored in full and new rows do not
+            # collide with the restored keys
+            Session.objects.all().delete()
+            User.objects.all().delete()
+            Group.objects.all().delete()
+
+            self.frontend.import_file(input_file=str(fixture),
+                                      raise_on_error=True)
+
+            self.assertEqual(self._current(), expected)
+            self.assertGreater(User.objects.create(username='new').pk,
+                               users[-1].pk)
+
+            del settings.CARETAKER_IMPORT_ENGINE
+            del settings.CARETAKER_IMPORT_BATCH_SIZE
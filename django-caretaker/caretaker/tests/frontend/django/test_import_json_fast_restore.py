@@ -0,0 +1,98 @@
+import tempfile
+from logging import Logger
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from caretaker.frontend.frontends.json_import import BulkLoader
+from caretaker.frontend.frontends.utils import DatabasePatcher
+from caretaker.utils import log
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend
+
+
+class TestImportJSONFastRestoreDjango(TestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('import-json-fast-restore-test')
+        self.logger.info('Setup for test fast JSON restore to Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test fast JSON restore to Django')
+        pass
+
+    @staticmethod
+    def _current() -> dict:
+        return {
+            'users': list(User.objects.order_by('pk').values(
+                'pk', 'username', 'date_joined')),
+            'members': sorted(User.objects.filter(
+                groups__name='editors').values_list('username', flat=True)),
+        }
+
+    def test(self):
+        self.logger.info('Testing test fast JSON restore to Django')
+
+        _, importer = DatabasePatcher.patch_importer(connection)
+
+        # the foreign key indexes of the through table can be dropped, but
+        # not the unique index of its pairs
+        indexes = importer.secondary_indexes(connection, 'auth_user_groups')
+
+        self.assertEqual(len(indexes), 2)
+        self.assertTrue(all(sql.startswith('CREATE INDEX')
+                            for _, sql in indexes))
+
+        editors = Group.objects.create(name='editors')
+
+        # dumpdata keeps only milliseconds
+        now = timezone.now().replace(microsecond=0)
+
+        users = [User.objects.create(username='user_{}'.format(index),
+                                     date_joined=now)
+                 for index in range(60)]
+        editors.user_set.add(*users[::2])
+
+        expected = self._current()
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            fixture = Path(temporary_directory_name) / 'data.json'
+            call_command('dumpdata', 'auth', output=str(fixture),
+                         verbosity=0)
+
+            User.objects.all().delete()
+            Group.objects.all().delete()
+
+            settings.CARETAKER_FAST_RESTORE = True
+
+            self.frontend.import_file(input_file=str(fixture),
+                                      raise_on_error=True)
+
+            del settings.CARETAKER_FAST_RESTORE
+
+            self.assertEqual(self._current(), expected)
+
+        # the indexes are rebuilt as they were
+        self.assertEqual(
+            importer.secondary_indexes(connection, 'auth_user_groups'),
+            indexes)
+
+        # and are gone while the loader is running
+        with BulkLoader(defer_indexes=True) as loader:
+            loader.load([{'model': 'auth.group', 'pk': editors.pk,
+                          'fields': {'name': 'writers', 'permissions': []}}])
+            loader._flush()
+
+            self.assertEqual(importer.secondary_indexes(
+                connection, 'auth_group_permissions'), [])
+
+        self.assertEqual(len(importer.secondary_indexes(
+            connection, 'auth_group_permissions')), 2)
+        self.assertEqual(Group.objects.get().name, 'writers')
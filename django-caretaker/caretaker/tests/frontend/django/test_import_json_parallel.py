@@ -0,0 +1,105 @@
+import datetime
+import tempfile
+from logging import Logger
+from pathlib import Path
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase
+from django.utils import timezone
+
+from caretaker.frontend.frontends.json_import import model_dependencies, \
+    plan_units, import_workers
+from caretaker.utils import log
+from caretaker.frontend.abstract_frontend import FrontendFactory, \
+    AbstractFrontend
+
+
+class TestImportJSONParallelDjango(TestCase):
+    def setUp(self):
+        self.logger: Logger = log.get_logger('import-json-parallel-test')
+        self.logger.info('Setup for test parallel JSON import to Django')
+        self.frontend: AbstractFrontend = FrontendFactory.get_frontend('Django')
+        django.setup()
+
+    def tearDown(self):
+        self.logger.info('Teardown for test parallel JSON import to Django')
+        pass
+
+    @staticmethod
+    def _current() -> dict:
+        return {
+            'users': list(User.objects.order_by('pk').values(
+                'pk', 'username', 'date_joined')),
+            'members': sorted(User.objects.filter(
+                groups__name='editors').values_list('username', flat=True)),
+            'sessions': list(Session.objects.order_by('pk').values()),
+        }
+
+    def test(self):
+        self.logger.info('Testing test parallel JSON import to Django')
+
+        # models in a cycle of references are loaded as one unit
+        cycle = frozenset(['a', 'b'])
+
+        self.assertEqual(plan_units({'a': {'b'}, 'b': {'a'}, 'c': {'a'},
+                                     'd': set()}),
+                         {cycle: set(), frozenset(['c']): {cycle},
+                          frozenset(['d']): set()})
+
+        self.assertEqual(model_dependencies(
+            ['auth.user', 'auth.group', 'auth.permission',
+             'contenttypes.contenttype', 'sessions.session']),
+            {'auth.user': {'auth.group', 'auth.permission'},
+             'auth.group': {'auth.permission'},
+             'auth.permission': {'contenttypes.contenttype'},
+             'contenttypes.contenttype': set(),
+             'sessions.session': set()})
+
+        # workers commit on their own, so a load inside a transaction (as
+        # every TestCase is) runs in a single process on any database
+        with mock.patch.object(connections['default'], 'vendor',
+                               'postgresql'):
+            self.assertTrue(connections['default'].in_atomic_block)
+            self.assertEqual(import_workers(database='default', workers=4), 1)
+
+        editors = Group.objects.create(name='editors')
+
+        # dumpdata keeps only milliseconds
+        now = timezone.now().replace(microsecond=0)
+
+        users = [User.objects.create(username='user_{}'.format(index),
+                                     date_joined=now)
+                 for index in range(80)]
+        editors.user_set.add(*users[::4])
+
+        for index in range(20):
+            Session.objects.create(
+                session_key='key_{}'.format(index),
+                session_data='data {}'.format(index),
+                expire_date=now + datetime.timedelta(days=1))
+
+        expected = self._current()
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            fixture = Path(temporary_directory_name) / 'data.json'
+            call_command('dumpdata', output=str(fixture), verbosity=0)
+
+            settings.CARETAKER_IMPORT_WORKERS = 2
+
+            Session.objects.all().delete()
+            User.objects.all().delete()
+            Group.objects.all().delete()
+
+            # SQLite is loaded by a single process, in dependency order
+            self.frontend.import_file(input_file=str(fixture),
+                                      raise_on_error=True)
+
+            del settings.CARETAKER_IMPORT_WORKERS
+
+            self.assertEqual(self._current(), expected)
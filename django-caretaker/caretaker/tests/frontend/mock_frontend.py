@@ -22,21 +22,30 @@ class MockFrontend(AbstractFrontend):
         pass
 
     @staticmethod
-    def export_json(data_file, logger, output_directory) -> io.StringIO:
+    def export_json(data_file, logger, output_directory,
+                    incremental: bool = False,
+                    previous_manifest: dict | None = None,
+                    include: list[str] | None = None,
+                    exclude: list[str] | None = None) -> Path:
         """
         Dump JSON using the dumpdata command
 
         :param data_file: the data file to deposit to
         :param logger: the logger object
         :param output_directory: the output directory
-        :return:
+        :param incremental: whether to export only the rows that changed since previous_manifest
+        :param previous_manifest: the data manifest of the previous export (a full export is taken if None)
+        :param include: if not empty, export only the apps, models and tables that these name
+        :param exclude: apps, models and tables to leave out
+        :return: a pathlib.Path object pointing to the data file
         """
         pass
 
     @staticmethod
     def export_sql(database: str = '', alternative_binary: str = '',
                    alternative_args: list | None = None,
-                   output_file: str = '-') -> str:
+                   output_file: str = '-',
+                   tables: list[str] | None = None) -> str:
         """
         Export SQL from the database using the specific provider
 
@@ -44,6 +53,7 @@ class MockFrontend(AbstractFrontend):
         :param alternative_binary: a different binary file to run
         :param alternative_args: a different set of cmdline args to pass
         :param output_file: an output file to write to rather than stdout
+        :param tables: the tables of Django's models to export, leaving out the rest (None exports everything)
         :return: a string of the database output
         """
 
@@ -131,6 +141,22 @@ class MockFrontend(AbstractFrontend):
         """
         pass
 
+    @staticmethod
+    def list_archive(remote_key: str, backend: AbstractBackend,
+                     bucket_name: str, backup_version: str = '',
+                     raise_on_error: bool = False) -> list[dict] | None:
+        """
+        Lists the files in a version of a remote archive without downloading it
+
+        :param remote_key: the remote key (filename) of the archive
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param backup_version: the version to list (the latest if empty)
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of dictionaries that contain the keys "path", "size", "compressed_size" and "mtime", or None on error
+        """
+        pass
+
     @staticmethod
     def pull_backup(backup_version: str, out_file: str, remote_key: str,
                     backend: AbstractBackend, bucket_name: str,
@@ -213,3 +239,73 @@ class MockFrontend(AbstractFrontend):
         :return: 2-tuple of pathlib.Path objects to the data file & archive file
         """
         pass
+
+    @staticmethod
+    def push_content(path_list: list | None, backend: AbstractBackend,
+                     bucket_name: str, archive_file: str = 'media.zip',
+                     raise_on_error: bool = False) -> dict | None:
+        """
+        Push media as content-addressed blobs and a manifest of paths to digests
+
+        :param path_list: the list of paths to back up
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from (e.g. media.zip gives media.content.json)
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: the manifest dictionary or None if a blob could not be stored
+        """
+        pass
+
+    @staticmethod
+    def restore_content(backend: AbstractBackend, bucket_name: str,
+                        archive_file: str = 'media.zip',
+                        backup_version: str = '', dry_run: bool = False,
+                        raise_on_error: bool = False) -> bool:
+        """
+        Rebuild media from a content manifest and its blobs
+
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from
+        :param backup_version: the version of the manifest to restore (the latest if empty)
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a true/false boolean of success
+        """
+        pass
+
+    @staticmethod
+    def collect_garbage(backend: AbstractBackend, bucket_name: str,
+                        archive_file: str = 'media.zip',
+                        dry_run: bool = False,
+                        raise_on_error: bool = False) -> list[str]:
+        """
+        Delete content-addressed blobs that no stored manifest references
+
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param archive_file: the archive filename that the manifest key is derived from
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of the digests that were (or, in dry run mode, would be) deleted
+        """
+        pass
+
+    @staticmethod
+    def restore_paths(patterns: list[str], backend: AbstractBackend,
+                      bucket_name: str, remote_key: str = 'media.zip',
+                      backup_version: str = '', dry_run: bool = False,
+                      raise_on_error: bool = False) -> list[str]:
+        """
+        Restore only the members of a remote zip archive that match path globs
+
+        :param patterns: shell-style globs matched against absolute paths (e.g. /var/www/media/users/42/*)
+        :param backend: the backend to use
+        :param bucket_name: the name of the bucket/store
+        :param remote_key: the remote key (filename) of the archive
+        :param backup_version: the version of the archive to read (the latest if empty)
+        :param dry_run: whether to operate in dry run mode
+        :param raise_on_error: whether to raise underlying exceptions if there is a client error
+        :return: a list of the restored (or, in dry run mode, matching) paths
+        """
+        pass
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from caretaker.frontend.frontends.utils import BufferedProcessReader
+from caretaker.tests.utils import captured_output
+from caretaker.utils import log
+
+
+class TestProcessReader(TestCase):
+    def setUp(self):
+        self.logger = log.get_logger('process-reader-test')
+        self.logger.info('Setup for process reader')
+
+    def tearDown(self):
+        self.logger.info('Teardown for process reader')
+        pass
+
+    @staticmethod
+    def _process(data: bytes) -> subprocess.Popen:
+        # write the data in small pieces so that reads see partial output
+        return subprocess.Popen(
+            [sys.executable, '-c',
+             'import sys\n'
+             'data = sys.stdin.buffer.read()\n'
+             'for offset in range(0, len(data), 7):\n'
+             '    sys.stdout.buffer.write(data[offset:offset + 7])\n'
+             '    sys.stdout.buffer.flush()\n'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=8192)
+
+    def _run(self, data: bytes, output_filename: str,
+             buffer_size: int = 1024 * 1024) -> BufferedProcessReader:
+        process = self._process(data)
+        process.stdin.write(data)
+        process.stdin.close()
+
+        reader = BufferedProcessReader(process)
+        reader.buffer_size = buffer_size
+
+        self.assertEqual(reader.handle_process(
+            output_filename=output_filename), len(data))
+        self.assertEqual(process.returncode, 0)
+
+        return reader
+
+    def test(self):
+        self.logger.info('Testing process reader')
+
+        data = os.urandom(3 * 1024 * 1024 + 11)
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            output_file = Path(temporary_directory_name) / 'output.bin'
+
+            # spliced where the platform allows it
+            self._run(data, str(output_file))
+            self.assertEqual(output_file.read_bytes(), data)
+
+            # and copied in chunks where it does not
+            splice = getattr(os, 'splice', None)
+
+            try:
+                if splice:
+                    del os.splice
+
+                self._run(data, str(output_file), buffer_size=4096)
+            finally:
+                if splice:
+                    os.splice = splice
+
+            self.assertEqual(output_file.read_bytes(), data)
+
+        # multibyte characters split across reads are decoded whole
+        text = 'café ☃ \U0001f600 ' * 1000
+
+        with captured_output() as (stdout, stderr):
+            self._run(text.encode('utf-8'), '-', buffer_size=5)
+
+        self.assertEqual(stdout.getvalue(), text)
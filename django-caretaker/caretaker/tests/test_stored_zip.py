@@ -0,0 +1,83 @@
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from caretaker.utils import log
+from caretaker.utils.zip import create_zip_file, unzip_file, \
+    DEFAULT_STORED_EXTENSIONS, DEFAULT_ENTROPY_THRESHOLD
+
+
+class TestStoredZip(TestCase):
+    def setUp(self):
+        self.logger = log.get_logger('stored-zip-test')
+        self.logger.info('Setup for stored zip')
+
+    def tearDown(self):
+        self.logger.info('Teardown for stored zip')
+        pass
+
+    def test(self):
+        self.logger.info('Testing stored zip')
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            source = Path(temporary_directory_name) / 'source'
+            source.mkdir()
+
+            contents = {
+                # stored by extension
+                source / 'photo.JPG': b'not really a jpeg ' * 100,
+                # stored by magic bytes
+                source / 'upload': b'\x89PNG\r\n\x1a\n' + b'\x00' * 1000,
+                # stored by entropy
+                source / 'random.bin': os.urandom(128 * 1024),
+                # deflated
+                source / 'notes.txt': b'plain text compresses well\n' * 100,
+                source / 'empty.txt': b'',
+            }
+
+            for path, content in contents.items():
+                path.write_bytes(content)
+
+            expected = {
+                'photo.JPG': zipfile.ZIP_STORED,
+                'upload': zipfile.ZIP_STORED,
+                'random.bin': zipfile.ZIP_STORED,
+                'notes.txt': zipfile.ZIP_DEFLATED,
+                'empty.txt': zipfile.ZIP_DEFLATED,
+            }
+
+            for workers in [1, 4]:
+                output_file = create_zip_file(
+                    input_paths=[source],
+                    output_file=Path(temporary_directory_name) /
+                    'media_{}.zip'.format(workers),
+                    workers=workers,
+                    stored_extensions=DEFAULT_STORED_EXTENSIONS,
+                    entropy_threshold=DEFAULT_ENTROPY_THRESHOLD)
+
+                with zipfile.ZipFile(output_file) as zf:
+                    self.assertIsNone(zf.testzip())
+
+                    for info in zf.infolist():
+                        self.assertEqual(info.compress_type,
+                                         expected[Path(info.filename).name])
+
+                for path in contents:
+                    path.unlink()
+
+                unzip_file(input_file=output_file, dry_run=False)
+
+                for path, content in contents.items():
+                    self.assertEqual(path.read_bytes(), content)
+
+            # with no settings everything is deflated, as before
+            output_file = create_zip_file(
+                input_paths=[source],
+                output_file=Path(temporary_directory_name) / 'deflated.zip')
+
+            with zipfile.ZipFile(output_file) as zf:
+                for info in zf.infolist():
+                    self.assertEqual(info.compress_type, zipfile.ZIP_DEFLATED)
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from django.test import TestCase
+
+from caretaker.frontend.abstract_frontend import FrontendFactory
+from caretaker.utils import log, file
+from caretaker.utils.file import FileType
+from caretaker.utils.manifest import build_manifest
+from caretaker.utils.tar import create_tar_file, untar_file, zstandard
+
+
+@unittest.skipIf(zstandard is None, 'zstandard is not installed')
+class TestTarZstd(TestCase):
+    def setUp(self):
+        self.logger = log.get_logger('tar-test')
+        self.logger.info('Setup for tar.zst archives')
+
+    def tearDown(self):
+        self.logger.info('Teardown for tar.zst archives')
+        pass
+
+    def test(self):
+        self.logger.info('Testing tar.zst archives')
+
+        frontend = FrontendFactory.get_frontend('Django')
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            source = Path(temporary_directory_name) / 'source'
+            (source / 'nested' / 'empty').mkdir(parents=True)
+
+            contents = {}
+
+            for index in range(20):
+                path = source / 'nested' / 'file_{}.txt'.format(index)
+                contents[path] = 'line {}\n'.format(index) * 1000
+                path.write_text(contents[path])
+
+            base_manifest = build_manifest(input_paths=[source])
+
+            base = create_tar_file(
+                input_paths=[source],
+                output_file=Path(temporary_directory_name) / 'media.tar.zst',
+                manifest=base_manifest, level=5)
+
+            self.assertEqual(file.determine_type(base), FileType.TAR_ARCHIVE)
+
+            # an intact tree is left alone
+            counts = untar_file(input_file=base, dry_run=False,
+                                skip_unchanged=True)
+            self.assertEqual(counts['written'], 0)
+            self.assertEqual(counts['skipped'], 20)
+
+            # an incremental archive on top of the base
+            deleted = source / 'nested' / 'file_0.txt'
+            changed = source / 'nested' / 'file_1.txt'
+
+            changed.write_text('changed')
+            contents[changed] = 'changed'
+            deleted.unlink()
+            del contents[deleted]
+
+            delta = create_tar_file(
+                input_paths=[source],
+                output_file=Path(temporary_directory_name) / 'delta.tar.zst',
+                manifest=build_manifest(input_paths=[source],
+                                        previous=base_manifest))
+
+            # restore everything through the frontend
+            for path in contents:
+                path.unlink()
+
+            self.assertTrue(frontend.import_file(
+                input_file=str(base), raise_on_error=True,
+                delta_files=[str(delta)]))
+
+            self.assertFalse(deleted.exists())
+            self.assertTrue((source / 'nested' / 'empty').is_dir())
+
+            for path, content in contents.items():
+                self.assertEqual(path.read_text(), content)
@@ -0,0 +1,74 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from caretaker.utils import log
+from caretaker.utils.zip import create_zip_file, unzip_file
+
+
+class TestParallelUnzip(TestCase):
+    def setUp(self):
+        self.logger = log.get_logger('parallel-unzip-test')
+        self.logger.info('Setup for parallel unzip')
+
+    def tearDown(self):
+        self.logger.info('Teardown for parallel unzip')
+        pass
+
+    def test(self):
+        self.logger.info('Testing parallel unzip')
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            source = Path(temporary_directory_name) / 'source'
+            (source / 'nested').mkdir(parents=True)
+
+            contents = {}
+
+            for index in range(10):
+                path = source / 'nested' / 'file_{}.txt'.format(index)
+                contents[path] = 'contents of file {}'.format(index)
+                path.write_text(contents[path])
+
+            archive = create_zip_file(
+                input_paths=[source],
+                output_file=Path(temporary_directory_name) / 'media.zip')
+
+            # an intact tree is left alone
+            counts = unzip_file(input_file=archive, dry_run=False, workers=4,
+                                skip_unchanged=True)
+            self.assertEqual(counts['written'], 0)
+            self.assertEqual(counts['skipped'], 10)
+
+            # a deleted file and a file with the same size and mtime but
+            # different contents are both restored
+            deleted = source / 'nested' / 'file_0.txt'
+            corrupted = source / 'nested' / 'file_1.txt'
+            stat = corrupted.stat()
+
+            deleted.unlink()
+            corrupted.write_text('x' * len(contents[corrupted]))
+            os.utime(corrupted, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+            counts = unzip_file(input_file=archive, dry_run=True, workers=4,
+                                skip_unchanged=True)
+            self.assertEqual(counts['written'], 2)
+            self.assertFalse(deleted.exists())
+
+            counts = unzip_file(input_file=archive, dry_run=False, workers=4,
+                                skip_unchanged=True)
+            self.assertEqual(counts['written'], 2)
+            self.assertEqual(counts['skipped'], 8)
+
+            for path, content in contents.items():
+                self.assertEqual(path.read_text(), content)
+
+            # restored files keep the archived mtime, so they are skipped next
+            # time, and a full restore still rewrites everything
+            counts = unzip_file(input_file=archive, dry_run=False, workers=4,
+                                skip_unchanged=True)
+            self.assertEqual(counts['skipped'], 10)
+
+            counts = unzip_file(input_file=archive, dry_run=False)
+            self.assertEqual(counts['written'], 10)
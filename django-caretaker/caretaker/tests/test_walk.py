@@ -0,0 +1,91 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from caretaker.utils import log
+from caretaker.utils.manifest import build_manifest
+from caretaker.utils.walk import Walker, walk_paths
+from caretaker.utils.zip import create_zip_file, archive_members
+
+
+class TestWalk(TestCase):
+    def setUp(self):
+        self.logger = log.get_logger('walk-test')
+        self.logger.info('Setup for walk')
+
+    def tearDown(self):
+        self.logger.info('Teardown for walk')
+        pass
+
+    def test(self):
+        self.logger.info('Testing walk')
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            source = Path(temporary_directory_name) / 'source'
+
+            for directory in ['a/deep/er', 'b/.git/objects', 'b/cache',
+                              'c/thumbs', 'empty']:
+                (source / directory).mkdir(parents=True)
+
+            kept = [source / 'top.txt', source / 'a' / 'one.txt',
+                    source / 'a' / 'deep' / 'er' / 'two.txt',
+                    source / 'b' / 'three.jpg']
+            dropped = [source / 'b' / '.git' / 'objects' / 'pack',
+                       source / 'b' / 'cache' / 'page.html',
+                       source / 'c' / 'thumbs' / 'small.jpg',
+                       source / 'a' / 'upload.tmp',
+                       source / 'b' / 'huge.bin']
+
+            for path in kept + dropped:
+                path.write_bytes(b'x' * (2048 if path.name == 'huge.bin'
+                                         else 16))
+
+            # no rules is the same as rglob
+            self.assertEqual(
+                sorted(walk_paths([source], directories=True)),
+                sorted(source.rglob('*')))
+
+            for workers in [1, 4]:
+                walker = Walker(exclude=['.git', 'cache', '*.tmp'],
+                                exclude_regex=[r'/c/thumbs(/|$)'],
+                                max_file_size=1024, workers=workers)
+
+                self.assertEqual(sorted(walk_paths([source], walker)),
+                                 sorted(kept))
+
+                # excluded subtrees are pruned, and empty ones are kept
+                directories = set(walk_paths([source], walker,
+                                             directories=True))
+                self.assertIn(source / 'empty', directories)
+                self.assertNotIn(source / 'b' / '.git', directories)
+                self.assertNotIn(source / 'c' / 'thumbs', directories)
+
+            # include globs select files, and those with a slash match the
+            # whole path
+            walker = Walker(include=['*.jpg', '{}/a/*.txt'.format(source)])
+            self.assertEqual(
+                sorted(walk_paths([source], walker)),
+                sorted([source / 'a' / 'one.txt',
+                        source / 'a' / 'deep' / 'er' / 'two.txt',
+                        source / 'b' / 'three.jpg',
+                        source / 'c' / 'thumbs' / 'small.jpg']))
+
+            # the archive and the manifest follow the same rules
+            walker = Walker(exclude=['.git', 'cache', '*.tmp', 'thumbs'],
+                            max_file_size=1024)
+
+            self.assertEqual(
+                sorted(build_manifest([source], walker=walker)['files']),
+                sorted(str(path) for path in kept))
+
+            members = set(archive_members([source], manifest=None,
+                                          walker=walker))
+            archive = create_zip_file(
+                input_paths=[source],
+                output_file=Path(temporary_directory_name) / 'media.zip',
+                walker=walker)
+
+            self.assertTrue(archive.exists())
+            self.assertTrue(set(kept) <= members)
+            self.assertFalse(set(dropped) & members)
@@ -0,0 +1,70 @@
+import tempfile
+import zipfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from caretaker.utils import log
+from caretaker.utils.zip import create_zip_file, unzip_file
+
+
+class TestParallelZip(TestCase):
+    def setUp(self):
+        self.logger = log.get_logger('parallel-zip-test')
+        self.logger.info('Setup for parallel zip')
+
+    def tearDown(self):
+        self.logger.info('Teardown for parallel zip')
+        pass
+
+    def test(self):
+        self.logger.info('Testing parallel zip')
+
+        with tempfile.TemporaryDirectory() as temporary_directory_name:
+            source = Path(temporary_directory_name) / 'source'
+            (source / 'nested' / 'empty').mkdir(parents=True)
+
+            contents = {}
+
+            for index in range(20):
+                path = source / 'nested' / 'file_{}.txt'.format(index)
+                contents[path] = ('line {}\n'.format(index) * 1000).encode()
+                path.write_bytes(contents[path])
+
+            # an empty file and a file larger than the read chunk size
+            contents[source / 'empty.txt'] = b''
+            contents[source / 'large.bin'] = bytes(range(256)) * 8192
+
+            for path in [source / 'empty.txt', source / 'large.bin']:
+                path.write_bytes(contents[path])
+
+            serial_zip = create_zip_file(
+                input_paths=[source],
+                output_file=Path(temporary_directory_name) / 'serial.zip')
+
+            parallel_zip = create_zip_file(
+                input_paths=[source],
+                output_file=Path(temporary_directory_name) / 'parallel.zip',
+                workers=4)
+
+            # the parallel archive holds the same members as the serial one
+            with zipfile.ZipFile(serial_zip) as serial, \
+                    zipfile.ZipFile(parallel_zip) as parallel:
+                self.assertEqual(serial.namelist(), parallel.namelist())
+                self.assertIsNone(parallel.testzip())
+
+                for info in parallel.infolist():
+                    if not info.is_dir():
+                        self.assertEqual(info.compress_type,
+                                         zipfile.ZIP_DEFLATED)
+
+            # and it restores through the normal unzip path
+            for path in contents:
+                path.unlink()
+
+            unzip_file(input_file=parallel_zip, dry_run=False)
+
+            for path, content in contents.items():
+                self.assertEqual(path.read_bytes(), content)
+
+            self.assertTrue((source / 'nested' / 'empty').is_dir())
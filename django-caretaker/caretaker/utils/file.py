@@ -1,13 +1,45 @@
+import contextlib
+import gzip
 import importlib.resources as pkg_resources
+import io
+import tarfile
 import zipfile
 from enum import Enum
 from pathlib import Path
-from typing import TextIO
+from typing import BinaryIO, TextIO
 
 from django.conf import settings
 from django.template import Template, Context
 
 from caretaker.backend.abstract_backend import AbstractBackend
+from caretaker.utils.manifest import SHARD_INDEX_MEMBER
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# the magic bytes at the start of every zstd frame
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# the header string at the start of every SQLite database file
+SQLITE_MAGIC = b'SQLite format 3\x00'
+
+# the magic bytes at the start of every gzip member
+GZIP_MAGIC = b'\x1f\x8b'
+
+# the magic bytes at the start of a pg_dump custom archive and of the toc.dat
+# of a directory archive
+POSTGRES_DUMP_MAGIC = b'PGDMP'
+
+# the member that a packed pg_dump directory archive starts with
+POSTGRES_TOC_MEMBER = 'toc.dat'
+
+# the member that a packed mydumper directory starts with
+MYDUMPER_METADATA_MEMBER = 'metadata'
+
+# the compressions that can be applied to SQL dumps
+SQL_COMPRESSIONS = ['none', 'gzip', 'zstd']
 
 
 def normalize_path(path: str | Path) -> Path:
@@ -62,6 +94,11 @@ class FileType(Enum):
     JSON = 1
     ARCHIVE = 2
     UNKNOWN = 3
+    TAR_ARCHIVE = 4
+    JSON_SHARDS = 5
+    SQLITE_DATABASE = 6
+    POSTGRES_ARCHIVE = 7
+    MYSQL_ARCHIVE = 8
 
 
 def determine_type(input_file: Path) -> FileType:
@@ -73,7 +110,21 @@ def determine_type(input_file: Path) -> FileType:
     """
     try:
         if zipfile.is_zipfile(input_file):
+            with zipfile.ZipFile(input_file) as zf:
+                if SHARD_INDEX_MEMBER in zf.namelist():
+                    return FileType.JSON_SHARDS
+
             return FileType.ARCHIVE
+        elif is_tar_zstd(input_file):
+            return FileType.TAR_ARCHIVE
+        elif is_sqlite_database(input_file):
+            return FileType.SQLITE_DATABASE
+        elif postgres_archive_format(input_file):
+            return FileType.POSTGRES_ARCHIVE
+        elif is_mydumper_archive(input_file):
+            return FileType.MYSQL_ARCHIVE
+        elif compression_type(input_file) != 'none':
+            return FileType.SQL
         else:
             with input_file.open('r') as in_file:
                 first_character = in_file.read(1)
@@ -83,3 +134,240 @@ def determine_type(input_file: Path) -> FileType:
                     return FileType.SQL
     except OSError:
         return FileType.UNKNOWN
+
+
+def is_sqlite_database(input_file: Path) -> bool:
+    """
+    Check whether a file is an SQLite database rather than an SQL dump
+
+    :param input_file: the file to check
+    :return: True if the file starts with the SQLite header string
+    """
+    with Path(input_file).open('rb') as in_file:
+        return in_file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+
+
+def postgres_archive_format(input_file: Path) -> str | None:
+    """
+    Determine the format of a pg_dump archive
+
+    A directory archive is packed into an uncompressed tar that starts with
+    its toc.dat, since the files that pg_dump writes are compressed already.
+
+    :param input_file: the file to check
+    :return: 'custom', 'directory' or None if the file is not a pg_dump archive
+    """
+    with Path(input_file).open('rb') as in_file:
+        header = in_file.read(tarfile.BLOCKSIZE + len(POSTGRES_DUMP_MAGIC))
+
+    if header.startswith(POSTGRES_DUMP_MAGIC):
+        return 'custom'
+
+    if _first_tar_member(header) == POSTGRES_TOC_MEMBER and \
+            header[tarfile.BLOCKSIZE:].startswith(POSTGRES_DUMP_MAGIC):
+        return 'directory'
+
+    return None
+
+
+def is_mydumper_archive(input_file: Path) -> bool:
+    """
+    Check whether a file is a packed mydumper directory
+
+    :param input_file: the file to check
+    :return: True if the file is an uncompressed tar that starts with mydumper's metadata
+    """
+    with Path(input_file).open('rb') as in_file:
+        header = in_file.read(tarfile.BLOCKSIZE)
+
+    return _first_tar_member(header) == MYDUMPER_METADATA_MEMBER
+
+
+def _first_tar_member(header: bytes) -> str | None:
+    """
+    The name of the first member of an uncompressed tar
+
+    :param header: the first block of the file
+    :return: the name, or None if the block is not a tar header
+    """
+    # every POSIX, GNU and PAX tar header has its magic at offset 257
+    if header[257:262] != b'ustar':
+        return None
+
+    return header[:100].rstrip(b'\x00').decode('utf-8', errors='replace')
+
+
+def is_tar_zstd(input_file: Path) -> bool:
+    """
+    Check whether a file is a zstd-compressed tar
+
+    Without zstandard installed, any zstd stream is assumed to be a tar.
+
+    :param input_file: the file to check
+    :return: True if the file is a zstd-compressed tar
+    """
+    with Path(input_file).open('rb') as in_file:
+        if in_file.read(len(ZSTD_MAGIC)) != ZSTD_MAGIC:
+            return False
+
+        if zstandard is None:
+            return True
+
+        in_file.seek(0)
+
+        header = b''
+
+        with zstandard.ZstdDecompressor().stream_reader(in_file) as reader:
+            while len(header) < tarfile.BLOCKSIZE and \
+                    (chunk := reader.read(tarfile.BLOCKSIZE - len(header))):
+                header += chunk
+
+    # every POSIX, GNU and PAX tar header has its magic at offset 257
+    return header[257:262] == b'ustar'
+
+
+def compression_type(input_file: Path) -> str:
+    """
+    Determine how a file is compressed from its magic bytes
+
+    :param input_file: the file to check
+    :return: 'gzip', 'zstd' or 'none'
+    """
+    with Path(input_file).open('rb') as in_file:
+        header = in_file.read(len(ZSTD_MAGIC))
+
+    if header.startswith(GZIP_MAGIC):
+        return 'gzip'
+    elif header == ZSTD_MAGIC:
+        return 'zstd'
+
+    return 'none'
+
+
+def _require_zstandard() -> None:
+    """
+    Raise an informative error if zstandard is not installed
+
+    :raises ImportError: if zstandard is not installed
+    :return: None
+    """
+    if zstandard is None:
+        raise ImportError('zstd compression needs the zstandard package '
+                          '(pip install django-caretaker[zstd])')
+
+
+class _ZstdReader(io.RawIOBase):
+    """
+    A zstd decompressing reader that raises an error for a truncated stream
+
+    zstandard's own stream_reader ends quietly where the input does, which
+    would pass half a dump to a database client as if it were all of it.
+    """
+
+    def __init__(self, in_file: BinaryIO):
+        self._in_file = in_file
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+        self._pending = b''
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Decompress into a buffer
+
+        :param buffer: the buffer to fill
+        :raises EOFError: if the input ends part of the way through a frame
+        :return: the number of bytes read, or 0 at the end of the stream
+        """
+        while self._offset == len(self._pending):
+            chunk = self._in_file.read(io.DEFAULT_BUFFER_SIZE * 16)
+
+            if not chunk:
+                if not self._decompressor.eof:
+                    raise EOFError('The zstd stream ended before the end '
+                                   'of its frame')
+
+                return 0
+
+            if self._decompressor.eof:
+                # another frame follows the one that just ended
+                self._decompressor = \
+                    zstandard.ZstdDecompressor().decompressobj()
+
+            self._pending = self._decompressor.decompress(chunk)
+            self._offset = 0
+
+            while self._decompressor.eof and self._decompressor.unused_data:
+                unused = self._decompressor.unused_data
+                self._decompressor = \
+                    zstandard.ZstdDecompressor().decompressobj()
+                self._pending += self._decompressor.decompress(unused)
+
+        size = min(len(buffer), len(self._pending) - self._offset)
+        buffer[:size] = self._pending[self._offset:self._offset + size]
+        self._offset += size
+
+        return size
+
+
+@contextlib.contextmanager
+def compressed_writer(out_file: BinaryIO, compression: str,
+                      level: int | None = None, threads: int = 0):
+    """
+    Compress everything written to a binary file as a single stream
+
+    The file is left open, so that it can be stdout.
+
+    :param out_file: the binary file to write the compressed stream to
+    :param compression: one of SQL_COMPRESSIONS
+    :param level: the compression level (None uses 6 for gzip and 3 for zstd)
+    :param threads: the number of zstd compression threads (0 compresses on the calling thread, -1 uses every core)
+    :raises ValueError: if the compression is not one of SQL_COMPRESSIONS
+    :return: a writable binary file
+    """
+    if compression == 'none':
+        yield out_file
+    elif compression == 'gzip':
+        # a zero mtime keeps the output the same for the same input
+        with gzip.GzipFile(fileobj=out_file, mode='wb', mtime=0,
+                           compresslevel=6 if level is None else level) \
+                as writer:
+            yield writer
+    elif compression == 'zstd':
+        _require_zstandard()
+
+        compressor = zstandard.ZstdCompressor(
+            level=3 if level is None else level, threads=threads)
+
+        with compressor.stream_writer(out_file, closefd=False) as writer:
+            yield writer
+    else:
+        raise ValueError('Unknown compression {}'.format(compression))
+
+
+@contextlib.contextmanager
+def compressed_reader(input_file: Path, compression: str):
+    """
+    Open a file for reading, decompressing it as it is read
+
+    :param input_file: the file to read
+    :param compression: one of SQL_COMPRESSIONS, as found by compression_type
+    :raises ValueError: if the compression is not one of SQL_COMPRESSIONS
+    :return: a readable binary file
+    """
+    if compression == 'none':
+        with Path(input_file).open('rb') as reader:
+            yield reader
+    elif compression == 'gzip':
+        with gzip.open(input_file, 'rb') as reader:
+            yield reader
+    elif compression == 'zstd':
+        _require_zstandard()
+
+        with Path(input_file).open('rb') as in_file, \
+                io.BufferedReader(_ZstdReader(in_file)) as reader:
+            yield reader
+    else:
+        raise ValueError('Unknown compression {}'.format(compression))
@@ -0,0 +1,275 @@
+import hashlib
+import io
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from caretaker.utils.walk import Walker
+
+# the name under which a manifest is embedded inside an archive
+MANIFEST_MEMBER = '.caretaker/manifest.json'
+
+MANIFEST_VERSION = 1
+
+# the name under which the index of a sharded JSON export is stored
+SHARD_INDEX_MEMBER = '.caretaker/shards.json'
+
+# the prefix under which content-addressed blobs are stored in a bucket
+BLOB_PREFIX = 'blobs'
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def manifest_key(remote_key: str) -> str:
+    """
+    The remote key under which the manifest of a remote key is stored
+
+    :param remote_key: the remote key (filename) of the archive
+    :return: the remote key of the manifest
+    """
+    return '{}.manifest.json'.format(remote_key)
+
+
+def content_key(archive_file: str) -> str:
+    """
+    The remote key under which content-addressed manifests are stored
+
+    :param archive_file: the remote key (filename) of the archive, e.g. media.zip
+    :return: the remote key of the content manifest, e.g. media.content.json
+    """
+    return '{}.content.json'.format(Path(archive_file).stem)
+
+
+def blob_key(digest: str) -> str:
+    """
+    The remote key of a content-addressed blob
+
+    :param digest: the SHA-256 hex digest of the blob
+    :return: the remote key of the blob
+    """
+    return '{}/{}/{}'.format(BLOB_PREFIX, digest[:2], digest)
+
+
+def digest_key(remote_key: str) -> str:
+    """
+    The remote key under which the SHA-256 digest of a remote key is stored
+
+    :param remote_key: the remote key (filename) of the object, e.g. data.json
+    :return: the remote key of the digest, e.g. data.json.sha256
+    """
+    return '{}.sha256'.format(remote_key)
+
+
+def write_digest(digest: str, remote_key: str, output_file: Path) -> None:
+    """
+    Write a digest in the format read by sha256sum --check
+
+    :param digest: the SHA-256 hex digest
+    :param remote_key: the remote key (filename) that the digest is of
+    :param output_file: the file to write
+    :return: None
+    """
+    Path(output_file).write_text('{}  {}\n'.format(digest, remote_key))
+
+
+def read_digest(in_file: BinaryIO) -> str:
+    """
+    Read a digest written by write_digest from a file-like object
+
+    :param in_file: the file-like object to read
+    :return: the SHA-256 hex digest
+    """
+    return in_file.read().decode('ascii').split()[0]
+
+
+class HashingWriter(io.RawIOBase):
+    """
+    A write-only stream that hashes everything written to it on the way
+    through to another stream
+    """
+
+    def __init__(self, out_file: BinaryIO):
+        super().__init__()
+
+        self.out_file = out_file
+        self._digest = hashlib.sha256()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        """
+        Hash bytes and write them to the underlying stream
+
+        :param data: a bytes-like object
+        :return: the number of bytes written
+        """
+        self._digest.update(data)
+        self.out_file.write(data)
+
+        return memoryview(data).nbytes
+
+    def hexdigest(self) -> str:
+        """
+        The SHA-256 digest of everything written so far
+
+        :return: a hex digest
+        """
+        return self._digest.hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    """
+    Compute the SHA-256 digest of a file
+
+    :param path: the file to hash
+    :return: a hex digest
+    """
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as in_file:
+        while chunk := in_file.read(_CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def build_manifest(input_paths: list, previous: dict | None = None,
+                   max_chain: int = 0, walker: Walker | None = None) -> dict:
+    """
+    Build a manifest of every file under the input paths
+
+    Files whose size and mtime match the previous manifest keep their previous
+    hash, so only new or modified files are read from disk.
+
+    :param input_paths: a list of input directories
+    :param previous: the manifest of the previous archive or None
+    :param max_chain: the number of incremental archives allowed before a new full archive is taken (0 for no limit)
+    :param walker: the walker that selects the files to include (all files if None)
+    :return: a manifest dictionary
+    """
+    files = scan_files(input_paths=input_paths,
+                       previous_files=previous['files'] if previous else {},
+                       walker=walker)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'id': str(uuid.uuid4()),
+        'created': time.time(),
+        'type': 'full',
+        'parent': None,
+        'chain': 0,
+        'files': files,
+        'changed': sorted(files),
+        'deleted': [],
+    }
+
+    if previous and (not max_chain or previous['chain'] < max_chain):
+        changed, deleted = diff_manifests(previous=previous, current=manifest)
+
+        manifest.update({
+            'type': 'incremental',
+            'parent': previous['id'],
+            'chain': previous['chain'] + 1,
+            'changed': changed,
+            'deleted': deleted,
+        })
+
+    return manifest
+
+
+def build_content_manifest(input_paths: list,
+                           previous: dict | None = None,
+                           walker: Walker | None = None) -> dict:
+    """
+    Build a manifest for a content-addressed backup
+
+    A content manifest is the whole backup: it maps every path to the digest
+    of the blob that holds its contents.
+
+    :param input_paths: a list of input directories
+    :param previous: the previous content manifest, whose hashes are reused for unchanged files
+    :param walker: the walker that selects the files to include (all files if None)
+    :return: a manifest dictionary
+    """
+    return {
+        'version': MANIFEST_VERSION,
+        'id': str(uuid.uuid4()),
+        'created': time.time(),
+        'type': 'content',
+        'files': scan_files(
+            input_paths=input_paths,
+            previous_files=previous['files'] if previous else {},
+            walker=walker),
+    }
+
+
+def scan_files(input_paths: list, previous_files: dict,
+               walker: Walker | None = None) -> dict:
+    """
+    Record the size, mtime and hash of every file under the input paths
+
+    :param input_paths: a list of input directories
+    :param previous_files: the files of a previous manifest, used to skip hashing files whose size and mtime have not changed
+    :param walker: the walker that selects the files to include (all files if None)
+    :return: a dictionary of path to [size, mtime_ns, sha256]
+    """
+    files = {}
+    walker = walker if walker else Walker()
+
+    for entry in walker.walk(input_paths=input_paths):
+        stat = entry.stat()
+        known = previous_files.get(entry.path)
+
+        if known and known[0] == stat.st_size \
+                and known[1] == stat.st_mtime_ns:
+            files[entry.path] = known
+        else:
+            files[entry.path] = [stat.st_size, stat.st_mtime_ns,
+                                 hash_file(Path(entry.path))]
+
+    return files
+
+
+def diff_manifests(previous: dict, current: dict) -> (list[str], list[str]):
+    """
+    Compare two manifests
+
+    :param previous: the older manifest
+    :param current: the newer manifest
+    :return: a 2-tuple of sorted lists of changed (or added) and deleted paths
+    """
+    previous_files = previous['files']
+    current_files = current['files']
+
+    changed = [path for path, entry in current_files.items()
+               if previous_files.get(path, [None, None, None])[2] != entry[2]]
+    deleted = [path for path in previous_files if path not in current_files]
+
+    return sorted(changed), sorted(deleted)
+
+
+def write_manifest(manifest: dict, output_file: Path) -> Path:
+    """
+    Write a manifest to disk
+
+    :param manifest: the manifest dictionary
+    :param output_file: the output file to write
+    :return: a pathlib.Path object pointing to the manifest
+    """
+    with Path(output_file).open('w') as out_file:
+        json.dump(manifest, out_file)
+
+    return Path(output_file)
+
+
+def read_manifest(in_file: BinaryIO) -> dict:
+    """
+    Read a manifest from a file-like object
+
+    :param in_file: the file-like object to read
+    :return: a manifest dictionary
+    """
+    return json.load(in_file)
@@ -0,0 +1,248 @@
+import json
+import tarfile
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
+
+from caretaker.utils import file as file_util
+from caretaker.utils import log
+from caretaker.utils.manifest import MANIFEST_MEMBER
+from caretaker.utils.walk import Walker
+from caretaker.utils.zip import archive_members
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# member names are relative, so archives are always extracted into the root
+_EXTRACT_ARGUMENTS = {'filter': 'tar'} if hasattr(tarfile, 'tar_filter') \
+    else {}
+
+
+def _require_zstandard() -> None:
+    """
+    Raise an informative error if zstandard is not installed
+
+    :raises ImportError: if zstandard is not installed
+    :return: None
+    """
+    if zstandard is None:
+        raise ImportError('The tar.zst archive format needs the zstandard '
+                          'package (pip install django-caretaker[zstd])')
+
+
+def create_tar_file(input_paths: list, output_file: Path | BinaryIO,
+                    manifest: dict | None = None, level: int = 3,
+                    threads: int = 0,
+                    walker: Walker | None = None) -> Path | BinaryIO:
+    """
+    Create a zstd-compressed tar file that stores all input paths inside
+
+    The tar is written as a stream and the list of members that tarfile keeps
+    is cleared as it goes, so memory use does not grow with the number of
+    files.
+
+    :param input_paths: a list of input directories
+    :param output_file: the output file to write, or a writable file-like object, which does not need to be seekable
+    :param manifest: a manifest to embed as the first member. An incremental manifest restricts the archive to the files that it lists as changed.
+    :param level: the zstd compression level
+    :param threads: the number of zstd compression threads (0 compresses on the calling thread, -1 uses every core)
+    :param walker: the walker that selects the files to archive (all files if None)
+    :return: a pathlib.Path object pointing to the tar, or the file-like object that was written to
+    """
+    _require_zstandard()
+
+    streaming = hasattr(output_file, 'write')
+    out_file = output_file if streaming \
+        else file_util.normalize_path(output_file).open('wb')
+
+    compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+
+    try:
+        with compressor.stream_writer(out_file, closefd=False) as writer, \
+                tarfile.open(fileobj=writer, mode='w|',
+                             format=tarfile.PAX_FORMAT) as tar:
+            if manifest:
+                data = json.dumps(manifest).encode()
+                info = tarfile.TarInfo(MANIFEST_MEMBER)
+                info.size = len(data)
+
+                tar.addfile(info, BytesIO(data))
+
+            for path in archive_members(input_paths=input_paths,
+                                        manifest=manifest, walker=walker):
+                tar.add(path, recursive=False)
+                tar.members.clear()
+    finally:
+        if not streaming:
+            out_file.close()
+
+    return output_file if streaming else Path(output_file)
+
+
+def untar_file(input_file: Path, dry_run: bool,
+               delta_files: list | None = None,
+               skip_unchanged: bool = False) -> dict:
+    """
+    Extract a zstd-compressed tar file, then replay any incremental archives
+
+    :param input_file: a tar.zst file to extract
+    :param dry_run: whether to operate in dry run mode
+    :param delta_files: incremental archives to apply in order after the first
+    :param skip_unchanged: whether to leave files whose size and mtime already match the archive
+    :return: a dictionary of the number of files 'written', 'skipped' and 'deleted'
+    """
+    _require_zstandard()
+
+    logger = log.get_logger('tar-extractor')
+
+    if dry_run:
+        logger.info('Operating in dry run mode. No changes will be made.')
+
+    parent = None
+    totals = {'written': 0, 'skipped': 0, 'deleted': 0}
+
+    for archive in [input_file] + list(delta_files if delta_files else []):
+        counts = {'written': 0, 'skipped': 0, 'deleted': 0}
+        manifest = None
+
+        with Path(archive).open('rb') as in_file, \
+                zstandard.ZstdDecompressor().stream_reader(in_file) as reader, \
+                tarfile.open(fileobj=reader, mode='r|') as tar:
+            # members are read one at a time, in order, and forgotten
+            while (info := tar.next()) is not None:
+                tar.members.clear()
+
+                if info.name == MANIFEST_MEMBER:
+                    manifest = json.load(tar.extractfile(info))
+                    continue
+
+                target = Path('/') / info.name
+
+                if info.isdir():
+                    if not dry_run:
+                        target.mkdir(parents=True, exist_ok=True)
+                    continue
+
+                if skip_unchanged and _is_unchanged(target, info):
+                    counts['skipped'] += 1
+                    continue
+
+                if dry_run:
+                    logger.info('Would extract /{}'.format(info.name))
+                else:
+                    tar.extract(info, '/', **_EXTRACT_ARGUMENTS)
+
+                counts['written'] += 1
+
+        if parent and (not manifest or manifest['parent'] != parent):
+            logger.warning('{} does not follow on from the previous '
+                           'archive in the chain'.format(archive))
+
+        parent = manifest['id'] if manifest else None
+
+        deleted = manifest['deleted'] if manifest else []
+
+        for file_name in deleted:
+            if dry_run:
+                logger.info('Would delete {}'.format(file_name))
+            else:
+                Path(file_name).unlink(missing_ok=True)
+
+        counts['deleted'] = len(deleted)
+
+        for key, value in counts.items():
+            totals[key] += value
+
+        logger.info('Restored {} files, skipped {} unchanged files and '
+                    'deleted {} files from {}'.format(
+                        counts['written'], counts['skipped'],
+                        counts['deleted'], archive))
+
+    return totals
+
+
+def list_tar_members(input_file: Path | BinaryIO) -> list[dict]:
+    """
+    List the files in a zstd-compressed tar file
+
+    A tar stream has no index, so every header has to be decompressed. Member
+    contents are skipped over and never held in memory.
+
+    :param input_file: a tar.zst file, or a readable file-like object
+    :return: a list of dictionaries containing 'path', 'size', 'compressed_size' (always None) and 'mtime'
+    """
+    _require_zstandard()
+
+    members = []
+
+    with (Path(input_file).open('rb') if isinstance(input_file, (str, Path))
+          else input_file) as in_file, \
+            zstandard.ZstdDecompressor().stream_reader(in_file) as reader, \
+            tarfile.open(fileobj=reader, mode='r|') as tar:
+        while (info := tar.next()) is not None:
+            tar.members.clear()
+
+            if info.isfile() and info.name != MANIFEST_MEMBER:
+                members.append({'path': '/{}'.format(info.name),
+                                'size': info.size,
+                                'compressed_size': None,
+                                'mtime': float(info.mtime)})
+
+    return members
+
+
+def pack_directory(directory: Path, out_file: BinaryIO,
+                   first_member: str) -> None:
+    """
+    Pack the files in a directory into an uncompressed tar
+
+    This is for the directories that database dump tools write, which
+    compress their files themselves. The first member identifies the tool.
+
+    :param directory: the directory to pack
+    :param out_file: the binary file to write the tar to
+    :param first_member: the name of the file to store first
+    :return: None
+    """
+    members = sorted(path.name for path in Path(directory).iterdir())
+    members.remove(first_member)
+
+    with tarfile.open(fileobj=out_file, mode='w|',
+                      format=tarfile.USTAR_FORMAT) as tar:
+        for name in [first_member] + members:
+            tar.add(Path(directory) / name, arcname=name, recursive=False)
+
+
+def unpack_directory(input_file: Path, directory: Path) -> None:
+    """
+    Unpack a tar written by pack_directory
+
+    :param input_file: the tar to unpack
+    :param directory: the directory to unpack it into
+    :return: None
+    """
+    with tarfile.open(input_file, mode='r:') as tar:
+        tar.extractall(directory, **_EXTRACT_ARGUMENTS)
+
+
+def _is_unchanged(target: Path, info: tarfile.TarInfo) -> bool:
+    """
+    Check whether a file on disk already matches a tar member
+
+    Tar members carry no checksum of their contents, so only the size and
+    mtime are compared.
+
+    :param target: the file on disk
+    :param info: the TarInfo of the member
+    :return: True if the file has the same size and mtime as the member
+    """
+    try:
+        stat = target.stat()
+    except OSError:
+        return False
+
+    return info.isfile() and stat.st_size == info.size \
+        and int(stat.st_mtime) == int(info.mtime)
+
@@ -0,0 +1,159 @@
+import fnmatch
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+
+class Walker:
+    """
+    Walk directory trees with os.scandir, pruning excluded subtrees
+
+    A glob that contains a slash is matched against the whole absolute path;
+    any other glob is matched against the entry name alone, so '.git' or
+    '*.tmp' apply at every depth. An excluded directory is never opened.
+    Include globs, if given, only admit the files that match one of them.
+    """
+
+    def __init__(self, exclude: list[str] | None = None,
+                 exclude_regex: list[str] | None = None,
+                 include: list[str] | None = None,
+                 max_file_size: int | None = None, workers: int = 1):
+        """
+        Create a walker
+
+        :param exclude: globs of files and directories to leave out
+        :param exclude_regex: regular expressions searched for in the absolute path of files and directories to leave out
+        :param include: globs of the files to keep (all files if empty)
+        :param max_file_size: the size in bytes above which files are left out (None for no limit)
+        :param workers: the number of threads that walk top-level directories at once (0 uses every core)
+        """
+        self.exclude = list(exclude if exclude else [])
+        self.exclude_regex = [re.compile(expression) for expression
+                              in (exclude_regex if exclude_regex else [])]
+        self.include = list(include if include else [])
+        self.max_file_size = max_file_size
+        self.workers = workers if workers else os.cpu_count()
+
+    def walk(self, input_paths: list,
+             directories: bool = False) -> Iterator[os.DirEntry]:
+        """
+        Yield the entries under the input paths that the rules admit
+
+        With more than one worker, the top-level directories of each input
+        path are walked in parallel, which hides the latency of stat calls on
+        network filesystems. Entries are yielded in the same order either way.
+
+        :param input_paths: a list of input directories
+        :param directories: whether to yield directories as well as files
+        :return: a generator of os.DirEntry objects
+        """
+        for directory in input_paths:
+            if self.workers <= 1:
+                yield from self._walk_tree(str(directory), directories)
+                continue
+
+            subtrees = []
+
+            for entry in self._scan(str(directory)):
+                if entry.is_dir(follow_symlinks=False):
+                    if directories:
+                        yield entry
+
+                    subtrees.append(entry.path)
+                elif self._admits_file(entry):
+                    yield entry
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for entries in executor.map(
+                        lambda path: list(self._walk_tree(path, directories)),
+                        subtrees):
+                    yield from entries
+
+    def _walk_tree(self, directory: str,
+                   directories: bool) -> Iterator[os.DirEntry]:
+        """
+        Walk one tree depth first without recursion
+
+        :param directory: the root of the tree
+        :param directories: whether to yield directories as well as files
+        :return: a generator of os.DirEntry objects
+        """
+        stack = [directory]
+
+        while stack:
+            for entry in self._scan(stack.pop()):
+                if entry.is_dir(follow_symlinks=False):
+                    if directories:
+                        yield entry
+
+                    stack.append(entry.path)
+                elif self._admits_file(entry):
+                    yield entry
+
+    def _scan(self, directory: str) -> list[os.DirEntry]:
+        """
+        List the entries of a directory that are not excluded
+
+        :param directory: the directory to list
+        :return: a list of os.DirEntry objects
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return [entry for entry in entries
+                        if not self._excludes(entry)]
+        except (FileNotFoundError, NotADirectoryError):
+            # the directory was removed while it was being walked
+            return []
+
+    def _excludes(self, entry: os.DirEntry) -> bool:
+        """
+        Check whether an entry matches an exclude rule
+
+        :param entry: the entry to check
+        :return: True if the entry is excluded
+        """
+        for pattern in self.exclude:
+            if fnmatch.fnmatchcase(entry.path if '/' in pattern
+                                   else entry.name, pattern):
+                return True
+
+        return any(expression.search(entry.path)
+                   for expression in self.exclude_regex)
+
+    def _admits_file(self, entry: os.DirEntry) -> bool:
+        """
+        Check whether an entry is a file that the include and size rules admit
+
+        :param entry: the entry to check
+        :return: True if the entry should be yielded
+        """
+        if not entry.is_file():
+            return False
+
+        if self.include and not any(
+                fnmatch.fnmatchcase(entry.path if '/' in pattern
+                                    else entry.name, pattern)
+                for pattern in self.include):
+            return False
+
+        return self.max_file_size is None or \
+            entry.stat().st_size <= self.max_file_size
+
+
+def walk_paths(input_paths: list, walker: Walker | None = None,
+               directories: bool = False) -> Iterator[Path]:
+    """
+    Yield the paths under the input paths that a walker admits
+
+    :param input_paths: a list of input directories
+    :param walker: the walker to use (one without rules if None)
+    :param directories: whether to yield directories as well as files
+    :return: a generator of pathlib.Path objects
+    """
+    walker = walker if walker else Walker()
+
+    for entry in walker.walk(input_paths=input_paths,
+                             directories=directories):
+        yield Path(entry.path)
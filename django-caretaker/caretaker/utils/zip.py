@@ -1,42 +1,454 @@
+import collections
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, Future
 from pathlib import Path
-from zipfile import ZipFile, ZIP_DEFLATED
+from typing import BinaryIO
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+
 from caretaker.utils import file as file_util
 from caretaker.utils import log
+from caretaker.utils.manifest import MANIFEST_MEMBER, read_manifest
+from caretaker.utils.walk import Walker, walk_paths
+
+# the size of the chunks that are read from disk and handed to zlib
+_CHUNK_SIZE = 1024 * 1024
+
+# compressed members larger than this are spooled to disk, not kept in memory
+_SPOOL_SIZE = 16 * 1024 * 1024
+
+# the number of bytes at the head of a file used to sniff its content
+_SNIFF_SIZE = 64 * 1024
 
+# extensions of formats that are already compressed and barely shrink
+DEFAULT_STORED_EXTENSIONS = [
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.avif',
+    '.mp4', '.m4v', '.mov', '.mkv', '.webm', '.avi',
+    '.mp3', '.m4a', '.aac', '.ogg', '.opus', '.flac',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar',
+    '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.epub', '.jar',
+    '.woff', '.woff2',
+]
 
-def create_zip_file(input_paths: list, output_file: Path) -> Path:
+# the default Shannon entropy (in bits per byte) above which a file is stored
+DEFAULT_ENTROPY_THRESHOLD = 7.5
+
+# signatures of already-compressed formats as (offset, magic bytes)
+_COMPRESSED_SIGNATURES = [
+    (0, b'\xff\xd8\xff'),  # JPEG
+    (0, b'\x89PNG'),  # PNG
+    (0, b'GIF8'),  # GIF
+    (0, b'PK\x03\x04'),  # zip and office documents
+    (0, b'\x1f\x8b'),  # gzip
+    (0, b'BZh'),  # bzip2
+    (0, b'\xfd7zXZ\x00'),  # xz
+    (0, b'\x28\xb5\x2f\xfd'),  # zstd
+    (0, b"7z\xbc\xaf\x27\x1c"),  # 7z
+    (0, b'Rar!'),  # rar
+    (0, b'\x1a\x45\xdf\xa3'),  # matroska and webm
+    (0, b'OggS'),  # ogg
+    (0, b'fLaC'),  # flac
+    (4, b'ftyp'),  # mp4, mov, heic and avif
+    (8, b'WEBP'),  # webp
+]
+
+
+def create_zip_file(input_paths: list, output_file: Path | BinaryIO,
+                    workers: int = 1, manifest: dict | None = None,
+                    stored_extensions: list | None = None,
+                    entropy_threshold: float | None = None,
+                    walker: Walker | None = None) -> Path | BinaryIO:
     """
     Create a zip file that stores all input paths inside
 
     :param input_paths: a list of input directories
-    :param output_file: the output file to write
-    :return: a pathlib.Path object pointing to the zip
+    :param output_file: the output file to write, or a writable file-like object, which does not need to be seekable
+    :param workers: the number of threads to compress with (0 uses every core)
+    :param manifest: a manifest to embed. An incremental manifest restricts the archive to the files that it lists as changed.
+    :param stored_extensions: file extensions that are stored without compression
+    :param entropy_threshold: sniff the head of each file and store it without compression if it looks already compressed (None disables sniffing)
+    :param walker: the walker that selects the files to archive (all files if None)
+    :return: a pathlib.Path object pointing to the zip, or the file-like object that was written to
     """
-    with ZipFile(file_util.normalize_path(output_file),
+    workers = workers if workers else os.cpu_count()
+    members = archive_members(input_paths=input_paths, manifest=manifest,
+                              walker=walker)
+    stored_extensions = {extension.lower() for extension
+                         in (stored_extensions if stored_extensions else [])}
+    streaming = hasattr(output_file, 'write')
+
+    with ZipFile(output_file if streaming
+                 else file_util.normalize_path(output_file),
                  'w', ZIP_DEFLATED) as zf:
-        for directory in input_paths:
-            for file in directory.rglob('*'):
-                zf.write(file)
+        if workers <= 1:
+            for file in members:
+                zf.write(file, compress_type=ZIP_STORED
+                         if is_compressed(file, stored_extensions,
+                                          entropy_threshold)
+                         else ZIP_DEFLATED)
+        else:
+            _write_parallel(zf=zf, members=members, workers=workers,
+                            stored_extensions=stored_extensions,
+                            entropy_threshold=entropy_threshold)
+
+        if manifest:
+            zf.writestr(MANIFEST_MEMBER, json.dumps(manifest))
+
+    return output_file if streaming else Path(output_file)
+
+
+def archive_members(input_paths: list, manifest: dict | None,
+                    walker: Walker | None = None):
+    """
+    Yield the paths that belong in an archive
+
+    Directories are included so that empty ones survive a restore.
+
+    :param input_paths: a list of input directories
+    :param manifest: the manifest of the archive or None
+    :param walker: the walker that selects the files to archive (all files if None)
+    :return: a generator of pathlib.Path objects
+    """
+    if manifest and manifest['type'] == 'incremental':
+        for path in manifest['changed']:
+            yield Path(path)
+    else:
+        yield from walk_paths(input_paths=input_paths, walker=walker,
+                              directories=True)
+
+
+def is_compressed(file: Path, stored_extensions: set,
+                  entropy_threshold: float | None) -> bool:
+    """
+    Guess whether a file is already compressed and not worth deflating
+
+    :param file: the file to check
+    :param stored_extensions: lower-case file extensions that are always stored
+    :param entropy_threshold: the entropy in bits per byte above which a file is stored (None disables sniffing)
+    :return: True if the file should be stored without compression
+    """
+    if file.suffix.lower() in stored_extensions:
+        return True
+
+    if entropy_threshold is None or not file.is_file():
+        return False
+
+    with open(file, 'rb') as in_file:
+        sample = in_file.read(_SNIFF_SIZE)
+
+    if not sample:
+        return False
+
+    for offset, signature in _COMPRESSED_SIGNATURES:
+        if sample[offset:offset + len(signature)] == signature:
+            return True
+
+    return _entropy(sample) >= entropy_threshold
+
 
-    return Path(output_file)
+def _entropy(sample: bytes) -> float:
+    """
+    The Shannon entropy of a sample in bits per byte
+
+    :param sample: the bytes to measure
+    :return: a value between 0 and 8
+    """
+    length = len(sample)
+
+    return -sum(count / length * math.log2(count / length)
+                for count in collections.Counter(sample).values())
 
 
-def unzip_file(input_file: Path, dry_run: bool) -> None:
+def _write_parallel(zf: ZipFile, members, workers: int,
+                    stored_extensions: set,
+                    entropy_threshold: float | None) -> None:
     """
-    Unzip a zip file
+    Compress members on a thread pool and append them to the zip in order
+
+    zlib releases the GIL while it deflates, so a thread pool is enough to
+    keep every core busy. Members are written in the order that they were
+    found so that the output is the same as the serial writer.
+
+    :param zf: the open ZipFile to write to
+    :param members: an iterable of paths to add
+    :param workers: the number of threads to compress with
+    :param stored_extensions: lower-case file extensions that are always stored
+    :param entropy_threshold: the entropy above which a file is stored
+    :return: None
+    """
+    # bound the number of compressed members waiting to be written so that
+    # memory and spool space do not grow with the size of the input
+    in_flight: collections.deque[Future] = collections.deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for file in members:
+            in_flight.append(executor.submit(
+                _compress_member, file, stored_extensions, entropy_threshold))
+
+            if len(in_flight) >= workers * 2:
+                _append_member(zf, *in_flight.popleft().result())
+
+        while in_flight:
+            _append_member(zf, *in_flight.popleft().result())
+
+
+def _compress_member(file: Path, stored_extensions: set,
+                     entropy_threshold: float | None) \
+        -> (Path, ZipInfo | None, BinaryIO | None):
+    """
+    Deflate a single file into a spooled buffer
+
+    Directories and files that are already compressed are not buffered. They
+    are left for the writing thread to store as they are.
+
+    :param file: the file to compress
+    :param stored_extensions: lower-case file extensions that are always stored
+    :param entropy_threshold: the entropy above which a file is stored
+    :return: a 3-tuple of the path, the completed ZipInfo and the compressed data
+    """
+    if file.is_dir() or is_compressed(file, stored_extensions,
+                                      entropy_threshold):
+        return file, None, None
+
+    zinfo = ZipInfo.from_file(file)
+    zinfo.compress_type = ZIP_DEFLATED
+
+    # these are the same parameters that zipfile uses for ZIP_DEFLATED
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION,
+                                  zlib.DEFLATED, -15)
+    buffer = tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE)
+    crc = 0
+    file_size = 0
+
+    with open(file, 'rb') as in_file:
+        while chunk := in_file.read(_CHUNK_SIZE):
+            file_size += len(chunk)
+            crc = zlib.crc32(chunk, crc)
+            buffer.write(compressor.compress(chunk))
+
+    buffer.write(compressor.flush())
+
+    zinfo.file_size = file_size
+    zinfo.compress_size = buffer.tell()
+    zinfo.CRC = crc
+
+    buffer.seek(0)
+
+    return file, zinfo, buffer
+
+
+def _append_member(zf: ZipFile, file: Path, zinfo: ZipInfo | None,
+                   data: BinaryIO | None) -> None:
+    """
+    Append an already-compressed member to an open zip file
+
+    :param zf: the open ZipFile to write to
+    :param file: the path of the member
+    :param zinfo: the ZipInfo of the member, with sizes and CRC filled in, or None to store the file as it is
+    :param data: the compressed data
+    :return: None
+    """
+    if zinfo is None:
+        zf.write(file, compress_type=ZIP_STORED)
+        return
+
+    zf._writecheck(zinfo)
+    zf._didModify = True
+
+    zinfo.header_offset = zf.fp.tell()
+    zf.fp.write(zinfo.FileHeader())
+
+    with data:
+        shutil.copyfileobj(data, zf.fp, _CHUNK_SIZE)
+
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+    zf.start_dir = zf.fp.tell()
+
+
+def unzip_file(input_file: Path, dry_run: bool,
+               delta_files: list | None = None, workers: int = 1,
+               skip_unchanged: bool = False) -> dict:
+    """
+    Unzip a zip file, then replay any incremental archives on top of it
 
     :param input_file: a zip file to unzip
     :param dry_run: whether to operate in dry run mode
-    :return: a pathlib.Path object pointing to the zip
+    :param delta_files: incremental archives to apply in order after the first
+    :param workers: the number of threads to extract with (0 uses every core)
+    :param skip_unchanged: whether to leave files whose size, mtime and CRC already match the archive
+    :return: a dictionary of the number of files 'written', 'skipped' and 'deleted'
+    """
+    logger = log.get_logger('zip-extractor')
+
+    if dry_run:
+        logger.info('Operating in dry run mode. No changes will be made.')
+
+    workers = workers if workers else os.cpu_count()
+    parent = None
+    totals = collections.Counter(written=0, skipped=0, deleted=0)
+
+    for archive in [input_file] + list(delta_files if delta_files else []):
+        with ZipFile(archive, 'r') as zf:
+            manifest = read_manifest(zf.open(MANIFEST_MEMBER)) \
+                if MANIFEST_MEMBER in zf.NameToInfo else None
+
+            if parent and (not manifest or manifest['parent'] != parent):
+                logger.warning('{} does not follow on from the previous '
+                               'archive in the chain'.format(archive))
+
+            parent = manifest['id'] if manifest else None
+
+            members = [info for info in zf.infolist()
+                       if info.filename != MANIFEST_MEMBER]
+
+            counts = _extract_members(archive=archive, members=members,
+                                      dry_run=dry_run, workers=workers,
+                                      skip_unchanged=skip_unchanged)
+
+            deleted = manifest['deleted'] if manifest else []
+
+            for file_name in deleted:
+                if dry_run:
+                    logger.info('Would delete {}'.format(file_name))
+                else:
+                    Path(file_name).unlink(missing_ok=True)
+
+            counts['deleted'] = len(deleted)
+            totals.update(counts)
+
+            logger.info('Restored {} files, skipped {} unchanged files and '
+                        'deleted {} files from {}'.format(
+                            counts['written'], counts['skipped'],
+                            counts['deleted'], archive))
+
+    return dict(totals)
+
+
+def _extract_members(archive: Path, members: list[ZipInfo], dry_run: bool,
+                     workers: int, skip_unchanged: bool) \
+        -> collections.Counter:
+    """
+    Extract members of an archive to the root of the filesystem
+
+    Each worker thread opens its own handle on the archive so that reads do
+    not contend for a single file position. Directories are created up front
+    so that workers never race to make the same parent.
+
+    :param archive: the zip file to read
+    :param members: the ZipInfo objects of the members to extract
+    :param dry_run: whether to operate in dry run mode
+    :param workers: the number of threads to extract with
+    :param skip_unchanged: whether to leave files that already match the archive
+    :return: a Counter of 'written' and 'skipped' files
+    """
+    logger = log.get_logger('zip-extractor')
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def extract(info: ZipInfo) -> str:
+        target = Path('/') / info.filename
+
+        if skip_unchanged and _is_unchanged(target, info):
+            return 'skipped'
+
+        if dry_run:
+            logger.info('Would extract /{}'.format(info.filename))
+            return 'written'
+
+        if not hasattr(local, 'zf'):
+            local.zf = ZipFile(archive, 'r')
+
+            with handles_lock:
+                handles.append(local.zf)
+
+        path = local.zf.extract(info.filename, '/')
+
+        # keep the archived mtime so that a later restore can skip the file
+        mtime = zip_mtime(info)
+        os.utime(path, (mtime, mtime))
+
+        return 'written'
+
+    directories = [info for info in members if info.is_dir()]
+    files = [info for info in members if not info.is_dir()]
+
+    if not dry_run:
+        for info in directories:
+            (Path('/') / info.filename).mkdir(parents=True, exist_ok=True)
+
+    try:
+        if workers <= 1:
+            return collections.Counter(map(extract, files))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return collections.Counter(executor.map(extract, files))
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def list_zip_members(input_file: Path | BinaryIO) -> list[dict]:
+    """
+    List the files in a zip archive from its central directory
+
+    Only the central directory is read, so a seekable remote file costs a
+    request or two rather than a download of the whole archive.
+
+    :param input_file: a zip file, or a seekable file-like object
+    :return: a list of dictionaries containing 'path', 'size', 'compressed_size' and 'mtime'
     """
     with ZipFile(input_file, 'r') as zf:
-        if not dry_run:
-            zf.extractall('/')
-        else:
-            logger = log.get_logger('zip-extractor')
-            logger.info('Operating in dry run mode. No changes will be made.')
+        return [{'path': '/{}'.format(info.filename),
+                 'size': info.file_size,
+                 'compressed_size': info.compress_size,
+                 'mtime': zip_mtime(info)}
+                for info in zf.infolist()
+                if not info.is_dir() and info.filename != MANIFEST_MEMBER]
+
+
+def zip_mtime(info: ZipInfo) -> float:
+    """
+    The modification time of a zip member as a timestamp
+
+    :param info: the ZipInfo of the member
+    :return: seconds since the epoch
+    """
+    return time.mktime(info.date_time + (0, 0, -1))
+
+
+def _is_unchanged(target: Path, info: ZipInfo) -> bool:
+    """
+    Check whether a file on disk already matches a zip member
+
+    The size and mtime are checked first, as they are cheap. Only if both
+    match is the file read to compare its CRC.
+
+    :param target: the file on disk
+    :param info: the ZipInfo of the member
+    :return: True if the file has the same size, mtime and CRC as the member
+    """
+    try:
+        stat = target.stat()
+    except OSError:
+        return False
+
+    # zip timestamps have a resolution of two seconds
+    if stat.st_size != info.file_size or \
+            not 0 <= stat.st_mtime - zip_mtime(info) < 2:
+        return False
+
+    crc = 0
 
-            file_list = zf.namelist()
+    with open(target, 'rb') as in_file:
+        while chunk := in_file.read(_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
 
-            for file_name in file_list:
-                logger.info('Would extract /{}'.format(file_name))
+    return crc == info.CRC